@@ -0,0 +1,350 @@
+"""
+asyncio 엔진 (토픽 페이지 로드 / 주문 제출)
+
+전용 스레드에서 이벤트 루프 하나를 돌리고 aiohttp 세션 하나로 모든 요청을 보낸다.
+Tk 메인 루프와 호출 스레드는 그대로 두고 결과는 큐 / 콜백으로 받으므로 UI 가 멈추지 않는다.
+
+- 토픽: 페이지를 page_fanout 개씩 동시에 요청하고 도착 순서와 상관없이 페이지 순서대로 전달
+- 주문: 주문 생성 / EIP-712 서명은 스레드 풀(executor)에서, 제출은 비동기 HTTP 로
+  최대 concurrency 건을 동시에 보낸다 (같은 토픽은 순서대로)
+- cancel(): 진행 중인 작업을 모두 취소한다. 이미 서버에 보낸 주문은 취소되지 않는다.
+
+aiohttp 가 설치되어 있지 않으면 available() 이 False 이고 코어는 스레드 엔진을 사용한다.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from opinion_governor import HTTPStatusError, RetryableError, parse_retry_after
+
+
+def available():
+    """aiohttp 설치 여부"""
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def parse_order_json(data):
+    """주문 API JSON 응답 → (성공 여부, Order ID 또는 에러 메시지)"""
+    if data.get('errno'):
+        return False, data.get('errmsg') or f"errno={data.get('errno')}"
+    order_data = (data.get('result') or {}).get('orderData') or {}
+    return True, order_data.get('orderId', 'N/A')
+
+
+class AsyncEngine:
+    """백그라운드 이벤트 루프 + aiohttp 세션 (TradingCore 설정 / 조절기 / 지표 공유)"""
+
+    def __init__(self, core, concurrency=64, sign_workers=2):
+        self.core = core
+        self.concurrency = max(1, int(concurrency))
+        self.executor = ThreadPoolExecutor(max_workers=max(1, int(sign_workers)))
+
+        self.lock = threading.Lock()
+        self.loop = None
+        self.thread = None
+        self.session = None
+        self.tasks = set()
+
+    # ---- 이벤트 루프 ----
+
+    def start(self):
+        """이벤트 루프 스레드 시작 (처음 사용할 때 자동 호출)"""
+        with self.lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+                self.thread.start()
+        return self
+
+    def submit(self, coro):
+        """코루틴을 루프에 넣고 concurrent.futures.Future 반환 (아무 스레드에서나 호출)"""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(self._tracked(coro), self.loop)
+
+    def run(self, coro):
+        """코루틴 실행 결과를 기다림 (루프 스레드가 아닌 곳에서 호출)"""
+        return self.submit(coro).result()
+
+    async def _tracked(self, coro):
+        task = asyncio.current_task()
+        self.tasks.add(task)
+        try:
+            return await coro
+        finally:
+            self.tasks.discard(task)
+
+    def cancel(self):
+        """진행 중인 작업 모두 취소 (UI 스레드에서 바로 반환)"""
+        if self.loop is None:
+            return
+        self.loop.call_soon_threadsafe(self._cancel_all)
+
+    def _cancel_all(self):
+        for task in list(self.tasks):
+            task.cancel()
+
+    def close(self):
+        """세션 / 루프 정리"""
+        if self.loop is None:
+            return
+        self.cancel()
+        if self.session is not None:
+            asyncio.run_coroutine_threadsafe(self.session.close(), self.loop).result(timeout=5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=5)
+        if not self.loop.is_running():
+            self.loop.close()
+        self.loop = None
+        self.session = None
+        self.executor.shutdown(wait=False)
+
+    def get_session(self):
+        """keep-alive aiohttp 세션 (루프 스레드에서 처음 사용할 때 생성)"""
+        if self.session is None:
+            import aiohttp
+
+            self.session = aiohttp.ClientSession(
+                headers={"accept": "application/json", "apikey": self.core.api_key},
+                timeout=aiohttp.ClientTimeout(total=self.core.http_timeout),
+                connector=aiohttp.TCPConnector(limit=self.concurrency)
+            )
+        return self.session
+
+    async def warm(self, url):
+        """커넥션 예열 (응답은 버림)"""
+        async with self.get_session().get(url) as response:
+            await response.read()
+
+    # ---- 토픽 페이지 ----
+
+    async def fetch_page(self, url, params, page):
+        """단일 페이지 요청 (TradingCore.fetch_page 와 같은 규칙, 실패 시 None)"""
+        core = self.core
+        params = {key: str(value) for key, value in dict(params, page=page, limit=core.page_size).items()}
+        endpoint = url.rsplit('/', 1)[-1]
+
+        async def request():
+            try:
+                with core.metrics.timer('opinion_request_seconds', endpoint=endpoint):
+                    async with self.get_session().get(url, params=params) as response:
+                        data = await response.json(content_type=None) if response.status == 200 else None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                core.metrics.inc('opinion_errors_total', endpoint=endpoint, code=type(e).__name__)
+                raise
+
+            if response.status != 200:
+                core.metrics.inc('opinion_errors_total', endpoint=endpoint, code=str(response.status))
+                if response.status in core.api_governor.retry_statuses:
+                    raise RetryableError(response.status, parse_retry_after(response.headers.get('Retry-After')))
+            return response.status, data
+
+        status, data = await core.api_governor.call_async(request)
+
+        if status != 200:
+            core.log(f"⚠️  {endpoint} {page}페이지 HTTP {status} - 이후 페이지 생략", "WARNING")
+            return None
+
+        if data.get('errno') != 0:
+            core.metrics.inc('opinion_errors_total', endpoint=endpoint, code=f"errno{data.get('errno')}")
+            core.log(f"⚠️  {endpoint} {page}페이지 errno={data.get('errno')} {data.get('errmsg', '')} - 이후 페이지 생략", "WARNING")
+            return None
+
+        return (data.get('result') or {}).get('list', []) or []
+
+    async def load_pages(self, url, params, limit, convert, on_page):
+        """TradingCore.iter_pages 의 asyncio 버전 (페이지 순서대로 on_page(items))"""
+        core = self.core
+        count = 0
+        page = 1
+        per_page = core.page_size
+
+        while count < limit:
+            needed_pages = -(-(limit - count) // per_page)
+            batch = range(page, page + max(1, min(core.page_fanout, needed_pages)))
+            tasks = [asyncio.ensure_future(self.fetch_page(url, params, p)) for p in batch]
+
+            try:
+                for task in tasks:
+                    rows = await task
+                    if rows is None:
+                        return
+
+                    items = convert(rows)[:limit - count]
+                    count += len(items)
+                    if items:
+                        on_page(items)
+
+                    if len(rows) < per_page or count >= limit:
+                        return
+            finally:
+                # 멈춘 뒤의 페이지 요청은 버림
+                for task in tasks:
+                    task.cancel()
+
+            page += len(batch)
+            if core.page_delay > 0:
+                await asyncio.sleep(core.page_delay)
+
+    def stream_pages(self, sources, limit):
+        """페이지 소스별로 동시에 로드 → ([(label, queue.Queue)], 로드 중단 함수)
+
+        각 큐에는 페이지 목록, 예외, 끝나면 None 이 들어간다.
+        """
+        streams = []
+        futures = []
+        for label, (url, params, convert) in sources:
+            pages = queue.Queue()
+            futures.append(self.submit(self._pump_pages(url, params, limit, convert, pages)))
+            streams.append((label, pages))
+
+        def stop():
+            for future in futures:
+                future.cancel()
+
+        return streams, stop
+
+    async def _pump_pages(self, url, params, limit, convert, pages):
+        try:
+            await self.load_pages(url, params, limit, convert, pages.put)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            pages.put(e)
+        finally:
+            pages.put(None)
+
+    # ---- 주문 ----
+
+    async def post_order(self, request):
+        """서명된 주문 제출 → 응답 JSON"""
+        core = self.core
+
+        async def post():
+            try:
+                async with self.get_session().post(
+                    f"{core.api_host}/openapi/order", json=request.to_dict()
+                ) as response:
+                    data = await response.json(content_type=None) if response.status == 200 else None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                core.metrics.inc('opinion_errors_total', endpoint='order', code=type(e).__name__)
+                raise
+
+            if response.status != 200:
+                core.metrics.inc('opinion_errors_total', endpoint='order', code=str(response.status))
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if response.status in core.order_governor.retry_statuses:
+                    raise RetryableError(response.status, retry_after)
+                # 재시도하지 않는 응답도 상태 코드를 남겨 회로 차단이 5xx 를 셀 수 있게
+                raise HTTPStatusError(response.status, retry_after)
+            return data
+
+        with core.metrics.timer('opinion_order_phase_seconds', phase='submit'):
+            data = await core.order_governor.call_async(post)
+
+        if data.get('errno'):
+            core.metrics.inc('opinion_errors_total', endpoint='order', code=f"errno{data.get('errno')}")
+        return data
+
+    async def submit_leg(self, leg, on_submit=None):
+        """OrderLeg 매수 주문 (서명은 executor, 제출은 비동기) → (성공 여부, Order ID 또는 에러)
+
+        on_submit(leg) 은 서버로 보내기 직전에 호출된다 (서명 중 취소되면 호출되지 않음).
+        """
+        core = self.core
+        loop = asyncio.get_running_loop()
+
+        signer = core.get_order_signer()
+        if not signer:
+            # SDK 가 단계 분리를 지원하지 않으면 place_order 전체를 executor 에서
+            if on_submit:
+                on_submit(leg)
+            return await loop.run_in_executor(self.executor, core.submit_leg, leg)
+
+        signed = await loop.run_in_executor(self.executor, lambda: signer.sign(leg, core.leg_price(leg)))
+        if on_submit:
+            on_submit(leg)
+        return parse_order_json(await self.post_order(signed.request))
+
+    async def submit_orders(self, legs, rate=2.0, burst=1, per_topic_order=True, on_submit=None, on_result=None,
+                            stop=None, scheduler=None):
+        """주문 목록 제출 → (성공, 실패, 취소로 제출하지 못한 주문 수)
+
+        최대 concurrency 개의 작업 코루틴이 스케줄러에서 가장 급한 주문을 가져간다 (없으면 선택 순서).
+        per_topic_order=True 이면 같은 토픽의 주문은 순서대로 하나씩 제출한다.
+        취소되거나 stop 이벤트가 설정되면 남은 주문을 제출하지 않고 그때까지의 결과를 반환한다.
+        마감까지 시작하지 못해 제외한 주문(scheduler.dropped)은 어느 쪽에도 세지 않는다.
+        """
+        from opinion_core import TokenBucket
+        from opinion_schedule import LegScheduler
+
+        core = self.core
+        bucket = TokenBucket(rate, burst)
+        scheduler = scheduler or LegScheduler(legs, per_topic_order=per_topic_order)
+        changed = asyncio.Condition()
+        counts = {'success': 0, 'fail': 0}
+
+        async def notify():
+            async with changed:
+                changed.notify_all()
+
+        async def worker():
+            while True:
+                async with changed:
+                    leg = scheduler.poll()
+                    # 남은 토픽이 모두 제출 중이면 하나가 끝날 때까지 대기
+                    while leg is None and not scheduler.exhausted:
+                        await changed.wait()
+                        leg = scheduler.poll()
+                if leg is None:
+                    return
+
+                wait = bucket.take()
+                while wait > 0:
+                    await asyncio.sleep(wait)
+                    wait = bucket.take()
+                if stop is not None and stop.is_set():
+                    scheduler.close(leg)
+                    await notify()
+                    return
+                if scheduler.expired(leg):
+                    scheduler.drop(leg)
+                    await notify()
+                    continue
+
+                started = time.perf_counter()
+                try:
+                    success, result = await self.submit_leg(leg, on_submit)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    success, result = False, str(e)
+                seconds = time.perf_counter() - started
+                core.metrics.observe('opinion_order_seconds', seconds)
+                core.metrics.inc('opinion_orders_total', result='success' if success else 'fail')
+
+                counts['success' if success else 'fail'] += 1
+                if on_result:
+                    on_result(leg, success, result)
+                scheduler.done(leg, seconds, success)
+                await notify()
+
+        tasks = [asyncio.ensure_future(worker()) for _ in range(min(self.concurrency, len(legs)))]
+        try:
+            await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return counts['success'], counts['fail'], len(legs) - counts['success'] - counts['fail'] - len(scheduler.dropped)
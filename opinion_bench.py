@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+토픽 로드 / 주문 제출 벤치마크 (opinion_mock_server 사용, 네트워크 / 실제 자금 불필요)
+
+    python opinion_bench.py                                   # 기본 크기 100 / 1000 / 5000
+    python opinion_bench.py --sizes 1000 --latency 30 --rate-429 0.02
+    python opinion_bench.py --json bench.json                 # 결과 저장
+    python opinion_bench.py --compare bench.json              # 기준 대비 회귀 시 종료 코드 1
+    python opinion_bench.py --engine thread                   # 스레드 엔진 (기본값: async)
+    python opinion_bench.py --wallets 4 --order-rate 5        # 지갑 4개 분산 (지갑별 5건/초)
+    python opinion_bench.py --no-journal                      # 거래 저널 없이 (기록 부하 비교)
+
+측정 항목: 토픽/초, 주문/초, 페이지·주문 지연 p50/p95/p99(ms), 로드 중 최대 메모리(tracemalloc),
+          로드한 전체 토픽의 주문 계획(예산 배분) 계산 시간(ms)
+주문은 임의로 만든 지갑 키로 실제 SDK 서명 경로를 그대로 거쳐 모의 서버에 제출한다.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+
+def percentile(values, p):
+    """p 백분위수 (최근접 순위)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def latency_summary(values):
+    """지연 목록(초) → p50/p95/p99 (ms)"""
+    return {f"p{p}": round(percentile(values, p) * 1000, 2) for p in (50, 95, 99)}
+
+
+def timed(func, samples):
+    """호출 시간을 samples 목록에 기록하는 래퍼 (스레드 안전)"""
+    lock = threading.Lock()
+
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            with lock:
+                samples.append(elapsed)
+
+    return wrapper
+
+
+def timed_async(func, samples):
+    """timed 의 코루틴 버전 (asyncio 엔진의 페이지 / 주문)"""
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - started)
+
+    return wrapper
+
+
+def make_core(server, args):
+    """모의 서버를 보도록 환경변수를 설정한 TradingCore"""
+    from eth_account import Account
+
+    account = Account.create('opinion-bench')
+
+    # --wallets N: 임의 지갑 N개로 분산 제출 (지갑별 프로세스)
+    wallets_file = ''
+    if args.wallets > 1:
+        wallets_file = os.path.join(tempfile.gettempdir(), 'opinion-bench-wallets.json')
+        with open(wallets_file, 'w', encoding='utf-8') as f:
+            json.dump([
+                {'name': f"bench{idx}", 'private_key': wallet.key.hex(), 'maker_address': wallet.address}
+                for idx, wallet in enumerate(Account.create(f'opinion-bench-{idx}') for idx in range(args.wallets))
+            ], f)
+
+    journal_file = ''
+    if not args.no_journal:
+        journal_file = os.path.join(tempfile.gettempdir(), 'opinion-bench-journal.db')
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(journal_file + suffix):
+                os.remove(journal_file + suffix)
+
+    os.environ.update({
+        'API_HOST': server.url,
+        'API_KEY': 'bench',
+        'PRIVATE_KEY': account.key.hex(),
+        'SIGNER_ADDRESS': account.address,
+        'MAKER_ADDRESS': account.address,
+        'RPC_URL': 'http://127.0.0.1:1',
+        'TOPIC_CACHE_FILE': '',
+        'TOPIC_SEEN_FILE': '',
+        'PAGE_DELAY': str(args.page_delay),
+        'ENGINE': args.engine,
+        'WALLETS_FILE': wallets_file,
+        'JOURNAL_FILE': journal_file,
+        'ORDER_RATE': str(args.order_rate),
+        'ORDER_SYNC_INTERVAL': '0',  # 주문 목록 동기화 요청이 측정에 섞이지 않도록
+    })
+
+    from opinion_core import TradingCore
+    return TradingCore(log=lambda message, level="INFO": None)
+
+
+def bench_load(core, size):
+    """토픽 로드 처리량 / 페이지 지연 / 최대 메모리"""
+    # import / 커넥션 생성 비용은 제외 (한 페이지 미리 로드)
+    core.load_topics(1, 'REGULAR')
+
+    page_samples = []
+    engine = core.async_engine
+    if engine:
+        engine.fetch_page = timed_async(engine.fetch_page, page_samples)
+    else:
+        core.fetch_page = timed(core.fetch_page, page_samples)
+
+    started = time.perf_counter()
+    topics, _ = core.load_topics(size, 'ALL')
+    elapsed = time.perf_counter() - started
+    if engine:
+        del engine.fetch_page
+    else:
+        del core.fetch_page
+
+    # 메모리는 추적 오버헤드가 처리량에 섞이지 않도록 따로 한 번 더 로드해 측정
+    tracemalloc.start()
+    core.load_topics(size, 'ALL')
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return topics, {
+        'topics': len(topics),
+        'seconds': round(elapsed, 3),
+        'topics_per_sec': round(len(topics) / elapsed, 1) if elapsed else 0.0,
+        'page_latency_ms': latency_summary(page_samples),
+        'peak_memory_mb': round(peak / 1024 / 1024, 2),
+    }
+
+
+def bench_plan(core, topics):
+    """로드한 전체 토픽 주문 계획 (예산 배분) 계산 시간"""
+    core.plan_orders(topics[:1], budget=10, weighting='odds')  # numpy import 제외
+
+    samples = []
+    for _ in range(5):
+        plan = core.plan_orders(topics, budget=len(topics) * 5, weighting='odds')
+        samples.append(plan.seconds)
+
+    return {
+        'legs': len(plan.legs),
+        'backend': plan.backend,
+        'ms': round(min(samples) * 1000, 2),
+    }
+
+
+def bench_orders(core, topics, order_count, workers):
+    """주문 제출 처리량 / 주문별 지연 (--order-rate 가 0 이면 속도 제한 없이)
+
+    계획 / 호가 갱신은 시간 측정 밖에서 하고, 정확히 order_count 건의 제출 단계만 잰다
+    (지갑 분산은 지갑 프로세스 시작 / 지갑별 호가 갱신 포함).
+    """
+    selected = []
+    count = 0
+    for topic in topics:
+        if count >= order_count:
+            break
+        selected.append(topic)
+        count += len(topic.options) * 2
+
+    order_samples = []
+    core.submit_leg = timed(core.submit_leg, order_samples)
+    core.submit_presigned = timed(core.submit_presigned, order_samples)
+    if core.async_engine:
+        core.async_engine.submit_leg = timed_async(core.async_engine.submit_leg, order_samples)
+
+    legs = core.plan_orders(selected, 5).legs[:order_count]
+    run_id = core.journal.start_run(legs) if core.journal else None
+
+    with core.run_scope() as stop:
+        if core.wallet_pool:
+            started = time.perf_counter()
+            success, fail, _ = core.wallet_pool.execute(
+                legs, core.order_rate, workers, stop, run_id=run_id, journal=core.journal
+            )
+        else:
+            core.refresh_prices(legs)
+            started = time.perf_counter()
+            success, fail, _, _ = core.submit_planned(legs, core.order_rate, workers, stop, run_id=run_id, refresh=False)
+        elapsed = time.perf_counter() - started
+
+    if run_id:
+        core.journal.finish_run(run_id)
+
+    return {
+        'orders': success + fail,
+        'success': success,
+        'fail': fail,
+        'seconds': round(elapsed, 3),
+        'orders_per_sec': round((success + fail) / elapsed, 1) if elapsed else 0.0,
+        'order_latency_ms': latency_summary(order_samples),
+        'phase_p95_ms': {
+            phase: round(histogram.quantile(0.95) * 1000, 2)
+            for phase in ('build', 'sign', 'submit')
+            for histogram in [core.metrics.histogram('opinion_order_phase_seconds', phase=phase)]
+            if histogram
+        },
+    }
+
+
+def run_size(size, args):
+    from opinion_mock_server import MockOpinionServer
+
+    server = MockOpinionServer(
+        topics=size, indicators=max(1, size // 10), seed=args.seed,
+        latency=args.latency, jitter=args.jitter, order_latency=args.order_latency,
+        error_rate=args.error_rate, rate_429=args.rate_429
+    )
+    with server:
+        core = make_core(server, args)
+        try:
+            topics, load = bench_load(core, size)
+            plan = bench_plan(core, topics)
+
+            orders = None
+            if args.orders > 0:
+                core.init_client()
+                orders = bench_orders(core, topics, args.orders, args.workers)
+        finally:
+            core.close()
+
+    retries = {governor.name: governor.snapshot()[0] for governor in (core.api_governor, core.order_governor)}
+    return {'size': size, 'engine': args.engine, 'wallets': args.wallets, 'load': load, 'plan': plan, 'orders': orders, 'retries': retries,
+            'server': dict(server.stats)}
+
+
+def print_result(result):
+    load = result['load']
+    page = load['page_latency_ms']
+    print(f"\n📦 토픽 {result['size']}개 ({result.get('engine', 'thread')} 엔진)")
+    print(f"   로드: {load['topics']}개 / {load['seconds']}초 = {load['topics_per_sec']} 토픽/초, "
+          f"최대 메모리 {load['peak_memory_mb']}MB")
+    print(f"   페이지 지연(ms): p50 {page['p50']}  p95 {page['p95']}  p99 {page['p99']}")
+    plan = result['plan']
+    print(f"   주문 계획: {plan['legs']}건 / {plan['ms']}ms ({plan['backend']})")
+
+    orders = result['orders']
+    if orders:
+        latency = orders['order_latency_ms']
+        wallets = result.get('wallets', 1)
+        print(f"   주문: {orders['orders']}건 (실패 {orders['fail']}) / {orders['seconds']}초 = "
+              f"{orders['orders_per_sec']} 주문/초" + (f" (지갑 {wallets}개)" if wallets > 1 else ''))
+        if wallets <= 1:
+            # 지갑별 프로세스의 주문 지연은 이 프로세스에서 측정되지 않음
+            print(f"   주문 지연(ms): p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}")
+        if orders['phase_p95_ms']:
+            print("   단계별 p95(ms): " + '  '.join(f"{k} {v}" for k, v in orders['phase_p95_ms'].items()))
+
+    print(f"   재시도: {result['retries']}")
+    print(f"   서버: {result['server']}")
+
+
+def compare(results, baseline, tolerance):
+    """기준 결과 대비 회귀 목록 (처리량 감소 / p95 지연·메모리 증가가 tolerance 초과)"""
+    base_by_size = {item['size']: item for item in baseline.get('results', [])}
+    regressions = []
+
+    def check(label, current, previous, higher_is_better):
+        if not previous:
+            return
+        change = (current - previous) / previous
+        if (-change if higher_is_better else change) > tolerance:
+            regressions.append(f"{label}: {previous} → {current} ({change:+.0%})")
+
+    for result in results:
+        base = base_by_size.get(result['size'])
+        if not base:
+            continue
+        size = result['size']
+        check(f"[{size}] 토픽/초", result['load']['topics_per_sec'], base['load']['topics_per_sec'], True)
+        check(f"[{size}] 페이지 p95", result['load']['page_latency_ms']['p95'],
+              base['load']['page_latency_ms']['p95'], False)
+        check(f"[{size}] 최대 메모리", result['load']['peak_memory_mb'], base['load']['peak_memory_mb'], False)
+        if base.get('plan') and base['plan']['backend'] == result['plan']['backend']:
+            check(f"[{size}] 주문 계획 ms", result['plan']['ms'], base['plan']['ms'], False)
+        if result['orders'] and base.get('orders'):
+            check(f"[{size}] 주문/초", result['orders']['orders_per_sec'], base['orders']['orders_per_sec'], True)
+            check(f"[{size}] 주문 p95", result['orders']['order_latency_ms']['p95'],
+                  base['orders']['order_latency_ms']['p95'], False)
+
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Opinion Trade 봇 벤치마크 (모의 서버)")
+    parser.add_argument('--sizes', default='100,1000,5000', help="토픽 개수 목록 (쉼표 구분)")
+    parser.add_argument('--orders', type=int, default=200, help="크기별 주문 수 (0 = 주문 측정 안 함)")
+    parser.add_argument('--workers', type=int, default=8, help="동시 주문 작업자 수 (기본값: 8)")
+    parser.add_argument('--engine', default='async', choices=('async', 'thread'),
+                        help="토픽 로드 / 주문 제출 엔진 (기본값: async)")
+    parser.add_argument('--wallets', type=int, default=1,
+                        help="주문을 나눠 제출할 임의 지갑 수 (2 이상이면 지갑별 프로세스, 기본값: 1)")
+    parser.add_argument('--order-rate', type=float, default=0,
+                        help="지갑별 초당 주문 한도 (기본값: 0 = 제한 없음)")
+    parser.add_argument('--no-journal', action='store_true', help="거래 저널 끄고 측정")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=10, help="모의 서버 응답 지연(ms) (기본값: 10)")
+    parser.add_argument('--jitter', type=float, default=0, help="추가 무작위 지연 최대값(ms)")
+    parser.add_argument('--order-latency', type=float, help="주문 응답 지연(ms) (기본값: --latency)")
+    parser.add_argument('--error-rate', type=float, default=0, help="500 응답 비율")
+    parser.add_argument('--rate-429', type=float, default=0, help="429 응답 비율")
+    parser.add_argument('--page-delay', type=float, default=0, help="페이지 묶음 사이 대기(초) (기본값: 0)")
+    parser.add_argument('--json', metavar='PATH', help="결과를 JSON 파일로 저장")
+    parser.add_argument('--compare', metavar='PATH', help="기준 JSON 과 비교해 회귀가 있으면 종료 코드 1")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="허용 변화율 (기본값: 0.2 = 20%%)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+
+    results = []
+    for size in sizes:
+        result = run_size(size, args)
+        print_result(result)
+        results.append(result)
+
+    report = {
+        'settings': {key: value for key, value in vars(args).items() if key not in ('json', 'compare')},
+        'python': sys.version.split()[0],
+        'results': results,
+    }
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.json}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ 회귀 {len(regressions)}건 (허용 {args.tolerance:.0%})")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print(f"\n✅ 기준 대비 회귀 없음 (허용 {args.tolerance:.0%})")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Opinion Trade 자동 거래 봇 (헤드리스 CLI / 데몬)
+
+    python opinion_cli.py list --type REGULAR --filter 'title~bitcoin'
+    python opinion_cli.py trade --filter 'id=123,456' --amount 5 --yes
+    python opinion_cli.py daemon --interval 300 --filter 'type=I' --yes
+    python opinion_cli.py daemon --interval 30 --new-only --yes   # 새로 생긴 토픽만 (폴링마다 1~2회 요청)
+    python opinion_cli.py resume --yes                  # 중단된 마지막 거래의 남은 주문 제출
+    python opinion_cli.py orders --replace-older 10 --yes  # 10분 이상 걸린 미체결 주문 취소 후 재주문
+
+--help 가 빠르도록 opinion_core / SDK 는 명령 실행 시점에 import 한다.
+"""
+
+import argparse
+import sys
+import time
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Opinion Trade 봇 (GUI 없이 실행)")
+    parser.add_argument('-q', '--quiet', action='store_true', help="INFO 로그 숨김")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_topic_options(command):
+        command.add_argument('--limit', type=int, default=50, help="로드할 토픽 개수 (기본값: 50)")
+        command.add_argument('--type', default='ALL', choices=('ALL', 'REGULAR', 'INDICATOR'), help="토픽 타입")
+        command.add_argument('--filter', default='', metavar='EXPR',
+                             help="토픽 필터 식 (예: \"type=R title~'bitcoin' children>=2 yes<0.3\")")
+        command.add_argument('--use-cache', action='store_true', help="캐시가 TTL 이내면 네트워크 요청 생략")
+        command.add_argument('--new-only', action='store_true',
+                             help="지난 탐색 이후 새로 생긴 토픽만 (이미 본 토픽이 나오면 페이지 요청 중단)")
+
+    def add_trade_options(command):
+        command.add_argument('--amount', type=float, help="주문 금액 USDT (기본값: ORDER_AMOUNT)")
+        command.add_argument('--budget', type=float, help="총 예산 USDT, 모든 주문에 나눠 배분 (기본값: ORDER_BUDGET)")
+        command.add_argument('--weighting', choices=('equal', 'price', 'odds'),
+                             help="예산 배분 방식 (기본값: ORDER_WEIGHTING)")
+        command.add_argument('--rate', type=float, help="초당 주문 한도 (기본값: ORDER_RATE)")
+        command.add_argument('--workers', type=int, help="동시 주문 작업자 수 (기본값: ORDER_WORKERS)")
+        command.add_argument('--priority', metavar='KEYS',
+                             help="주문 우선순위 키 (end, edge, volume, type, 쉼표 구분, 반대 순서는 --priority=-volume 처럼, "
+                                  "기본값: ORDER_PRIORITY)")
+        command.add_argument('--yes', action='store_true', help="확인 없이 실제 주문 (없으면 주문 계획만 출력)")
+
+    add_topic_options(commands.add_parser('list', help="토픽 목록 출력"))
+
+    trade = commands.add_parser('trade', help="필터에 맞는 토픽 거래 1회 실행")
+    add_topic_options(trade)
+    add_trade_options(trade)
+
+    daemon = commands.add_parser('daemon', help="주기적으로 로드 → 새 토픽만 거래")
+    add_topic_options(daemon)
+    add_trade_options(daemon)
+    daemon.add_argument('--interval', type=float, default=300, help="반복 주기(초) (기본값: 300)")
+
+    resume = commands.add_parser('resume', help="거래 저널에서 중단된 거래의 남은 주문 제출")
+    resume.add_argument('--run', metavar='RUN_ID', help="이어서 실행할 실행 ID (기본값: 마지막으로 끝나지 않은 실행)")
+    resume.add_argument('--rate', type=float, help="초당 주문 한도 (기본값: ORDER_RATE)")
+    resume.add_argument('--workers', type=int, help="동시 주문 작업자 수 (기본값: ORDER_WORKERS)")
+    resume.add_argument('--yes', action='store_true', help="확인 없이 실제 주문 (없으면 남은 주문만 출력)")
+
+    orders = commands.add_parser('orders', help="내 주문 동기화 / 미체결 주문 목록, 일괄 취소 / 재주문")
+    action = orders.add_mutually_exclusive_group()
+    action.add_argument('--cancel-all', action='store_true', help="미체결 주문 전체 취소")
+    action.add_argument('--replace-older', type=float, metavar='MIN',
+                        help="MIN 분 이상 걸려 있는 미체결 주문을 취소하고 현재 호가로 재주문")
+    orders.add_argument('--rate', type=float, help="재주문 초당 한도 (기본값: ORDER_RATE)")
+    orders.add_argument('--workers', type=int, help="재주문 동시 작업자 수 (기본값: ORDER_WORKERS)")
+    orders.add_argument('--yes', action='store_true', help="확인 없이 취소 / 재주문 (없으면 대상 주문만 출력)")
+
+    return parser
+
+
+def make_logger(quiet):
+    """표준 출력 + (LOG_FILE 설정 시) JSON-lines 파일 로그"""
+    from opinion_core import create_env_file_logger, print_log
+
+    file_logger, file_listener = create_env_file_logger()
+
+    def log(message, level="INFO"):
+        if not (quiet and level == "INFO"):
+            print_log(message, level)
+        if file_logger:
+            file_logger.info(message, extra={'bot_level': level})
+
+    return log, file_listener
+
+
+def load_selected(core, args, predicate):
+    """토픽 로드 후 필터 적용 → (선택된 토픽, 거래 후 본 것으로 기록할 새 토픽)"""
+    cache = core.topic_cache
+    query = {'type': args.type, 'limit': args.limit}
+    discovered = []
+
+    if getattr(args, 'new_only', False):
+        # 새 토픽은 거래를 마친 뒤에 기록 (초기화 / 거래 실패 시 다음 탐색에서 다시 받음)
+        topics = discovered = core.discover_topics(args.limit, args.type, mark=False)
+    elif args.use_cache and cache and cache.load() and cache.is_fresh(query):
+        topics = cache.topics()
+        core.log(f"💾 캐시된 토픽 {len(topics)}개 사용 (TTL 이내)", "INFO")
+    else:
+        topics, _ = core.load_topics(args.limit, args.type)
+
+    selected = [topic for topic in topics if predicate(topic)]
+    core.log(f"🎯 필터 통과: {len(selected)}/{len(topics)}개", "INFO")
+    return selected, discovered
+
+
+def trade_topics(core, args, topics):
+    """선택된 토픽 거래 (--yes 가 없으면 계획만 출력) → 실패 개수"""
+    from opinion_core import format_topic
+
+    amount = core.order_amount if args.amount is None else args.amount
+    plan = core.plan_orders(topics, amount, budget=args.budget, weighting=args.weighting)
+
+    if not args.yes:
+        for topic in topics:
+            print(format_topic(topic))
+        print("\n🧮 주문 계획")
+        for line in plan.summary_lines() + [''] + plan.preview_rows():
+            print(f"   {line}")
+        core.log(f"📝 {len(topics)}개 토픽, {len(plan.legs)}건 주문 예정 (실제 주문은 --yes)", "WARNING")
+        return 0
+
+    if not topics:
+        return 0
+
+    total_success, total_fail = core.execute(
+        topics, amount, rate=args.rate, workers=args.workers, plan=plan, priority=core.order_priority
+    )
+    return total_fail
+
+
+def resume_run(core, args):
+    """저널의 중단된 거래 이어서 실행 (--yes 가 없으면 남은 주문만 출력) → 실패 개수"""
+    run_id, plan, done, unknown = core.resume_plan(args.run)
+    core.log(f"📒 {run_id}: 완료 {done}건, 남은 주문 {len(plan.legs)}건, 확인 필요(제출 후 결과 없음) {unknown}건", "INFO")
+
+    if not args.yes:
+        for line in plan.preview_rows():
+            print(f"   {line}")
+        print("\n📒 최근 실행")
+        for recent_id, created, status, legs in core.journal.runs():
+            print(f"   {recent_id}  {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(created))}  {status:<9} {legs}건")
+        return 0
+
+    if not plan.legs:
+        return 0
+
+    total_success, total_fail = core.execute(
+        None, None, rate=args.rate, workers=args.workers, plan=plan, run_id=run_id, priority=core.order_priority
+    )
+    return total_fail
+
+
+def manage_orders(core, args):
+    """주문 동기화 후 미체결 목록 출력 / 일괄 취소 / 재주문 (--yes 가 없으면 대상만 출력) → 실패 개수"""
+    minutes = 0 if args.cancel_all else args.replace_older
+    if minutes is None:
+        core.sync_orders()
+        orders = core.order_tracker.open_orders()
+    else:
+        orders = core.stale_orders(minutes)
+
+    now = time.time()
+    for order in orders:
+        print(f"   {order.order_id}  {order.describe(now)}")
+    if minutes is None or not orders:
+        core.log(f"📑 미체결 주문 {len(orders)}건", "INFO")
+        return 0
+
+    if not args.yes:
+        task = "취소" if args.cancel_all else "취소 후 재주문"
+        core.log(f"📝 {len(orders)}건 {task} 예정 (실제 실행은 --yes)", "WARNING")
+        return 0
+
+    if args.cancel_all:
+        return len(orders) - len(core.cancel_orders(orders))
+    total_success, total_fail = core.replace_orders(orders, args.rate, args.workers)
+    return total_fail
+
+
+def run(args):
+    from opinion_core import TradingCore, format_topic, parse_topic_filter
+    from opinion_schedule import parse_priority
+
+    log, file_listener = make_logger(args.quiet)
+    core = None
+    try:
+        predicate = parse_topic_filter(getattr(args, 'filter', ''))
+        core = TradingCore(log=log)
+        if getattr(args, 'priority', None) is not None:
+            core.order_priority = parse_priority(args.priority)
+
+        if args.command == 'list':
+            for topic in load_selected(core, args, predicate)[0]:
+                print(format_topic(topic))
+            return 0
+
+        # Client 초기화는 백그라운드로 시작해 토픽 로드와 겹치고, 주문 직전에 완료를 기다림
+        pending_init = [core.start_init()] if args.yes or args.command == 'orders' else []
+
+        def wait_client():
+            if pending_init:
+                try:
+                    pending_init.pop().result()
+                except Exception:
+                    # daemon 은 다음 주기에 다시 초기화 (실패한 Client 로 계속 주문하지 않게)
+                    if args.command == 'daemon':
+                        pending_init.append(core.start_init())
+                    raise
+                log("✅ Client 초기화 완료", "SUCCESS")
+                if args.command in ('trade', 'daemon'):
+                    core.unfinished_notice()
+
+        if args.command == 'resume':
+            wait_client()
+            return 1 if resume_run(core, args) else 0
+
+        if args.command == 'orders':
+            wait_client()
+            return 1 if manage_orders(core, args) else 0
+
+        if args.command == 'trade':
+            topics, discovered = load_selected(core, args, predicate)
+            wait_client()
+            failed = trade_topics(core, args, topics)
+            if args.yes:
+                core.mark_topics_seen(discovered)
+            return 1 if failed else 0
+
+        # daemon: 이번 프로세스에서 이미 거래한 토픽은 건너뜀
+        traded_keys = set()
+        while True:
+            try:
+                selected, discovered = load_selected(core, args, predicate)
+                topics = [topic for topic in selected if topic.key not in traded_keys]
+                log(f"🆕 새 토픽: {len(topics)}개", "INFO")
+                wait_client()
+                trade_topics(core, args, topics)
+                if args.yes:
+                    traded_keys.update(topic.key for topic in topics)
+                    core.mark_topics_seen(discovered)
+            except Exception as e:
+                log(f"❌ 데몬 실행 중 에러: {e}", "ERROR")
+
+            time.sleep(args.interval)
+
+    except KeyboardInterrupt:
+        log("⏹️  중단됨", "WARNING")
+        return 130
+    except ValueError as e:
+        log(f"❌ {e}", "ERROR")
+        return 2
+    finally:
+        if core:
+            core.close()
+        if file_listener:
+            file_listener.stop()
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    sys.exit(run(args))
+
+
+if __name__ == '__main__':
+    main()
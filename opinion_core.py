@@ -0,0 +1,1725 @@
+"""
+Opinion Trade 봇 코어 (GUI 독립)
+
+토픽 로드 → 선택 → 거래 파이프라인. GUI(opinion_trade_bot.py)와
+헤드리스 CLI(opinion_cli.py)가 함께 사용한다.
+requests / opinion_clob_sdk 같은 무거운 모듈은 실제로 필요할 때 import 한다.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import shlex
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from opinion_discovery import SeenTopics, family_id
+from opinion_governor import RequestGovernor, RetryableError, parse_retry_after
+from opinion_metrics import Metrics, start_metrics_server
+from opinion_models import INDICATOR, REGULAR, Topic, TopicIndex
+from opinion_schedule import LegScheduler, format_priority, parse_priority
+from opinion_warmup import ClientCache, StartupReport
+
+API_HOST = 'https://proxy.opinion.trade:8443'
+CHAIN_ID = 56
+
+STARTED_AT = time.perf_counter()  # 시작 시간 보고 기준 (코어 모듈 import 시각)
+
+
+def load_env():
+    """.env 환경변수 로드"""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+def print_log(message, level="INFO"):
+    """기본 로그 출력 (표준 출력)"""
+    print(f"[{time.strftime('%H:%M:%S')}] {message}", flush=True)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """로그 레코드를 JSON 한 줄로 변환"""
+
+    def format(self, record):
+        return json.dumps({
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)),
+            "level": getattr(record, 'bot_level', record.levelname),
+            "message": record.getMessage()
+        }, ensure_ascii=False)
+
+
+def create_file_logger(path, max_bytes, backups):
+    """회전 JSON-lines 파일 로거 (쓰기는 별도 리스너 스레드에서 처리)"""
+    handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding='utf-8')
+    handler.setFormatter(JsonLinesFormatter())
+
+    record_queue = queue.SimpleQueue()
+    listener = QueueListener(record_queue, handler)
+    listener.start()
+
+    logger = logging.getLogger('opinion_trade_bot')
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(QueueHandler(record_queue))
+    return logger, listener
+
+
+def create_env_file_logger():
+    """LOG_FILE 설정이 있으면 파일 로거 생성, 없으면 (None, None)"""
+    log_file = os.getenv('LOG_FILE', '')
+    if not log_file:
+        return None, None
+
+    return create_file_logger(
+        log_file,
+        int(os.getenv('LOG_FILE_MAX_BYTES', str(5 * 1024 * 1024))),
+        int(os.getenv('LOG_FILE_BACKUPS', '3'))
+    )
+
+
+def format_topic(topic):
+    """토픽 목록 표시 문자열"""
+    # 토픽 타입 표시
+    type_label = f"[{topic.type[0]}]"  # [R] 또는 [I]
+
+    # 제목 추출
+    title = topic.title
+    topic_id = topic.topic_id if topic.topic_id is not None else 'N/A'
+
+    if not title or title == 'Unknown':
+        title = "No Title"
+
+    # 제목 길이 제한
+    if len(title) > 65:
+        title = title[:65] + "..."
+
+    return f"{type_label} [{topic_id}] {title}"
+
+
+def parse_order_result(result):
+    """주문 API 응답 → (성공 여부, Order ID 또는 에러 메시지)"""
+    if hasattr(result, 'errno'):
+        if result.errno == 0:
+            # SDK 모델은 order_data / order_id (JSON 키는 orderData / orderId)
+            data = getattr(result.result, 'order_data', None) or getattr(result.result, 'orderData', None)
+            order_id = getattr(data, 'order_id', None) or getattr(data, 'orderId', None)
+            return True, str(order_id) if order_id else 'N/A'
+        else:
+            return False, result.errmsg
+    else:
+        return True, str(result)
+
+
+FILTER_FIELDS = {
+    'type': lambda topic: topic.type,
+    'id': lambda topic: str(topic.topic_id),
+    'indicator': lambda topic: str(topic.indicator_id or ''),
+    'title': lambda topic: topic.title or '',
+    'children': lambda topic: len(topic.options),
+    'yes': lambda topic: [option.yes_price for option in topic.options],
+    'no': lambda topic: [option.no_price for option in topic.options],
+}
+
+FILTER_TYPE_ALIASES = {'R': 'REGULAR', 'I': 'INDICATOR'}
+
+FILTER_TERM = re.compile(r'^(\w+)(!=|>=|<=|!~|=|~|>|<)(.*)$')
+
+
+def parse_topic_filter(expression):
+    """필터 식 → 토픽 판별 함수
+
+    공백으로 구분된 조건을 모두 만족하는 토픽만 통과한다 (AND).
+      type=REGULAR   id=123,456   title~"bitcoin price"   children>=2   yes<0.3
+    연산자: = != (쉼표로 여러 값), ~ !~ (대소문자 무시 포함), > < >= <= (숫자)
+    yes/no 가격 조건은 옵션 중 하나라도 만족하면 통과한다.
+    """
+    conditions = []
+
+    for term in shlex.split(expression or ''):
+        match = FILTER_TERM.match(term)
+        if not match:
+            raise ValueError(f"필터 조건 형식 오류: {term}")
+
+        field, op, value = match.groups()
+        if field not in FILTER_FIELDS:
+            raise ValueError(f"알 수 없는 필터 필드: {field} (사용 가능: {', '.join(FILTER_FIELDS)})")
+
+        conditions.append(make_filter_condition(FILTER_FIELDS[field], field, op, value))
+
+    return lambda topic: all(condition(topic) for condition in conditions)
+
+
+def make_filter_condition(getter, field, op, value):
+    """단일 필터 조건 함수 생성"""
+    if op in ('=', '!='):
+        values = {v.strip().upper() for v in value.split(',')}
+        if field == 'type':
+            values = {FILTER_TYPE_ALIASES.get(v, v) for v in values}
+        negate = op == '!='
+        return lambda topic: (str(getter(topic)).upper() in values) != negate
+
+    if op in ('~', '!~'):
+        needle = value.lower()
+        negate = op == '!~'
+        return lambda topic: (needle in str(getter(topic)).lower()) != negate
+
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValueError(f"숫자 비교에는 숫자가 필요합니다: {field}{op}{value}")
+
+    compare = {
+        '>': lambda a: a > number,
+        '<': lambda a: a < number,
+        '>=': lambda a: a >= number,
+        '<=': lambda a: a <= number,
+    }[op]
+
+    def matches(value):
+        try:
+            return compare(float(value))
+        except (TypeError, ValueError):
+            return False
+
+    def condition(topic):
+        value = getter(topic)
+        if isinstance(value, list):
+            return any(matches(v) for v in value)
+        return matches(value)
+
+    return condition
+
+
+class TokenBucket:
+    """토큰 버킷 속도 제한 (초당 rate개, 최대 burst개 연속 허용)"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        """토큰 1개를 가져가면 0, 없으면 다음 토큰까지 기다릴 시간(초)"""
+        if self.rate <= 0:
+            return 0.0
+
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        """토큰 1개를 얻을 때까지 대기 (rate <= 0 이면 제한 없음)"""
+        while True:
+            wait = self.take()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+
+class TopicCache:
+    """토픽 디스크 캐시 (topicId/indicatorId 키, 필드 그룹별 TTL)
+
+    meta 그룹(제목, 토큰 ID, 옵션 구조)과 price 그룹(yes/no 가격)을
+    따로 지문(hash)으로 비교해 새로 생기거나 바뀐 토픽만 골라낸다.
+    """
+
+    VERSION = 3
+
+    def __init__(self, path, meta_ttl=86400, price_ttl=60):
+        self.path = path
+        self.ttls = {'meta': meta_ttl, 'price': price_ttl}
+        self.entries = {}   # 토픽 키 → {'hash': ..., 'fetched': ...}
+        self.objects = {}   # 토픽 키 → Topic
+        self.order = []
+        self.query = {}
+        self.saved_at = 0
+
+    @staticmethod
+    def split_fields(topic):
+        """(meta, price) 필드 그룹 추출"""
+        meta = [topic.topic_id, topic.indicator_id, topic.title, topic.type, topic.cutoff,
+                [[o.topic_id, o.title, o.yes_pos, o.no_pos] for o in topic.options]]
+        price = [[o.yes_price, o.no_price] for o in topic.options] + [topic.volume]
+        return meta, price
+
+    @classmethod
+    def fingerprints(cls, topic):
+        """필드 그룹별 지문"""
+        return {
+            group: hashlib.sha1(json.dumps(fields).encode()).hexdigest()
+            for group, fields in zip(('meta', 'price'), cls.split_fields(topic))
+        }
+
+    def load(self):
+        """디스크에서 캐시 읽기 (없거나 손상되면 빈 목록)"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return []
+
+        if data.get('version') != self.VERSION:
+            return []
+
+        entries = data.get('entries', {})
+        self.objects = {key: Topic.from_cache(entry.pop('topic')) for key, entry in entries.items()}
+        self.entries = entries
+        self.order = data.get('order', [])
+        self.query = data.get('query', {})
+        self.saved_at = data.get('saved_at', 0)
+        return self.topics()
+
+    def save(self):
+        """디스크에 원자적으로 저장"""
+        self.saved_at = time.time()
+        entries = {
+            key: dict(entry, topic=self.objects[key].to_json())
+            for key, entry in self.entries.items()
+        }
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': self.VERSION,
+                'saved_at': self.saved_at,
+                'query': self.query,
+                'order': self.order,
+                'entries': entries
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def topics(self):
+        """캐시된 토픽 목록 (마지막 로드 순서)"""
+        return [self.objects[key] for key in self.order if key in self.objects]
+
+    def is_fresh(self, query, now=None):
+        """같은 조건으로 로드했고 모든 필드 그룹이 TTL 이내인지"""
+        if not self.order or query != self.query:
+            return False
+
+        now = now or time.time()
+        for key in self.order:
+            entry = self.entries.get(key)
+            if not entry:
+                return False
+            for group, ttl in self.ttls.items():
+                if now - entry['fetched'].get(group, 0) > ttl:
+                    return False
+        return True
+
+    def update(self, topics, query):
+        """새로 받은 토픽 반영 후 새로 추가되거나 바뀐 키 집합 반환"""
+        now = time.time()
+        changed = set()
+        order = []
+
+        for topic in topics:
+            key = topic.key
+            order.append(key)
+            hashes = self.fingerprints(topic)
+            entry = self.entries.get(key)
+
+            if entry is None or entry['hash'] != hashes:
+                changed.add(key)
+                entry = {'hash': hashes, 'fetched': {}}
+                self.entries[key] = entry
+                self.objects[key] = topic
+
+            for group in self.ttls:
+                entry['fetched'][group] = now
+
+        self.order = order
+        self.query = query
+        return changed
+
+
+class OrderLeg:
+    """단일 주문 단위 (토픽 × 옵션 × YES/NO)"""
+
+    def __init__(self, topic_id, title, child_topic_id, child_title, outcome, token_id, price, amount,
+                 topic_type=REGULAR, cutoff=0.0, volume=0.0):
+        self.topic_id = topic_id
+        self.title = title
+        self.child_topic_id = child_topic_id
+        self.child_title = child_title
+        self.outcome = outcome  # 'YES' 또는 'NO'
+        self.token_id = token_id
+        self.price = price  # 주문 가격 (계획 후 SafeRate 적용)
+        self.base_price = price  # 계획 기준 가격 (로드 시점 또는 실시간 호가)
+        self.amount = amount
+        # 스케줄러 우선순위 / 마감 (토픽 값, 저널에서 복원한 주문은 모름)
+        self.topic_type = topic_type
+        self.cutoff = cutoff
+        self.volume = volume
+        # 제출 시점 호가 (leg_price 가 주문당 한 번만 즉시 조회)
+        self.live_price = None
+        self.price_fetched = False
+        self.price_skipped = False
+
+
+def journal_leg(entry):
+    """거래 저널 planned 기록 → OrderLeg"""
+    leg = OrderLeg(entry['topic_id'], entry['title'], entry['child_topic_id'], entry['child_title'],
+                   entry['outcome'], entry['token_id'], entry['price'], entry['amount'])
+    leg.base_price = entry['base_price']
+    return leg
+
+
+class OrderEngine:
+    """주문 제출 엔진 (워커 풀 + 우선순위 스케줄러 + 토큰 버킷)
+
+    워커는 스케줄러에서 가장 급한 주문을 가져간다. per_topic_order=True 이면 같은 토픽의 주문은
+    한 번에 하나씩 childList 순서(YES → NO)대로 제출된다. stop 이벤트가 설정되면 남은 주문은 제출하지 않는다.
+    """
+
+    def __init__(self, submit, workers=4, rate=2.0, burst=1, per_topic_order=True, on_result=None, metrics=None,
+                 stop=None):
+        self.submit = submit
+        self.workers = max(1, int(workers))
+        self.bucket = TokenBucket(rate, burst)
+        self.per_topic_order = per_topic_order
+        self.on_result = on_result
+        self.metrics = metrics or Metrics()
+        self.stop = stop or threading.Event()
+
+        self.lock = threading.Lock()
+        self.success = 0
+        self.fail = 0
+        self.cancelled = 0
+
+    def run(self, legs, scheduler=None):
+        """주문 목록을 모두 제출하고 (성공, 실패) 개수 반환 (scheduler 가 없으면 선택 순서)"""
+        legs = list(legs)
+        if not legs:
+            return 0, 0
+
+        scheduler = scheduler or LegScheduler(legs, per_topic_order=self.per_topic_order)
+        changed = threading.Condition()
+
+        threads = [
+            threading.Thread(target=self._worker, args=(scheduler, changed), daemon=True)
+            for _ in range(min(self.workers, len(legs)))
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.cancelled = len(legs) - self.success - self.fail - len(scheduler.dropped)
+        return self.success, self.fail
+
+    def _worker(self, scheduler, changed):
+        while True:
+            with changed:
+                leg = scheduler.poll()
+                # 남은 토픽이 모두 제출 중이면 하나가 끝날 때까지 대기
+                while leg is None and not scheduler.exhausted:
+                    changed.wait(0.5)
+                    leg = scheduler.poll()
+            if leg is None:
+                break
+
+            if self.stop.is_set():
+                scheduler.close(leg)
+                with changed:
+                    changed.notify_all()
+                break
+
+            self.bucket.acquire()
+            if scheduler.expired(leg):
+                scheduler.drop(leg)
+                with changed:
+                    changed.notify_all()
+                continue
+
+            started = time.perf_counter()
+            try:
+                success, result = self.submit(leg)
+            except Exception as e:
+                success, result = False, str(e)
+            seconds = time.perf_counter() - started
+            self.metrics.observe('opinion_order_seconds', seconds)
+            self.metrics.inc('opinion_orders_total', result='success' if success else 'fail')
+
+            with self.lock:
+                if success:
+                    self.success += 1
+                else:
+                    self.fail += 1
+
+            if self.on_result:
+                self.on_result(leg, success, result)
+
+            scheduler.done(leg, seconds, success)
+            with changed:
+                changed.notify_all()
+
+
+class TradingCore:
+    """GUI와 무관한 로드 → 선택 → 거래 파이프라인"""
+
+    def __init__(self, log=None):
+        load_env()
+        self.log = log or print_log
+
+        # 설정
+        self.api_host = os.getenv('API_HOST', API_HOST).rstrip('/')
+        self.api_key = os.getenv('API_KEY', '')
+        self.rpc_url = os.getenv('RPC_URL', 'https://bsc-dataseed.binance.org')
+        self.private_key = os.getenv('PRIVATE_KEY', '')
+        self.signer_address = os.getenv('SIGNER_ADDRESS', '')
+        self.maker_address = os.getenv('MAKER_ADDRESS', '')
+        self.order_amount = float(os.getenv('ORDER_AMOUNT', '5.0'))
+
+        # 주문 계획 설정 (ORDER_BUDGET=0 이면 모든 주문에 ORDER_AMOUNT)
+        self.order_budget = float(os.getenv('ORDER_BUDGET', '0'))
+        self.order_weighting = os.getenv('ORDER_WEIGHTING', 'equal')
+        self.order_min_amount = float(os.getenv('ORDER_MIN_AMOUNT', '0'))
+        self.order_max_amount = float(os.getenv('ORDER_MAX_AMOUNT', '0'))
+
+        # 주문 제출 엔진 설정
+        self.order_rate = float(os.getenv('ORDER_RATE', '2.0'))
+        self.order_burst = int(os.getenv('ORDER_BURST', '1'))
+        self.order_workers = int(os.getenv('ORDER_WORKERS', '4'))
+        self.order_per_topic = os.getenv('ORDER_PER_TOPIC', '1') == '1'
+
+        # 주문 스케줄러 (우선순위 키, 토픽 마감 여유 / 토픽별 시간 한도(초, 0 = 없음), 느린 주문 기준(초))
+        self.order_priority = parse_priority(os.getenv('ORDER_PRIORITY', 'end,edge'))
+        self.order_cutoff_margin = float(os.getenv('ORDER_CUTOFF_MARGIN', '60'))
+        self.order_topic_timeout = float(os.getenv('ORDER_TOPIC_TIMEOUT', '0'))
+        self.order_slow_seconds = float(os.getenv('ORDER_SLOW_SECONDS', '2'))
+
+        # 사전 서명 설정 (PRESIGN_DEPTH=0 이면 사용 안 함)
+        self.presign_depth = int(os.getenv('PRESIGN_DEPTH', '8'))
+        self.presign_workers = int(os.getenv('PRESIGN_WORKERS', '2'))
+        self.presign_max_age = float(os.getenv('PRESIGN_MAX_AGE', '30'))
+
+        # 실시간 가격 설정 (PRICE_MAX_AGE=0 이면 로드 시점 가격 사용)
+        self.price_max_age = float(os.getenv('PRICE_MAX_AGE', '10'))
+        self.price_poll_interval = float(os.getenv('PRICE_POLL_INTERVAL', '2'))
+        self.price_batch = int(os.getenv('PRICE_BATCH', '20'))
+        self.price_safe_rate = float(os.getenv('PRICE_SAFE_RATE', '0'))
+        self.price_max_deviation = float(os.getenv('PRICE_MAX_DEVIATION', '0.1'))
+        self.price_cache = None
+        self.price_fallbacks = 0
+        self.price_skipped = 0
+
+        # 토픽 페이지 로드 설정
+        self.page_size = int(os.getenv('PAGE_SIZE', '20'))
+        self.page_fanout = max(1, int(os.getenv('PAGE_FANOUT', '4')))
+        self.page_delay = float(os.getenv('PAGE_DELAY', '0'))
+        self.http_timeout = float(os.getenv('HTTP_TIMEOUT', '15'))
+        self.session = None
+        self.session_lock = threading.Lock()
+
+        # 토픽 캐시 설정
+        self.topic_cache = None
+        cache_file = os.getenv('TOPIC_CACHE_FILE', '.topic_cache.json')
+        if cache_file:
+            self.topic_cache = TopicCache(
+                cache_file,
+                meta_ttl=float(os.getenv('TOPIC_CACHE_META_TTL', '86400')),
+                price_ttl=float(os.getenv('TOPIC_CACHE_PRICE_TTL', '60'))
+            )
+
+        # 새 토픽 탐색 기록 (비우면 새 토픽 탐색 사용 안 함)
+        self.seen_topics = None
+        seen_file = os.getenv('TOPIC_SEEN_FILE', '.topic_seen.json')
+        if seen_file:
+            self.seen_topics = SeenTopics(seen_file, max_ids=int(os.getenv('TOPIC_SEEN_MAX', '5000')))
+
+        self.client = None
+        self.order_signer = None
+        self.topic_index = TopicIndex()
+
+        # Client 예열 (체인 상수 / 승인 확인 캐시, CLIENT_CACHE_FILE 을 비우면 매번 조회)
+        self.client_cache = None
+        self.client_cache_key = None
+        cache_file = os.getenv('CLIENT_CACHE_FILE', '.client_cache.json')
+        if cache_file:
+            self.client_cache = ClientCache(cache_file, ttl=float(os.getenv('CLIENT_CACHE_TTL', '86400')))
+        self.approval_check = os.getenv('APPROVAL_CHECK', '1') == '1'
+        self.startup_report = None
+
+        # 거래 저널 (JOURNAL_FILE 을 비우면 사용 안 함)
+        self.journal = None
+        journal_file = os.getenv('JOURNAL_FILE', '.trade_journal.db')
+        if journal_file:
+            from opinion_journal import TradeJournal
+
+            self.journal = TradeJournal(
+                journal_file,
+                flush_interval=float(os.getenv('JOURNAL_FLUSH_MS', '50')) / 1000,
+                log=self.log
+            )
+
+        # 주문 추적 (ORDER_SYNC_INTERVAL=0 이면 수동 동기화만)
+        self.order_sync_interval = float(os.getenv('ORDER_SYNC_INTERVAL', '30'))
+        self.order_stale_minutes = float(os.getenv('ORDER_STALE_MINUTES', '10'))
+        self.order_tracker = None
+
+        # 다중 지갑 (WALLETS_FILE 에 지갑이 2개 이상이면 지갑별 프로세스로 분산 제출)
+        self.wallets_file = os.getenv('WALLETS_FILE', '')
+        self.wallet_pool = None
+
+        # 진행 중인 로드 / 거래의 중단 이벤트 (cancel() 이 모두 설정)
+        self.runs = set()
+        self.runs_lock = threading.Lock()
+
+        # asyncio 엔진 (ENGINE=thread 이거나 aiohttp 가 없으면 스레드 엔진)
+        self.async_engine = None
+        if os.getenv('ENGINE', 'async') == 'async':
+            import opinion_async
+
+            if opinion_async.available():
+                self.async_engine = opinion_async.AsyncEngine(
+                    self,
+                    concurrency=int(os.getenv('ASYNC_CONCURRENCY', '64')),
+                    sign_workers=self.presign_workers
+                )
+
+        # 지표 (METRICS_PORT 를 설정하면 /metrics 로 노출)
+        self.metrics = Metrics()
+        self.metrics_server = None
+        metrics_port = int(os.getenv('METRICS_PORT', '0'))
+        if metrics_port > 0:
+            self.metrics_server = start_metrics_server(self.metrics, metrics_port)
+            self.log(f"📈 지표 엔드포인트: http://127.0.0.1:{metrics_port}/metrics", "INFO")
+
+        # 요청 조절기 (토픽/마켓 조회용, 주문 제출용)
+        governor_settings = dict(
+            rate=float(os.getenv('API_RATE', '0')),
+            min_rate=float(os.getenv('API_MIN_RATE', '0.5')),
+            max_rate=float(os.getenv('API_MAX_RATE', '50')),
+            max_retries=int(os.getenv('API_MAX_RETRIES', '4')),
+            base_delay=float(os.getenv('API_BACKOFF_BASE', '0.5')),
+            max_delay=float(os.getenv('API_BACKOFF_MAX', '30')),
+            breaker_threshold=int(os.getenv('BREAKER_THRESHOLD', '5')),
+            breaker_cooldown=float(os.getenv('BREAKER_COOLDOWN', '30')),
+            metrics=self.metrics,
+            log=self.log
+        )
+        self.api_governor = RequestGovernor('api', **governor_settings)
+        # 주문은 서버가 받았을 수도 있는 500 / 타임아웃은 중복 주문 위험이 있어 재시도하지 않음 (회로 차단 집계는 함)
+        self.order_governor = RequestGovernor(
+            'order', retry_statuses=(429, 502, 503, 504), retry_network=False, **governor_settings
+        )
+
+    def preload(self):
+        """SDK 모듈을 백그라운드 스레드에서 미리 import (Client 초기화 전에 부르면 초기화가 빨라짐)"""
+        def load():
+            try:
+                import opinion_clob_sdk  # noqa: F401
+                import opinion_presign  # noqa: F401
+            except ImportError:
+                pass
+
+        threading.Thread(target=load, daemon=True, name='opinion-preload').start()
+
+    def start_init(self, progress=None):
+        """init_client 를 백그라운드 스레드에서 실행 → Future (결과는 Client, 실패하면 예외)"""
+        from concurrent.futures import Future
+
+        future = Future()
+
+        def run():
+            try:
+                future.set_result(self.init_client(progress))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, daemon=True, name='opinion-init').start()
+        return future
+
+    def init_client(self, progress=None):
+        """SDK Client 생성 + 예열 → Client
+
+        progress(단계 이름, 완료 단계 수, 전체 단계 수) 로 진행 상황을 알린다 (초기화 스레드에서 호출).
+        """
+        import sys
+
+        phases = ('SDK 로드', 'Client 생성', '체인 상수', '연결 / 서명 예열')
+        report = StartupReport(STARTED_AT, self.metrics)
+
+        def step(index):
+            if progress:
+                progress(phases[index] if index < len(phases) else '완료', index, len(phases))
+
+        step(0)
+        with report.phase(phases[0]) as info:
+            if 'opinion_clob_sdk' in sys.modules:
+                info['note'] = '미리 로드됨'
+            from opinion_clob_sdk import Client
+
+        if self.wallets_file:
+            from opinion_wallets import WalletPool, load_wallets
+
+            wallets = load_wallets(self.wallets_file)
+            if len(wallets) == 1 or not self.private_key:
+                # 지갑이 1개면 그 지갑으로 직접 주문, 여러 개면 호가 조회 등 코디네이터 Client 용
+                self.private_key = wallets[0].private_key
+                self.maker_address = wallets[0].maker_address
+                self.signer_address = wallets[0].signer_address
+            self.wallet_pool = WalletPool(wallets, log=self.log) if len(wallets) > 1 else None
+            self.log(f"👛 지갑 {len(wallets)}개: {', '.join(wallet.name for wallet in wallets)}", "INFO")
+
+        if not self.private_key:
+            raise ValueError("PRIVATE_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
+
+        step(1)
+        with report.phase(phases[1]):
+            self.client = Client(
+                host=self.api_host,
+                apikey=self.api_key,
+                chain_id=CHAIN_ID,
+                rpc_url=self.rpc_url,
+                private_key=self.private_key,
+                multi_sig_addr=self.maker_address,
+                conditional_tokens_addr='0xAD1a38cEc043e70E83a3eC30443dB285ED10D774',
+                multisend_addr='0x998739BFdAAdde7C933B942a68053933098f9EDa'
+            )
+            self.client_cache_key = ClientCache.key(self.api_host, CHAIN_ID, self.maker_address)
+
+        step(2)
+        with report.phase(phases[2]) as info:
+            info['note'] = constants = self.load_chain_constants()
+
+        # 체인 상수를 조회했으면 SDK 커넥션은 이미 열려 있음
+        step(3)
+        with report.phase(phases[3]) as info:
+            info['note'] = self.prewarm(warm_sdk=constants != '조회')
+
+        if self.price_max_age > 0:
+            from opinion_prices import PriceCache
+
+            if self.price_cache:
+                self.price_cache.stop()
+            self.price_cache = PriceCache(
+                self.fetch_best_ask,
+                max_age=self.price_max_age,
+                interval=self.price_poll_interval,
+                batch_size=self.price_batch,
+                workers=self.page_fanout,
+                log=self.log
+            ).start()
+
+        from opinion_orders import OrderTracker
+
+        if self.order_tracker:
+            self.order_tracker.stop()
+        self.order_tracker = OrderTracker(
+            self.fetch_my_orders,
+            self.cancel_order,
+            interval=self.order_sync_interval,
+            workers=self.page_fanout,
+            log=self.log
+        ).start()
+
+        # 승인 확인은 RPC 가 느릴 수 있어 첫 주문 준비를 기다리게 하지 않음
+        if self.approval_check:
+            threading.Thread(target=self.check_approvals, daemon=True, name='opinion-approvals').start()
+
+        self.save_client_cache()
+        self.startup_report = report
+        self.log("⏱️  시작 시간", "INFO")
+        for line in report.lines():
+            self.log(f"   {line}", "INFO")
+        step(len(phases))
+        return self.client
+
+    def load_chain_constants(self):
+        """견적 토큰 / 알고 있는 마켓의 거래소 정보를 서명기에 넣음 (캐시가 없으면 조회) → '캐시' / '조회'"""
+        signer = self.get_order_signer()
+        if not signer:
+            return '서명기 미지원'
+
+        cache, key = self.client_cache, self.client_cache_key
+        quote_tokens = cache.get(key, 'quote_tokens') if cache else None
+        if quote_tokens:
+            signer.seed(quote_tokens, cache.markets(key))
+            return '캐시'
+
+        quote_tokens = signer.quote_token_list()
+        if cache:
+            cache.put(key, 'quote_tokens', [list(item) for item in quote_tokens])
+        return '조회'
+
+    def prewarm(self, warm_sdk=True):
+        """API 커넥션(SDK / 토픽 조회 세션)과 서명기를 병렬로 예열 → 예열한 항목 (실패는 로그만)"""
+        url = f"{self.api_host}/openapi/quoteToken"
+        tasks = {}
+        if warm_sdk:
+            tasks['SDK'] = lambda: self.client.get_quote_tokens(use_cache=False)
+        if self.async_engine:
+            tasks['aiohttp'] = lambda: self.async_engine.run(self.async_engine.warm(url))
+        else:
+            tasks['requests'] = lambda: self.get_session().get(url, timeout=self.http_timeout).close()
+        signer = self.get_order_signer()
+        if signer:
+            tasks['서명'] = signer.warm
+
+        def run(item):
+            name, task = item
+            try:
+                task()
+                return name
+            except Exception as e:
+                self.log(f"⚠️  {name} 예열 실패: {e}", "WARNING")
+                return None
+
+        with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+            warmed = [name for name in pool.map(run, tasks.items()) if name]
+        return ', '.join(warmed)
+
+    def check_approvals(self):
+        """거래 승인 상태 확인 (읽기 전용 RPC, 캐시 TTL 이내에 확인했으면 생략) → 빠진 승인 목록 (확인 못 하면 None)"""
+        from opinion_warmup import missing_approvals
+
+        cache, key = self.client_cache, self.client_cache_key
+        if cache and cache.get(key, 'approvals'):
+            return []
+
+        signer = self.get_order_signer()
+        if not signer:
+            return None
+
+        started = time.perf_counter()
+        try:
+            missing = missing_approvals(self.client, signer.quote_token_list())
+        except Exception as e:
+            self.log(f"⚠️  거래 승인 확인 실패 (RPC): {e}", "WARNING")
+            return None
+        self.metrics.observe('opinion_startup_seconds', time.perf_counter() - started, phase='승인 확인')
+
+        if missing:
+            self.log("⚠️  거래 승인이 필요합니다 (SDK enable_trading 으로 승인 후 다시 시작)", "WARNING")
+            for item in missing:
+                self.log(f"   {item}", "WARNING")
+        else:
+            self.log(f"✅ 거래 승인 확인 완료 ({time.perf_counter() - started:.2f}초)", "SUCCESS")
+            if cache:
+                cache.put(key, 'approvals', True)
+                self.save_client_cache()
+        return missing
+
+    def save_client_cache(self):
+        """체인 상수 / 마켓 정보 / 승인 확인 결과 저장"""
+        if not (self.client_cache and self.client_cache_key):
+            return
+        if self.order_signer:
+            self.client_cache.put_markets(self.client_cache_key, dict(self.order_signer.markets))
+        try:
+            self.client_cache.save()
+        except OSError as e:
+            self.log(f"⚠️  Client 캐시 저장 실패: {e}", "WARNING")
+
+    def fetch_best_ask(self, token_id):
+        """토큰의 최우선 매도 호가 (오더북 조회)"""
+        from opinion_prices import best_ask
+
+        with self.metrics.timer('opinion_request_seconds', endpoint='orderbook'):
+            return best_ask(self.api_governor.call(lambda: self.client.get_orderbook(token_id)))
+
+    def fetch_my_orders(self, status, page, limit):
+        """내 주문 목록 한 페이지 → (주문 목록, 전체 개수)"""
+        def request():
+            with self.metrics.timer('opinion_request_seconds', endpoint='orders'):
+                return self.client.get_my_orders(status=status, limit=limit, page=page)
+
+        response = self.api_governor.call(request)
+        if getattr(response, 'errno', 0):
+            raise ValueError(f"주문 목록 조회 실패 (errno={response.errno}): {response.errmsg}")
+        result = response.result
+        return list(result.list or []) if result else [], (result.total or 0) if result else 0
+
+    def cancel_order(self, order_id):
+        """주문 1건 취소 → (성공 여부, 에러 메시지)"""
+        def request():
+            with self.metrics.timer('opinion_request_seconds', endpoint='cancel'):
+                return self.client.cancel_order(str(order_id))
+
+        response = self.api_governor.call(request)
+        if getattr(response, 'errno', 0):
+            return False, response.errmsg
+        if getattr(response.result, 'result', True) is False:
+            return False, "취소되지 않음"
+        return True, None
+
+    def watch_prices(self, topics):
+        """선택한 토픽의 YES/NO 토큰 가격을 백그라운드로 갱신"""
+        if self.price_cache:
+            self.price_cache.watch(
+                token_id for topic in topics for option in topic.options
+                for token_id in (option.yes_pos, option.no_pos)
+            )
+
+    def leg_price(self, leg):
+        """주문 가격: max_age 이내의 실시간 호가 + SafeRate (없으면 주문당 한 번만 즉시 조회, 실패하면 계획 가격)
+
+        호가가 계획 기준 가격에서 PRICE_MAX_DEVIATION 넘게 움직였으면 ValueError 로 이 주문을 건너뛴다.
+        """
+        if not self.price_cache:
+            return leg.price
+        price = self.price_cache.get(leg.token_id)
+        if price is None and not leg.price_fetched:
+            # 사전 서명 후 take 에서 다시 불려도 오더북은 한 번만 조회
+            leg.price_fetched = True
+            self.price_cache.refresh([leg.token_id])
+            price = self.price_cache.get(leg.token_id)
+            if price is None:
+                self.price_fallbacks += 1
+        if price is None:
+            price = leg.live_price  # 이 주문에서 마지막으로 본 호가
+        if price is None:
+            return leg.price
+        leg.live_price = price
+        if price == leg.base_price:
+            return leg.price
+        if self.price_max_deviation:
+            try:
+                deviation = abs(float(price) - float(leg.base_price))
+            except (TypeError, ValueError):
+                deviation = 0.0
+            if deviation > self.price_max_deviation:
+                if not leg.price_skipped:
+                    leg.price_skipped = True
+                    self.price_skipped += 1
+                raise ValueError(f"호가 이탈: 계획 {leg.base_price} → 현재 {price} (허용 ±{self.price_max_deviation})")
+        if self.price_safe_rate:
+            return self.calculate_safe_price(price, self.price_safe_rate)
+        return price
+
+    def get_session(self):
+        """keep-alive 커넥션 풀을 쓰는 공용 HTTP 세션 (처음 사용할 때 생성)"""
+        with self.session_lock:
+            if self.session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.page_fanout * 2)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update({
+                    "accept": "application/json",
+                    "apikey": self.api_key
+                })
+                self.session = session
+            return self.session
+
+    def fetch_page(self, url, params, page):
+        """단일 페이지 요청 (실패 시 None)"""
+        params = dict(params, page=page, limit=self.page_size)
+        endpoint = url.rsplit('/', 1)[-1]
+
+        def request():
+            try:
+                with self.metrics.timer('opinion_request_seconds', endpoint=endpoint):
+                    response = self.get_session().get(url, params=params, timeout=self.http_timeout)
+            except Exception as e:
+                self.metrics.inc('opinion_errors_total', endpoint=endpoint, code=type(e).__name__)
+                raise
+
+            if response.status_code != 200:
+                self.metrics.inc('opinion_errors_total', endpoint=endpoint, code=str(response.status_code))
+                if response.status_code in self.api_governor.retry_statuses:
+                    raise RetryableError(response.status_code, parse_retry_after(response.headers.get('Retry-After')))
+            return response
+
+        response = self.api_governor.call(request)
+
+        if response.status_code != 200:
+            self.log(f"⚠️  {endpoint} {page}페이지 HTTP {response.status_code} - 이후 페이지 생략", "WARNING")
+            return None
+
+        data = response.json()
+
+        if data.get('errno') != 0:
+            self.metrics.inc('opinion_errors_total', endpoint=endpoint, code=f"errno{data.get('errno')}")
+            self.log(f"⚠️  {endpoint} {page}페이지 errno={data.get('errno')} {data.get('errmsg', '')} - 이후 페이지 생략", "WARNING")
+            return None
+
+        result = data.get('result', {})
+        return result.get('list', []) or []
+
+    def iter_pages(self, url, params, limit, convert=None, stop=None):
+        """페이지를 page_fanout개씩 병렬 요청하고 페이지 순서대로 하나씩 반환 (제너레이터)
+
+        순차 로드와 동일하게 실패/빈/마지막(짧은) 페이지에서 멈추고,
+        그 뒤 페이지의 결과는 버린다. stop 이벤트가 설정되면 다음 묶음을 요청하지 않는다.
+        """
+        count = 0
+        page = 1
+        per_page = self.page_size
+
+        with ThreadPoolExecutor(max_workers=self.page_fanout) as pool:
+            while count < limit and not (stop and stop.is_set()):
+                needed_pages = -(-(limit - count) // per_page)
+                batch = range(page, page + max(1, min(self.page_fanout, needed_pages)))
+                futures = [pool.submit(self.fetch_page, url, params, p) for p in batch]
+
+                for future in futures:
+                    rows = future.result()
+                    if rows is None:
+                        return
+
+                    items = (convert(rows) if convert else rows)[:limit - count]
+                    count += len(items)
+                    if items:
+                        yield items
+
+                    if len(rows) < per_page or count >= limit:
+                        return
+
+                page += len(batch)
+                if self.page_delay > 0:
+                    time.sleep(self.page_delay)
+
+    def regular_source(self):
+        """일반 토픽 페이지 요청 (url, params, 변환 함수)"""
+        url = f"{self.api_host}/api/bsc/api/v2/topic"
+        params = {
+            "sortBy": "1",
+            "chainId": "56",
+            "status": "2",  # ACTIVATED
+            "isShow": "1",
+            "topicType": "2",
+            "indicatorType": "2"
+        }
+        return url, params, self.convert_topics
+
+    def load_regular_topics(self, limit, stop=None):
+        """일반 토픽 로드 (/api/v2/topic) - 페이지 단위 제너레이터"""
+        url, params, convert = self.regular_source()
+        return self.iter_pages(url, params, limit, convert=convert, stop=stop)
+
+    def convert_topics(self, rows):
+        """일반 토픽 JSON → Topic"""
+        return [Topic.from_json(row, REGULAR) for row in rows]
+
+    def indicator_source(self):
+        """지표 토픽 페이지 요청 (url, params, 변환 함수)"""
+        url = f"{self.api_host}/api/bsc/api/v2/indicator"
+        params = {
+            "chainId": "56"
+        }
+        return url, params, self.convert_indicators
+
+    def load_indicator_topics(self, limit, stop=None):
+        """지표 토픽 로드 (/api/v2/indicator) - 페이지 단위 제너레이터"""
+        url, params, convert = self.indicator_source()
+        return self.iter_pages(url, params, limit, convert=convert, stop=stop)
+
+    def convert_indicators(self, indicators):
+        """indicator를 토픽 형식으로 변환"""
+        topics = []
+        for indicator in indicators:
+            topic_data = indicator.get('topic', {})
+            if topic_data:
+                # indicator 제목 사용
+                title = indicator.get('title', topic_data.get('title', ''))
+                topics.append(Topic.from_json(topic_data, INDICATOR, title=title, indicator_id=indicator.get('id')))
+        return topics
+
+    def iter_topics(self, target_limit, topic_type_filter='ALL', stop=None):
+        """토픽을 페이지 단위로 반환 (제너레이터, REGULAR → INDICATOR 순서, 합계 target_limit개까지)
+
+        두 종류는 백그라운드(스레드 또는 asyncio 엔진)에서 동시에 요청하고, 지표 토픽 페이지는
+        일반 토픽이 끝난 뒤 순서대로 내보낸다. 제너레이터를 닫거나 stop 이 설정되면 남은 요청을 멈춘다.
+        """
+        sources = []
+
+        # 1. 일반 토픽 (/api/v2/topic), 2. 지표 토픽 (/api/v2/indicator)
+        if topic_type_filter in ['ALL', 'REGULAR']:
+            self.log("📋 일반 토픽 로딩 중...", "INFO")
+            sources.append(("일반 토픽", self.regular_source()))
+        if topic_type_filter in ['ALL', 'INDICATOR']:
+            self.log("📊 지표 토픽 로딩 중...", "INFO")
+            sources.append(("지표 토픽", self.indicator_source()))
+
+        stop = stop or threading.Event()
+        halt = threading.Event()  # 끝났거나 중단되면 백그라운드 요청 정지
+        if self.async_engine:
+            streams, stop_async = self.async_engine.stream_pages(sources, target_limit)
+        else:
+            stop_async = None
+            streams = []
+            for label, source in sources:
+                pages = queue.Queue()
+                threading.Thread(
+                    target=self._pump_pages, args=(source, target_limit, halt, pages), daemon=True
+                ).start()
+                streams.append((label, pages))
+
+        remaining = target_limit
+        try:
+            for label, pages in streams:
+                count = 0
+                while remaining > 0 and not stop.is_set():
+                    page = pages.get()
+                    if page is None:
+                        break
+                    if isinstance(page, Exception):
+                        raise page
+
+                    page = page[:remaining]
+                    remaining -= len(page)
+                    count += len(page)
+                    self.topic_index.update(page)
+                    yield page
+
+                self.log(f"   ✅ {label}: {count}개", "SUCCESS")
+        finally:
+            halt.set()
+            if stop_async:
+                stop_async()
+
+    def _pump_pages(self, source, limit, stop, pages):
+        """페이지 제너레이터 결과를 큐로 전달 (백그라운드 스레드, 끝나면 None)"""
+        url, params, convert = source
+        try:
+            for page in self.iter_pages(url, params, limit, convert=convert, stop=stop):
+                pages.put(page)
+        except Exception as e:
+            pages.put(e)
+        finally:
+            pages.put(None)
+
+    def load_topics(self, target_limit, topic_type_filter='ALL', on_page=None):
+        """토픽 로드 (일반 + 지표) → (토픽 목록, 새로 추가/변경된 키 집합 또는 None)
+
+        on_page 가 있으면 페이지가 도착할 때마다 그 페이지의 토픽 목록으로 호출한다.
+        """
+        self.log(f"🔎 토픽 로딩 시작 (목표: {target_limit}개, 타입: {topic_type_filter})", "INFO")
+        governor_before = self.api_governor.snapshot()
+
+        topics = []
+        with self.run_scope() as stop:
+            for page in self.iter_topics(target_limit, topic_type_filter, stop=stop):
+                topics.extend(page)
+                if on_page:
+                    on_page(page)
+
+        if self.api_governor.snapshot() != governor_before:
+            self.log(f"   🔁 {self.api_governor.report(governor_before)}", "WARNING")
+
+        # 중단된 로드는 일부만 받았으므로 캐시에 기록하지 않음
+        if stop.is_set():
+            self.log(f"⏹️  토픽 로딩 중단 ({len(topics)}개까지 로드)", "WARNING")
+            self.topic_index.update(topics)
+            return topics, None
+
+        self.log(f"✅ 총 {len(topics)}개 토픽 로드 완료", "SUCCESS")
+
+        changed = None
+        if self.topic_cache:
+            changed = self.topic_cache.update(topics, {'type': topic_type_filter, 'limit': target_limit})
+            self.topic_cache.save()
+            self.log(f"💾 새로 추가/변경된 토픽: {len(changed)}개", "INFO")
+            topics = self.topic_cache.topics()
+
+        self.topic_index.update(topics)
+        return topics, changed
+
+    def discover_topics(self, target_limit, topic_type_filter='ALL', mark=True):
+        """지난 탐색 이후 새로 생긴 토픽만 로드 → 새 토픽 목록 (종류별 최신순)
+
+        종류마다 1페이지부터 순서대로 요청하고 이미 본 ID 가 나오면 멈춘다 (그보다 오래된 토픽은 모두 본 것).
+        기록이 없는 종류는 target_limit 개까지 읽어 기준선만 만들고 새 토픽으로 보고하지 않는다.
+        새 토픽이 target_limit 개를 넘으면 그 페이지에서 확인한 나머지(더 오래된 것)는 바로 본 것으로 기록한다
+        (다음 탐색은 이 ID 에서 멈추므로 더 뒤 페이지의 토픽도 본 것으로 취급된다).
+        mark=False 면 반환한 새 토픽은 기록하지 않는다 (미리보기 / 거래 후 mark_topics_seen, 기준선은 기록).
+        """
+        if not self.seen_topics:
+            raise ValueError("TOPIC_SEEN_FILE 이 비어 있어 새 토픽 탐색을 사용할 수 없습니다")
+
+        sources = []
+        if topic_type_filter in ['ALL', 'REGULAR']:
+            sources.append((REGULAR, "일반 토픽", self.regular_source()))
+        if topic_type_filter in ['ALL', 'INDICATOR']:
+            sources.append((INDICATOR, "지표 토픽", self.indicator_source()))
+
+        self.log(f"🔭 새 토픽 탐색 (타입: {topic_type_filter})", "INFO")
+        started = time.perf_counter()
+        found = []
+        total_requests = 0
+
+        with self.run_scope() as stop:
+            for family, label, (url, params, convert) in sources:
+                baseline = not self.seen_topics.has_baseline(family)
+                fresh, fresh_ids, overflow_ids = [], set(), set()
+                complete = False
+                page = 1
+                while not stop.is_set():
+                    rows = self.fetch_page(url, params, page)
+                    total_requests += 1
+                    if rows is None:
+                        break
+
+                    reached = False
+                    for topic in convert(rows):
+                        topic_id = family_id(topic)
+                        if topic_id is None or topic_id in fresh_ids:
+                            continue
+                        if self.seen_topics.is_seen(family, topic_id):
+                            # 최신순이므로 이후 행은 모두 이미 본 토픽보다 오래됨
+                            reached = True
+                            break
+                        if len(fresh) < target_limit:
+                            fresh.append(topic)
+                            fresh_ids.add(topic_id)
+                        else:
+                            overflow_ids.add(topic_id)
+
+                    if reached or overflow_ids or len(rows) < self.page_size:
+                        complete = True
+                        break
+                    page += 1
+
+                # 중단 / 실패한 탐색은 기록하지 않음 (다음 탐색에서 빠진 페이지까지 다시 확인)
+                if not complete:
+                    self.log(f"   ⚠️  {label}: 탐색이 끝나지 않아 기록하지 않음 ({page}페이지까지)", "WARNING")
+                else:
+                    self.seen_topics.mark(family, (fresh_ids if mark or baseline else set()) | overflow_ids)
+                    if overflow_ids and not baseline:
+                        self.log(f"   ⚠️  {label}: 새 토픽이 {target_limit}개를 넘어 나머지(더 오래된 것, 이 페이지 "
+                                 f"{len(overflow_ids)}개 + 이후 페이지)는 본 것으로 처리", "WARNING")
+
+                if baseline:
+                    if complete:
+                        self.log(f"   📌 {label}: 기준선 생성 ({len(fresh)}개를 본 것으로 기록, 다음 탐색부터 새 토픽만)", "WARNING")
+                    continue
+
+                found.extend(fresh)
+                self.log(f"   🆕 {label}: 새 토픽 {len(fresh)}개 ({page}페이지 확인, {self.seen_topics.describe(family)})", "SUCCESS")
+
+        self.seen_topics.save()
+        self.topic_index.update(found)
+        self.log(f"✅ 새 토픽 {len(found)}개 (요청 {total_requests}회, {time.perf_counter() - started:.2f}초)", "SUCCESS")
+        return found
+
+    def mark_topics_seen(self, topics):
+        """discover_topics(mark=False) 로 받은 토픽을 본 것으로 기록 (거래를 마친 뒤)"""
+        if not self.seen_topics or not topics:
+            return
+        families = {}
+        for topic in topics:
+            families.setdefault(topic.type, set()).add(family_id(topic))
+        for family, topic_ids in families.items():
+            self.seen_topics.mark(family, topic_ids)
+        self.seen_topics.save()
+
+    @contextmanager
+    def run_scope(self):
+        """로드 / 거래 1회의 중단 이벤트 (cancel() 대상으로 등록)"""
+        stop = threading.Event()
+        with self.runs_lock:
+            self.runs.add(stop)
+        try:
+            yield stop
+        finally:
+            with self.runs_lock:
+                self.runs.discard(stop)
+
+    def close(self):
+        """백그라운드 자원 정리 (Client 캐시 저장, 가격 / 주문 폴링, asyncio 엔진, 거래 저널)"""
+        self.cancel()
+        self.save_client_cache()
+        if self.price_cache:
+            self.price_cache.stop()
+        if self.order_tracker:
+            self.order_tracker.stop()
+        if self.async_engine:
+            self.async_engine.close()
+        if self.journal:
+            self.journal.close()
+
+    def cancel(self):
+        """진행 중인 로드 / 거래 중단 (이미 제출된 주문은 취소되지 않음) → 중단한 작업 수"""
+        with self.runs_lock:
+            runs = list(self.runs)
+        for stop in runs:
+            stop.set()
+        if self.async_engine:
+            self.async_engine.cancel()
+        return len(runs)
+
+    def build_legs(self, selected_topics, order_amount, verbose=True):
+        """선택한 토픽 → (주문 목록, 건너뛴 주문 수)"""
+        legs = []
+        skipped = 0
+
+        for topic_idx, topic in enumerate(selected_topics, 1):
+            topic_id = topic.topic_id
+            title = topic.title or 'Unknown'
+            options = topic.options
+
+            if not topic_id:
+                if verbose:
+                    self.log(f"❌ Topic ID 없음: {title}", "ERROR")
+                skipped += len(options) * 2
+                continue
+
+            if verbose:
+                self.log("\n" + "=" * 60, "INFO")
+                self.log(f"💰 주문 준비 [{topic_idx}/{len(selected_topics)}]", "INFO")
+                self.log(f"   제목: {title}", "INFO")
+                self.log(f"   Topic ID: {topic_id}", "INFO")
+                self.log(f"   {len(options)}개 옵션 × 2 (YES/NO) = {len(options) * 2}개 주문", "INFO")
+
+            for option in options:
+                sides = (
+                    ('YES', option.yes_pos, option.yes_price),
+                    ('NO', option.no_pos, option.no_price),
+                )
+
+                for outcome, token_id, price in sides:
+                    if token_id:
+                        legs.append(OrderLeg(topic_id, title, option.topic_id, option.title,
+                                             outcome, token_id, price, order_amount,
+                                             topic.type, topic.cutoff, topic.volume))
+                    else:
+                        if verbose:
+                            self.log(f"  ⚠️  {outcome}: {outcome.lower()}Pos 없음, 스킵 ({option.title})", "WARNING")
+                        skipped += 1
+
+        return legs, skipped
+
+    def plan_orders(self, selected_topics, order_amount=None, budget=None, weighting=None, verbose=False):
+        """선택한 토픽 → 주문 계획 (예산 배분 + SafeRate 가격, 확인 창 전에 미리보기 가능)"""
+        from opinion_plan import build_plan
+
+        order_amount = self.order_amount if order_amount is None else order_amount
+        budget = self.order_budget if budget is None else budget
+        weighting = weighting or self.order_weighting
+
+        legs, skipped = self.build_legs(selected_topics, order_amount, verbose=verbose)
+
+        # 실시간 호가가 있으면 계획도 그 가격 기준
+        if self.price_cache:
+            for leg in legs:
+                leg.base_price = self.price_cache.get(leg.token_id) or leg.base_price
+
+        return build_plan(
+            legs,
+            order_amount=order_amount,
+            budget=budget,
+            weighting=weighting,
+            min_amount=self.order_min_amount,
+            max_amount=self.order_max_amount,
+            safe_rate=self.price_safe_rate,
+            skipped=skipped
+        )
+
+    def execute(self, selected_topics, order_amount, rate=None, workers=None, plan=None, run_id=None, priority=None):
+        """선택한 토픽 거래 실행 (plan 이 있으면 미리 만든 계획대로) → (성공, 실패)
+
+        run_id 가 있으면 저널의 그 실행을 이어서 한다 (plan 은 resume_plan 결과).
+        priority 는 이 거래의 우선순위 키 (None 이면 order_priority).
+        """
+        rate = self.order_rate if rate is None else rate
+        workers = self.order_workers if workers is None else workers
+
+        # 계획 / 호가 조회 중에 중지해도 제출 전에 멈추도록 전체를 한 작업으로 등록
+        with self.run_scope() as stop:
+            if plan is None:
+                plan = self.plan_orders(selected_topics, order_amount, verbose=True)
+            legs = plan.legs
+            skipped = plan.skipped + len(plan.invalid)
+
+            self.log("\n🧮 주문 계획", "INFO")
+            for line in plan.summary_lines():
+                self.log(f"   {line}", "INFO")
+
+            governors = [(governor, governor.snapshot()) for governor in (self.api_governor, self.order_governor)]
+
+            if self.journal:
+                if run_id:
+                    self.journal.reopen_run(run_id)
+                else:
+                    run_id = self.journal.start_run(legs)
+                self.log(f"📒 거래 저널 실행 ID: {run_id}", "INFO")
+
+            pipeline = None
+            if self.wallet_pool:
+                total_success, total_fail, cancelled = self.wallet_pool.execute(
+                    legs, rate, workers, stop, run_id=run_id, journal=self.journal, priority=priority
+                )
+            else:
+                total_success, total_fail, cancelled, pipeline = self.submit_planned(
+                    legs, rate, workers, stop, run_id=run_id, priority=priority
+                )
+
+            if self.journal:
+                self.journal.finish_run(run_id, 'cancelled' if cancelled else 'done')
+        total_fail += skipped
+
+        self.log("\n" + "=" * 60, "INFO")
+        self.log(f"🏁 전체 거래 완료", "INFO")
+        self.log(f"   성공: {total_success}", "SUCCESS")
+        self.log(f"   실패: {total_fail}", "ERROR")
+        if cancelled:
+            self.log(f"   ⏹️  중단되어 제출하지 않은 주문: {cancelled}", "WARNING")
+            if self.journal:
+                self.log(f"   📒 이어서 실행으로 남은 주문 제출 가능 ({run_id})", "WARNING")
+        if pipeline:
+            self.log(f"   사전 서명 적중: {pipeline.hits}, 재서명: {pipeline.stale}, 즉시 서명: {pipeline.inline}", "INFO")
+        if self.price_cache and not self.wallet_pool:
+            self.log(f"   💹 실시간 호가 없이 계획 가격 사용: {self.price_fallbacks}건", "INFO")
+            if self.price_skipped:
+                self.log(f"   ⚠️  호가 이탈로 건너뛴 주문: {self.price_skipped}건 (PRICE_MAX_DEVIATION={self.price_max_deviation})", "WARNING")
+        for governor, before in governors:
+            self.log(f"   🔁 {governor.report(before)}", "INFO")
+        for line in self.metrics.summary():
+            self.log(f"   ⏱️  {line}", "INFO")
+        self.log("=" * 60, "INFO")
+
+        return total_success, total_fail
+
+    def refresh_prices(self, legs):
+        """제출 직전 실시간 호가 갱신 (PRICE_CACHE 가 켜져 있을 때만)"""
+        if self.price_cache and legs:
+            self.price_fallbacks = 0
+            self.price_skipped = 0
+            started = time.perf_counter()
+            changed = self.price_cache.refresh([leg.token_id for leg in legs])
+            self.log(f"💹 실시간 호가 {len(legs)}개 조회 ({time.perf_counter() - started:.2f}초, 이전 조회 대비 변경 {len(changed)}개)", "INFO")
+
+    def submit_planned(self, legs, rate, workers, stop, run_id=None, priority=None, refresh=True):
+        """계획된 주문을 이 지갑으로 제출 (호가 갱신 후 엔진 선택) → (성공, 실패, 미제출, 파이프라인)
+
+        run_id 가 있으면 주문마다 제출 / 결과를 거래 저널에 기록하고, 성공한 주문은 주문 추적 색인에 넣는다.
+        refresh=False 면 호가를 갱신하지 않는다 (미리 refresh_prices 를 부른 경우).
+        """
+        if refresh:
+            self.refresh_prices(legs)
+
+        on_submit = None
+        journal = self.journal if run_id else None
+        tracker = self.order_tracker
+        if journal:
+            def on_submit(leg):
+                journal.submitted(run_id, leg)
+
+        def on_result(leg, success, result):
+            if journal:
+                journal.result(run_id, leg, success, result)
+            if success and tracker:
+                tracker.add(leg, result)
+            self.log_order_result(leg, success, result)
+
+        scheduler = self.create_scheduler(legs, priority)
+        if self.async_engine:
+            success, fail, cancelled = self.submit_async(legs, rate, stop, on_submit, on_result, scheduler)
+            pipeline = None
+        else:
+            success, fail, cancelled, pipeline = self.submit_threaded(
+                legs, rate, workers, stop, on_submit, on_result, scheduler
+            )
+
+        # 마감까지 시작하지 못해 제외한 주문은 실패로 집계하고 저널에 expired 로 기록 (이어서 실행 대상 아님)
+        if journal:
+            for leg in scheduler.dropped:
+                journal.expired(run_id, leg)
+        if scheduler.dropped:
+            self.log(f"⏰ 토픽 마감까지 시작하지 못해 제외: {len(scheduler.dropped)}건 "
+                     f"(토픽 {scheduler.dropped_topics()}개)", "WARNING")
+        if scheduler.demoted:
+            self.log(f"🐢 실패 / 지연으로 뒤로 보낸 토픽 주문: {scheduler.demoted}건", "INFO")
+        return success, fail + len(scheduler.dropped), cancelled, pipeline
+
+    def create_scheduler(self, legs, priority=None):
+        """현재 설정의 주문 스케줄러 (우선순위 / 토픽 마감, priority 가 None 이면 order_priority)"""
+        priority = self.order_priority if priority is None else priority
+        scheduler = LegScheduler(
+            legs,
+            keys=priority,
+            per_topic_order=self.order_per_topic,
+            cutoff_margin=self.order_cutoff_margin,
+            topic_timeout=self.order_topic_timeout,
+            slow_seconds=self.order_slow_seconds
+        )
+        deadline = f", 토픽 시간 한도 {self.order_topic_timeout:g}초" if self.order_topic_timeout > 0 else ''
+        self.log(f"🗂️  주문 우선순위: {format_priority(priority)} "
+                 f"(마감 {self.order_cutoff_margin:g}초 전까지{deadline})", "INFO")
+        return scheduler
+
+    def submit_threaded(self, legs, rate, workers, stop, on_submit=None, on_result=None, scheduler=None):
+        """스레드 엔진으로 제출 (사전 서명 파이프라인 사용) → (성공, 실패, 미제출, 파이프라인)"""
+        self.log("\n" + "=" * 60, "INFO")
+        self.log(f"🚀 {len(legs)}개 주문 제출 시작 (작업자 {workers}개, {rate}건/초)", "INFO")
+        self.log("=" * 60, "INFO")
+
+        submit = self.submit_leg
+        pipeline = self.create_presign_pipeline()
+        if pipeline:
+            pipeline.start(scheduler.expected_order() if scheduler else legs)
+            submit = lambda leg: self.submit_presigned(pipeline, leg)
+            self.log(f"✍️  사전 서명 사용 (미리 서명 {self.presign_depth}개)", "INFO")
+
+        if on_submit:
+            submit_leg = submit
+
+            def submit(leg):
+                on_submit(leg)
+                return submit_leg(leg)
+
+        engine = OrderEngine(
+            submit,
+            workers=workers,
+            rate=rate,
+            burst=self.order_burst,
+            per_topic_order=self.order_per_topic,
+            on_result=on_result or self.log_order_result,
+            metrics=self.metrics,
+            stop=stop
+        )
+        try:
+            success, fail = engine.run(legs, scheduler)
+        finally:
+            if pipeline:
+                pipeline.close()
+        return success, fail, engine.cancelled, pipeline
+
+    def submit_async(self, legs, rate, stop, on_submit=None, on_result=None, scheduler=None):
+        """asyncio 엔진으로 제출 (최대 ASYNC_CONCURRENCY 건 동시) → (성공, 실패, 미제출)"""
+        engine = self.async_engine
+        self.log("\n" + "=" * 60, "INFO")
+        self.log(f"🚀 {len(legs)}개 주문 제출 시작 (asyncio, 동시 {engine.concurrency}건, {rate}건/초)", "INFO")
+        self.log("=" * 60, "INFO")
+
+        return engine.run(engine.submit_orders(
+            legs,
+            rate=rate,
+            burst=self.order_burst,
+            per_topic_order=self.order_per_topic,
+            on_submit=on_submit,
+            on_result=on_result or self.log_order_result,
+            stop=stop,
+            scheduler=scheduler
+        ))
+
+    def resume_plan(self, run_id=None):
+        """거래 저널에서 이어서 제출할 주문 계획 → (run_id, 계획, 완료 수, 확인 필요 수)
+
+        run_id 가 없으면 마지막으로 끝나지 않은 실행. 확인 필요(제출 후 결과 없음) 주문은 다시 보내지 않는다.
+        """
+        from opinion_plan import OrderPlan
+
+        if not self.journal:
+            raise ValueError("거래 저널이 꺼져 있습니다 (JOURNAL_FILE)")
+
+        run_id = run_id or self.journal.last_unfinished()
+        if not run_id:
+            raise ValueError("이어서 실행할 거래가 없습니다")
+
+        started = time.perf_counter()
+        legs, done, unknown = self.journal.pending_legs(run_id, journal_leg)
+        if not (legs or done or unknown):
+            raise ValueError(f"거래 저널에 실행 {run_id} 이(가) 없습니다")
+
+        plan = OrderPlan(legs, [], [], 0, 'equal', 'journal', time.perf_counter() - started)
+        return run_id, plan, done, unknown
+
+    def unfinished_notice(self):
+        """끝나지 않은 실행이 있으면 안내 로그"""
+        run_id = self.journal.last_unfinished() if self.journal else None
+        if run_id:
+            self.log(f"📒 끝나지 않은 거래가 있습니다: {run_id} (이어서 실행으로 남은 주문 제출)", "WARNING")
+        return run_id
+
+    def require_tracker(self):
+        if not self.order_tracker:
+            raise ValueError("Client가 초기화되지 않았습니다")
+        return self.order_tracker
+
+    def sync_orders(self):
+        """주문 추적 색인을 서버와 동기화하고 요약 로그 → 동기화 결과"""
+        tracker = self.require_tracker()
+        result = tracker.sync()
+        self.log(f"📑 주문 동기화: 미체결 {result['open']}건, 변경 {result['changed']}건, 새로 찾음 {result['added']}건 "
+                 f"({result['requests']}회 요청, {result['seconds']:.2f}초)", "INFO")
+        self.log(f"   {tracker.summary_line()}", "INFO")
+        return result
+
+    def stale_orders(self, minutes=None):
+        """동기화 후 minutes 분보다 오래 걸려 있는 미체결 주문 (0 이면 모든 미체결 주문)"""
+        minutes = self.order_stale_minutes if minutes is None else minutes
+        self.sync_orders()
+        return self.require_tracker().stale(minutes * 60)
+
+    def cancel_orders(self, orders):
+        """주문 일괄 취소 → 취소된 주문 목록"""
+        orders = list(orders)
+        if not orders:
+            self.log("🧹 취소할 미체결 주문이 없습니다", "INFO")
+            return []
+
+        self.log(f"🧹 미체결 주문 {len(orders)}건 취소 중...", "INFO")
+        started = time.perf_counter()
+        cancelled, failed = self.require_tracker().cancel(orders)
+        self.log(f"🧹 취소 {len(cancelled)}건 / 실패 {failed}건 ({time.perf_counter() - started:.2f}초)",
+                 "SUCCESS" if not failed else "WARNING")
+        return cancelled
+
+    def replace_orders(self, orders, rate=None, workers=None):
+        """주문 취소 후 남은 금액을 현재 호가(+SafeRate)로 다시 주문 → (성공, 실패)
+
+        목록 조회로만 알게 된 주문은 거래 저널에서 토큰 ID 를 찾고, 못 찾았거나
+        남은 금액이 최소 주문 금액 미만인 주문은 취소만 한다.
+        """
+        from opinion_orders import MIN_ORDER_AMOUNT
+        from opinion_plan import OrderPlan
+
+        cancelled = self.cancel_orders(orders)
+        started = time.perf_counter()
+        unknown = [order for order in cancelled if not order.token_id]
+        if unknown and self.journal:
+            tokens = self.journal.order_tokens(order.order_id for order in unknown)
+            for order in unknown:
+                order.token_id = tokens.get(order.order_id)
+        replaceable = [order for order in cancelled if order.token_id and order.remaining >= MIN_ORDER_AMOUNT]
+        if len(replaceable) < len(cancelled):
+            self.log(f"   재주문 제외 {len(cancelled) - len(replaceable)}건 (토큰 ID 없음 또는 남은 금액 부족)", "WARNING")
+        if not replaceable:
+            return 0, 0
+
+        tokens = [order.token_id for order in replaceable]
+        if self.price_cache:
+            self.price_cache.refresh(tokens)
+            asks = {token_id: self.price_cache.get(token_id) for token_id in tokens}
+        else:
+            def ask_of(token_id):
+                try:
+                    return self.fetch_best_ask(token_id)
+                except Exception:
+                    return None
+
+            with ThreadPoolExecutor(max_workers=self.page_fanout) as pool:
+                asks = dict(zip(tokens, pool.map(ask_of, tokens)))
+
+        legs, no_ask = [], 0
+        for order in replaceable:
+            ask = asks.get(order.token_id)
+            if ask is None:
+                no_ask += 1
+                continue
+            leg = OrderLeg(order.market_id, order.title, order.market_id, order.title, order.outcome,
+                           order.token_id, self.calculate_safe_price(ask, self.price_safe_rate), order.remaining)
+            leg.base_price = ask
+            legs.append(leg)
+        if no_ask:
+            self.log(f"   호가가 없어 재주문 제외: {no_ask}건", "WARNING")
+
+        plan = OrderPlan(legs, [], [], 0, 'equal', 'replace', time.perf_counter() - started)
+        return self.execute(None, None, rate, workers, plan=plan)
+
+    def log_order_result(self, leg, success, result):
+        """주문 결과 로그 (워커 스레드에서 호출)"""
+        label = f"[{leg.child_topic_id}] {leg.child_title or leg.title} {leg.outcome}"
+        if success:
+            self.log(f"     ✅ {label} 성공 (price={leg.price}, Order ID: {result})", "SUCCESS")
+        else:
+            self.log(f"     ❌ {label} 실패: {result}", "ERROR")
+
+    def calculate_safe_price(self, base_price, safe_rate=0.05):
+        """SafeRate 적용"""
+        price = float(base_price) * (1 + safe_rate)
+        if price > 0.999:
+            price = 0.999
+        elif price < 0.001:
+            price = 0.001
+        return str(round(price, 3))
+
+    def get_order_signer(self):
+        """주문 생성/서명/제출을 단계별로 나눠 실행하는 서명기 (SDK 미지원이면 None)"""
+        if self.client is None:
+            return None
+
+        if self.order_signer is None or self.order_signer.client is not self.client:
+            from opinion_presign import SdkOrderSigner
+
+            signer = SdkOrderSigner(
+                self.client, metrics=self.metrics,
+                api_governor=self.api_governor, order_governor=self.order_governor
+            )
+            self.order_signer = signer if signer.supported() else False
+
+        return self.order_signer or None
+
+    def create_presign_pipeline(self):
+        """사전 서명 파이프라인 (비활성 또는 SDK 미지원이면 None)"""
+        if self.presign_depth <= 0 or self.client is None:
+            return None
+
+        from opinion_presign import PresignPipeline
+
+        signer = self.get_order_signer()
+        if not signer:
+            self.log("⚠️  현재 SDK는 서명/제출 분리를 지원하지 않아 사전 서명을 끕니다", "WARNING")
+            return None
+
+        return PresignPipeline(
+            signer.sign,
+            depth=self.presign_depth,
+            workers=self.presign_workers,
+            max_age=self.presign_max_age,
+            price_of=self.leg_price
+        )
+
+    def submit_presigned(self, pipeline, leg):
+        """사전 서명된 주문 제출"""
+        try:
+            return self.order_signer.submit(pipeline.take(leg))
+        except Exception as e:
+            return False, str(e)
+
+    def submit_leg(self, leg):
+        """OrderLeg 매수 주문 (가능하면 생성 / 서명 / 제출 단계를 나눠 지표 기록)"""
+        signer = self.get_order_signer()
+        if signer:
+            try:
+                return signer.submit(signer.sign(leg, self.leg_price(leg)))
+            except Exception as e:
+                return False, str(e)
+
+        from opinion_clob_sdk.chain.py_order_utils.model.sides import OrderSide
+
+        with self.metrics.timer('opinion_order_phase_seconds', phase='sdk'):
+            return self.place_order(leg.child_topic_id, leg.token_id, OrderSide.BUY, self.leg_price(leg), leg.amount)
+
+    def place_order(self, topic_id, token_id, side, price, order_amount):
+        """주문 실행 (SDK 사용)"""
+        try:
+            from opinion_clob_sdk.chain.py_order_utils.model.order import PlaceOrderDataInput
+            from opinion_clob_sdk.chain.py_order_utils.model.order_type import LIMIT_ORDER
+
+            # marketId는 정수형이어야 함
+            order = PlaceOrderDataInput(
+                marketId=int(topic_id),  # ✅ 정수로 변환
+                tokenId=token_id,
+                side=side,
+                orderType=LIMIT_ORDER,
+                price=price,
+                makerAmountInQuoteToken=order_amount  # ✅ 파라미터로 받은 값 사용
+            )
+
+            result = self.order_governor.call(lambda: self.client.place_order(order))
+            return parse_order_result(result)
+
+        except Exception as e:
+            return False, str(e)
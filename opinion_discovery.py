@@ -0,0 +1,103 @@
+"""
+새 토픽 탐색 (지난 탐색 이후 새로 생긴 토픽만, 조기 중단 페이지 요청)
+
+- 토픽 종류(REGULAR / INDICATOR)마다 최고 ID(high-water mark)와 본 ID 집합을 TOPIC_SEEN_FILE 에 저장
+- 목록 API 는 최신순(일반 토픽 sortBy=1, 지표 토픽 최신 id 먼저)이라고 보고,
+  이미 본 ID 가 나온 페이지에서 요청을 멈춘다 → 새 토픽이 한 페이지 이하면 종류마다 1~2회 요청
+- 본 ID 는 최근 max_ids 개만 남기고, 그보다 오래된 ID 는 floor 이하로 묶어 모두 본 것으로 취급
+- 기록이 없는 종류는 첫 탐색에서 기준선만 만들고 새 토픽으로 보고하지 않는다 (전체 목록을 새 토픽으로 거래하지 않도록)
+"""
+
+import json
+import os
+import threading
+import time
+
+from opinion_models import INDICATOR, REGULAR
+
+FAMILIES = (REGULAR, INDICATOR)
+
+
+def family_id(topic):
+    """종류별 기준 ID (일반 토픽 topicId, 지표 토픽 indicatorId, 숫자가 아니면 None)"""
+    value = topic.indicator_id if topic.type == INDICATOR else topic.topic_id
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class SeenTopics:
+    """토픽 종류별 최고 ID + 본 ID 집합 (디스크 저장)"""
+
+    VERSION = 1
+
+    def __init__(self, path, max_ids=5000):
+        self.path = path
+        self.max_ids = max(1, int(max_ids))
+        self.lock = threading.Lock()
+        self.families = {}  # 종류 → {'high': 최고 ID, 'floor': 이 ID 이하는 모두 본 것, 'ids': 본 ID 집합, 'updated': 시각}
+        self.load()
+
+    def load(self):
+        """디스크에서 읽기 (없거나 손상되면 빈 기록)"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != self.VERSION:
+            return
+
+        for family, state in data.get('families', {}).items():
+            self.families[family] = {
+                'high': state.get('high', 0),
+                'floor': state.get('floor', 0),
+                'ids': set(state.get('ids', [])),
+                'updated': state.get('updated', 0),
+            }
+
+    def save(self):
+        """디스크에 원자적으로 저장 (ID 는 정렬해서)"""
+        with self.lock:
+            families = {
+                family: dict(state, ids=sorted(state['ids']))
+                for family, state in self.families.items()
+            }
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'families': families}, f)
+        os.replace(tmp_path, self.path)
+
+    def has_baseline(self, family):
+        with self.lock:
+            return family in self.families
+
+    def is_seen(self, family, topic_id):
+        with self.lock:
+            state = self.families.get(family)
+            return bool(state) and (topic_id <= state['floor'] or topic_id in state['ids'])
+
+    def mark(self, family, topic_ids):
+        """본 ID 추가 (오래된 ID 는 floor 로 압축) → 새로 추가된 수"""
+        topic_ids = {topic_id for topic_id in topic_ids if topic_id is not None}
+        with self.lock:
+            state = self.families.setdefault(family, {'high': 0, 'floor': 0, 'ids': set(), 'updated': 0})
+            fresh = {topic_id for topic_id in topic_ids if topic_id > state['floor']} - state['ids']
+            state['ids'] |= fresh
+            state['high'] = max([state['high']] + list(fresh))
+            state['updated'] = time.time()
+
+            overflow = len(state['ids']) - self.max_ids
+            if overflow > 0:
+                dropped = sorted(state['ids'])[:overflow]
+                state['floor'] = dropped[-1]
+                state['ids'].difference_update(dropped)
+            return len(fresh)
+
+    def describe(self, family):
+        with self.lock:
+            state = self.families.get(family)
+            if not state:
+                return "기록 없음"
+            return f"최고 ID {state['high']}, 본 ID {len(state['ids'])}개"
@@ -0,0 +1,311 @@
+"""
+API 요청 조절기 (재시도 / 적응형 속도 / 회로 차단)
+
+- 429 / 5xx / 네트워크 에러는 지터를 넣은 지수 백오프로 재시도하고 Retry-After 를 따른다.
+  (retry_statuses / retry_network 로 재시도 대상을 좁혀도 회로 차단 집계는 그대로)
+- 요청 속도는 AIMD: 처음에는 제한하지 않다가(rate 0) 429 나 Retry-After 를 처음 받으면
+  max_rate 의 절반부터 조절을 시작하고, 성공하면 조금씩 올리고 429 를 받으면 절반으로 줄인다.
+- 5xx / 네트워크 에러가 연속으로 쌓이면 회로를 열어 cooldown 동안 바로 실패시키고,
+  cooldown 이 지나면 요청 하나로만 상태를 확인한다 (half-open, 나머지는 결과가 나올 때까지 거절).
+"""
+
+import email.utils
+import random
+import threading
+import time
+
+NETWORK_ERRORS = {
+    'ConnectionError', 'Timeout', 'ConnectTimeout', 'ReadTimeout', 'NewConnectionError',
+    'MaxRetryError', 'ProtocolError', 'RemoteDisconnected', 'TimeoutError', 'ConnectionResetError',
+    'ClientConnectionError', 'ClientPayloadError',  # aiohttp
+}
+
+
+class HTTPStatusError(Exception):
+    """200 이 아닌 HTTP 응답 (상태 코드 + Retry-After 초)"""
+
+    def __init__(self, status, retry_after=None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class RetryableError(HTTPStatusError):
+    """재시도할 수 있는 HTTP 응답"""
+
+
+class CircuitOpenError(Exception):
+    """회로 차단 중이라 요청하지 않음"""
+
+
+def parse_retry_after(value):
+    """Retry-After 헤더(초 또는 HTTP 날짜) → 초 (없거나 잘못되면 None)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def error_status(exc):
+    """예외(원인 예외 포함)에서 HTTP 상태 코드와 헤더 추출 → (status, headers)"""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        status = getattr(exc, 'status', None)
+        if isinstance(status, int):
+            return status, getattr(exc, 'headers', None) or {}
+        exc = exc.__cause__ or exc.__context__
+    return None, {}
+
+
+def is_network_error(exc):
+    """연결 / 타임아웃 계열 예외인지 (원인 예외 포함)"""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if any(cls.__name__ in NETWORK_ERRORS for cls in type(exc).__mro__):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+class RequestGovernor:
+    """엔드포인트 묶음별 요청 조절기
+
+    call(func) 는 속도 제한 → 실행 → 실패 분류 → 백오프 재시도를 처리한다.
+    retry_statuses 에 없는 상태 코드와 기타 예외는 재시도하지 않고 그대로 올려보낸다
+    (5xx / 네트워크 에러면 재시도하지 않아도 회로 차단 실패로 센다).
+    call_async(func) 는 같은 처리를 코루틴 함수에 대해 await 로 한다.
+    """
+
+    def __init__(self, name, rate=0.0, min_rate=0.5, max_rate=50.0, increase=0.5, decrease=0.5,
+                 max_retries=4, base_delay=0.5, max_delay=30.0,
+                 retry_statuses=(429, 500, 502, 503, 504), retry_network=True,
+                 breaker_threshold=5, breaker_cooldown=30.0, metrics=None, log=None):
+        self.name = name
+        self.rate = float(rate)
+        self.min_rate = float(min_rate)
+        self.max_rate = max(float(max_rate), self.rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.max_retries = max(0, int(max_retries))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = set(retry_statuses)
+        self.retry_network = retry_network
+        self.breaker_threshold = max(1, int(breaker_threshold))
+        self.breaker_cooldown = breaker_cooldown
+        self.metrics = metrics
+        self.log = log
+
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+        self.state = 'closed'
+        self.probing = False  # half-open 에서 상태 확인 요청이 나가 있음
+        self.failures = 0
+        self.opened_at = 0.0
+
+        self.retries = 0
+        self.throttled = 0
+        self.rejected = 0
+        self.gave_up = 0
+
+    def reserve(self):
+        """다음 요청 자리를 예약하고 그때까지 기다릴 시간(초) 반환 (rate <= 0 이면 0)"""
+        with self.lock:
+            if self.rate <= 0:
+                return 0.0
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + 1 / self.rate
+        return slot - now
+
+    def acquire(self):
+        """현재 속도에 맞춰 다음 요청 시각까지 대기"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def check_breaker(self):
+        """회로가 열려 있으면 CircuitOpenError (half-open 에서는 상태 확인 요청 하나만 통과)
+
+        → 이 호출이 상태 확인 요청이면 True (결과 없이 끝나면 release_probe 로 풀어야 함)
+        """
+        with self.lock:
+            if self.state == 'closed':
+                return False
+            remaining = self.breaker_cooldown - (time.monotonic() - self.opened_at)
+            if self.state == 'open' and remaining <= 0:
+                self.state = 'half-open'
+            if self.state == 'half-open' and not self.probing:
+                self.probing = True
+                return True
+            self.rejected += 1
+        if remaining > 0:
+            raise CircuitOpenError(f"{self.name} 회로 차단 중 ({remaining:.0f}초 후 재시도)")
+        raise CircuitOpenError(f"{self.name} 회로 상태 확인 중")
+
+    def classify(self, exc):
+        """예외 → (실패 사유, Retry-After 초): 사유는 HTTP 상태 코드 / 'network' / None(기타 예외)"""
+        if isinstance(exc, HTTPStatusError):
+            return exc.status, exc.retry_after
+
+        status, headers = error_status(exc)
+        if status is not None:
+            return status, parse_retry_after(headers.get('Retry-After'))
+
+        if is_network_error(exc):
+            return 'network', None
+
+        return None, None
+
+    @staticmethod
+    def is_server_failure(reason):
+        """회로 차단 실패로 세는 사유 (5xx / 네트워크 에러)"""
+        return reason == 'network' or (isinstance(reason, int) and reason >= 500)
+
+    def should_retry(self, reason):
+        return reason in self.retry_statuses or (reason == 'network' and self.retry_network)
+
+    def on_success(self):
+        with self.lock:
+            if self.rate > 0:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+            self.failures = 0
+            self.probing = False
+            recovered = self.state == 'half-open'
+            self.state = 'closed'
+        if recovered and self.log:
+            self.log(f"✅ {self.name} 회로 복구", "SUCCESS")
+
+    def release_probe(self):
+        """서버 장애가 아닌 실패 (4xx / 기타 예외 / 취소) → 회로 상태는 그대로, 다음 요청이 다시 상태 확인"""
+        with self.lock:
+            self.probing = False
+
+    def on_error(self, reason, retry_after=None):
+        """429 / Retry-After → 속도 조절, 5xx / 네트워크 에러 → 회로 차단 실패 집계"""
+        opened = False
+        started = None
+        with self.lock:
+            if reason == 429 or retry_after is not None:
+                if self.rate <= 0:
+                    # 서버가 처음 한도를 알렸을 때부터 속도 조절 시작
+                    self.rate = started = max(self.min_rate, self.max_rate * self.decrease)
+                elif reason == 429:
+                    self.rate = max(self.min_rate, self.rate * self.decrease)
+
+            if reason == 429:
+                # 서버 한도 초과: 속도만 줄이고 회로는 건드리지 않음
+                self.throttled += 1
+                self.probing = False
+            elif self.is_server_failure(reason):
+                self.failures += 1
+                self.probing = False
+                if self.state == 'half-open' or (self.state == 'closed' and self.failures >= self.breaker_threshold):
+                    self.state = 'open'
+                    self.opened_at = time.monotonic()
+                    opened = True
+
+        if started and self.log:
+            self.log(f"🐢 {self.name} 서버 속도 제한 - 초당 {started:.1f}건부터 조절", "WARNING")
+        if opened and self.log:
+            self.log(f"⛔ {self.name} 연속 실패 {self.failures}회 - {self.breaker_cooldown:.0f}초 동안 요청 차단", "ERROR")
+
+    def backoff(self, attempt, retry_after):
+        """지터 포함 지수 백오프 (Retry-After 가 더 길면 그만큼 대기)"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def on_failure(self, exc, attempt):
+        """실패 분류 / 통계 → 재시도 전 대기 시간(초), 재시도하지 않으면 None"""
+        reason, retry_after = self.classify(exc)
+        if reason != 429 and not self.is_server_failure(reason):
+            self.release_probe()
+            return None
+
+        self.on_error(reason, retry_after)
+        if not self.should_retry(reason):
+            return None
+
+        if self.metrics:
+            self.metrics.inc('opinion_retries_total', endpoint=self.name, reason=str(reason))
+
+        with self.lock:
+            if attempt >= self.max_retries or self.state == 'open':
+                self.gave_up += 1
+                return None
+            self.retries += 1
+        return self.backoff(attempt, retry_after)
+
+    def call(self, func):
+        """func() 실행 (재시도 / 속도 조절 / 회로 차단 적용)"""
+        attempt = 0
+        while True:
+            probe = self.check_breaker()
+            try:
+                self.acquire()
+                result = func()
+            except Exception as e:
+                delay = self.on_failure(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                # KeyboardInterrupt 등: 결과 없이 끝난 상태 확인 요청은 풀어 둠 (다음 요청이 다시 확인)
+                if probe:
+                    self.release_probe()
+                raise
+
+            self.on_success()
+            return result
+
+    async def call_async(self, func):
+        """await func() 실행 (call 과 같지만 대기는 asyncio.sleep, 취소는 그대로 전달)"""
+        import asyncio
+
+        attempt = 0
+        while True:
+            probe = self.check_breaker()
+            try:
+                wait = self.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                result = await func()
+            except Exception as e:
+                delay = self.on_failure(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                # 취소(CancelledError) 등: 결과 없이 끝난 상태 확인 요청은 풀어 둠
+                if probe:
+                    self.release_probe()
+                raise
+
+            self.on_success()
+            return result
+
+    def snapshot(self):
+        """(재시도, 429, 차단으로 거절, 포기) 누적 횟수"""
+        with self.lock:
+            return self.retries, self.throttled, self.rejected, self.gave_up
+
+    def report(self, since=(0, 0, 0, 0)):
+        """since 이후 통계 문자열"""
+        retries, throttled, rejected, gave_up = (a - b for a, b in zip(self.snapshot(), since))
+        rate = f"{self.rate:.1f}건/초" if self.rate > 0 else "제한 없음"
+        return (f"{self.name}: 재시도 {retries}회 (429 {throttled}회), 포기 {gave_up}건, "
+                f"차단 거절 {rejected}건, 현재 속도 {rate}")
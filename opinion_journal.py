@@ -0,0 +1,259 @@
+"""
+거래 저널 (SQLite WAL, 중단 / 크래시 후 이어서 실행)
+
+실행(run)마다 주문 단위로 planned → submitted → confirmed / failed 기록을 추가만 한다 (수정 / 삭제 없음).
+토픽 마감까지 시작하지 못해 제외한 주문은 planned → expired 로 끝난다.
+키는 (run_id, topicId, tokenId, side) 이고 이 순서의 인덱스로 조회한다.
+
+- planned: 제출 시작 전에 한 트랜잭션으로 동기 기록
+- submitted / confirmed / failed: 주문 스레드는 큐에 넣기만 하고, 기록 스레드가 JOURNAL_FLUSH_MS 마다
+  모아서 한 번에 커밋(fsync)한다 → 주문 처리량에 영향 없음
+- 이어서 실행: 마지막 상태가 submitted / confirmed / expired 인 주문은 건너뛴다
+  (submitted 만 있는 주문은 서버가 받았을 수 있으므로 다시 보내지 않음, 마감 지난 주문도 보내지 않음,
+  failed 는 다시 제출)
+
+크래시 직전 JOURNAL_FLUSH_MS 이내의 기록은 남지 않을 수 있다.
+여러 지갑 프로세스가 같은 파일에 동시에 기록할 수 있다 (WAL + busy timeout).
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+SIDE = 'BUY'  # 이 봇의 주문은 모두 매수
+
+PLANNED = 'planned'
+SUBMITTED = 'submitted'
+CONFIRMED = 'confirmed'
+FAILED = 'failed'
+EXPIRED = 'expired'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created REAL NOT NULL,
+    finished REAL,
+    status TEXT NOT NULL,
+    legs INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    topic_id TEXT NOT NULL,
+    token_id TEXT NOT NULL,
+    side TEXT NOT NULL,
+    status TEXT NOT NULL,
+    at REAL NOT NULL,
+    child_topic_id TEXT,
+    title TEXT,
+    child_title TEXT,
+    outcome TEXT,
+    price TEXT,
+    base_price TEXT,
+    amount REAL,
+    order_id TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS entries_leg ON entries (run_id, topic_id, token_id, side, status);
+"""
+
+COLUMNS = ('run_id', 'topic_id', 'token_id', 'side', 'status', 'at', 'child_topic_id', 'title', 'child_title',
+           'outcome', 'price', 'base_price', 'amount', 'order_id', 'error')
+INSERT = f"INSERT INTO entries ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+
+def new_run_id():
+    """실행 ID (시각 + 임의 접미사)"""
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{os.urandom(3).hex()}"
+
+
+def leg_key(leg):
+    return str(leg.topic_id), str(leg.token_id), SIDE
+
+
+def entry_row(run_id, leg, status, order_id=None, error=None):
+    topic_id, token_id, side = leg_key(leg)
+    return (run_id, topic_id, token_id, side, status, time.time(), str(leg.child_topic_id), leg.title,
+            leg.child_title, leg.outcome, str(leg.price), str(leg.base_price), leg.amount, order_id, error)
+
+
+class TradeJournal:
+    """거래 저널 (동기 조회 / 실행 시작·종료 + 백그라운드 일괄 기록)"""
+
+    def __init__(self, path, flush_interval=0.05, batch_size=500, log=None):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.log = log or (lambda message, level="INFO": None)
+
+        self.lock = threading.Lock()
+        self.conn = self.connect()
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+
+        self.pending = queue.SimpleQueue()
+        self.writer = threading.Thread(target=self._write_loop, daemon=True)
+        self.writer.start()
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        return conn
+
+    # ---- 실행 ----
+
+    def start_run(self, legs):
+        """새 실행 + 모든 주문 planned 기록 (한 트랜잭션) → run_id"""
+        run_id = new_run_id()
+        with self.lock, self.conn:
+            self.conn.execute("INSERT INTO runs VALUES (?, ?, NULL, 'running', ?)", (run_id, time.time(), len(legs)))
+            self.conn.executemany(INSERT, [entry_row(run_id, leg, PLANNED) for leg in legs])
+        return run_id
+
+    def reopen_run(self, run_id):
+        """이어서 실행하는 run 을 다시 running 으로"""
+        with self.lock, self.conn:
+            self.conn.execute("UPDATE runs SET status = 'running', finished = NULL WHERE run_id = ?", (run_id,))
+
+    def finish_run(self, run_id, status='done'):
+        """남은 기록을 모두 쓰고 실행 종료 표시"""
+        self.flush()
+        with self.lock, self.conn:
+            self.conn.execute("UPDATE runs SET status = ?, finished = ? WHERE run_id = ?", (status, time.time(), run_id))
+
+    # ---- 주문 기록 (주문 스레드에서 호출, 큐에 넣기만 함) ----
+
+    def record(self, run_id, leg, status, order_id=None, error=None):
+        self.pending.put(entry_row(run_id, leg, status, order_id, error))
+
+    def submitted(self, run_id, leg):
+        self.record(run_id, leg, SUBMITTED)
+
+    def result(self, run_id, leg, success, result):
+        if success:
+            self.record(run_id, leg, CONFIRMED, order_id=str(result))
+        else:
+            self.record(run_id, leg, FAILED, error=str(result)[:500])
+
+    def expired(self, run_id, leg):
+        """토픽 마감까지 시작하지 못해 제외한 주문 (이어서 실행 대상 아님)"""
+        self.record(run_id, leg, EXPIRED, error='deadline')
+
+    def flush(self, timeout=10):
+        """큐에 있는 기록이 커밋될 때까지 대기"""
+        done = threading.Event()
+        self.pending.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """남은 기록을 쓰고 기록 스레드 종료"""
+        if self.writer.is_alive():
+            self.flush()
+            self.pending.put(None)
+            self.writer.join(timeout=5)
+        with self.lock:
+            self.conn.close()
+
+    def _write_loop(self):
+        conn = self.connect()
+        running = True
+        while running:
+            rows, waiters = [], []
+            item = self.pending.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is None:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    rows.append(item)
+
+                if not running or waiters or len(rows) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.pending.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if rows:
+                try:
+                    with conn:
+                        conn.executemany(INSERT, rows)
+                except sqlite3.Error as e:
+                    # 기록 실패가 주문을 막지 않도록 로그만 남김
+                    self.log(f"⚠️  거래 저널 기록 실패 ({len(rows)}건): {e}", "WARNING")
+            for waiter in waiters:
+                waiter.set()
+        conn.close()
+
+    # ---- 조회 ----
+
+    def runs(self, limit=10):
+        """최근 실행 목록 [(run_id, created, status, legs)]"""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT run_id, created, status, legs FROM runs ORDER BY created DESC LIMIT ?", (limit,)
+            ).fetchall()
+
+    def last_unfinished(self):
+        """마지막으로 끝나지 않은(running / cancelled) 실행 ID (없으면 None)"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT run_id FROM runs WHERE status IN ('running', 'cancelled') ORDER BY created DESC LIMIT 1"
+            ).fetchone()
+        return row[0] if row else None
+
+    def states(self, run_id):
+        """(topicId, tokenId, side) → 마지막 상태 (planned 제외)"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT topic_id, token_id, side, status FROM entries "
+                "WHERE run_id = ? AND status != 'planned' ORDER BY seq", (run_id,)
+            )
+            return {(topic_id, token_id, side): status for topic_id, token_id, side, status in rows}
+
+    def order_tokens(self, order_ids):
+        """Order ID → tokenId (confirmed 기록에서, 목록 조회로만 알게 된 주문의 재주문용)"""
+        order_ids = [str(order_id) for order_id in order_ids]
+        tokens = {}
+        with self.lock:
+            for start in range(0, len(order_ids), 500):
+                chunk = order_ids[start:start + 500]
+                tokens.update(self.conn.execute(
+                    f"SELECT order_id, token_id FROM entries "
+                    f"WHERE status = 'confirmed' AND order_id IN ({', '.join('?' * len(chunk))})", chunk
+                ))
+        return tokens
+
+    def pending_legs(self, run_id, make_leg):
+        """이어서 제출할 주문 → (주문 목록, 완료 수, 확인 필요 수)
+
+        make_leg(row) 로 planned 기록을 주문 객체로 만든다. 마감이 지나 제외된(expired) 주문은 빼고 세지 않는다.
+        """
+        states = self.states(run_id)
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM entries WHERE run_id = ? AND status = 'planned' ORDER BY seq",
+                (run_id,)
+            ).fetchall()
+
+        legs, done, unknown = [], 0, 0
+        for row in rows:
+            entry = dict(zip(COLUMNS, row))
+            state = states.get((entry['topic_id'], entry['token_id'], entry['side']))
+            if state == CONFIRMED:
+                done += 1
+            elif state == SUBMITTED:
+                unknown += 1
+            elif state == EXPIRED:
+                continue
+            else:
+                legs.append(make_leg(entry))
+        return legs, done, unknown
@@ -0,0 +1,193 @@
+"""
+요청 단위 지표 (지연 히스토그램 / 카운터) + Prometheus 텍스트 엔드포인트
+
+    metrics = Metrics()
+    with metrics.timer('opinion_request_seconds', endpoint='topic'):
+        ...
+    metrics.inc('opinion_errors_total', endpoint='order', code='429')
+
+METRICS_PORT 를 설정하면 http://127.0.0.1:<port>/metrics 로 노출한다.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 히스토그램 버킷 상한(초)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    'opinion_request_seconds': "API 요청 지연 (엔드포인트별)",
+    'opinion_order_phase_seconds': "주문 단계별 지연 (build / sign / submit)",
+    'opinion_order_seconds': "주문 1건 전체 지연 (대기열 제외)",
+    'opinion_ui_refresh_seconds': "GUI 큐 처리 1회 지연",
+    'opinion_errors_total': "API 에러 수 (엔드포인트 / 코드별)",
+    'opinion_orders_total': "주문 결과 수",
+    'opinion_retries_total': "재시도 대상 실패 수 (엔드포인트 / 사유별)",
+    'opinion_startup_seconds': "Client 초기화 단계별 시간",
+}
+
+
+class Histogram:
+    """고정 버킷 히스토그램 (누적 아님, 렌더링할 때 누적)"""
+
+    __slots__ = ('counts', 'count', 'sum')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """버킷 안 선형 보간으로 추정한 q 분위수(초)"""
+        if not self.count:
+            return 0.0
+
+        target = q * self.count
+        seen = 0
+        for idx, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= target and bucket_count:
+                lower = BUCKETS[idx - 1] if idx > 0 else 0.0
+                upper = BUCKETS[idx] if idx < len(BUCKETS) else BUCKETS[-1]
+                return lower + (upper - lower) * (target - seen) / bucket_count
+            seen += bucket_count
+        return BUCKETS[-1]
+
+
+class Metrics:
+    """지표 저장소 (이름 + 라벨 조합별 히스토그램 / 카운터, 스레드 안전)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+
+    @staticmethod
+    def key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def observe(self, name, seconds, **labels):
+        key = self.key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def inc(self, name, amount=1, **labels):
+        key = self.key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """with 블록 실행 시간을 히스토그램에 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def histogram(self, name, **labels):
+        with self.lock:
+            return self.histograms.get(self.key(name, labels))
+
+    def counter_total(self, name):
+        """라벨과 무관한 카운터 합계"""
+        with self.lock:
+            return sum(value for (key, _), value in self.counters.items() if key == name)
+
+    def render_prometheus(self):
+        """Prometheus 텍스트 형식"""
+        lines = []
+        with self.lock:
+            histograms = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+
+        def label_text(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ''
+            return '{' + ','.join(f'{k}="{v}"' for k, v in pairs) + '}'
+
+        declared = set()
+
+        def declare(name, kind):
+            if name not in declared:
+                declared.add(name)
+                if name in HELP:
+                    lines.append(f"# HELP {name} {HELP[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), histogram in histograms:
+            declare(name, 'histogram')
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS + (float('inf'),), histogram.counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f"{name}_bucket{label_text(labels, [('le', le)])} {cumulative}")
+            lines.append(f"{name}_sum{label_text(labels)} {histogram.sum:.6f}")
+            lines.append(f"{name}_count{label_text(labels)} {histogram.count}")
+
+        for (name, labels), value in counters:
+            declare(name, 'counter')
+            lines.append(f"{name}{label_text(labels)} {value}")
+
+        return '\n'.join(lines) + '\n'
+
+    def summary(self):
+        """GUI / 로그용 요약 줄 목록 (히스토그램별 건수, p50 / p95 ms)"""
+        with self.lock:
+            histograms = sorted(self.histograms.items())
+            errors = sorted(
+                (labels, value) for (name, labels), value in self.counters.items()
+                if name == 'opinion_errors_total'
+            )
+
+        lines = []
+        for (name, labels), histogram in histograms:
+            label = name.replace('opinion_', '').replace('_seconds', '')
+            if labels:
+                label += ' ' + ','.join(str(v) for _, v in labels)
+            lines.append(
+                f"{label}: {histogram.count}건 p50 {histogram.quantile(0.5) * 1000:.0f}ms "
+                f"p95 {histogram.quantile(0.95) * 1000:.0f}ms"
+            )
+
+        if errors:
+            lines.append("에러: " + ', '.join(
+                f"{dict(labels).get('endpoint', '?')} {dict(labels).get('code', '?')}×{value}"
+                for labels, value in errors
+            ))
+        return lines
+
+
+def start_metrics_server(metrics, port, host='127.0.0.1'):
+    """/metrics 엔드포인트 (백그라운드 스레드) → 서버 객체"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            data = metrics.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Opinion API 모의 서버 (오프라인 테스트 / 벤치마크용)
+
+    python opinion_mock_server.py --port 8999 --topics 5000 --latency 30 --error-rate 0.01 --rate-429 0.02
+    API_HOST=http://127.0.0.1:8999 python opinion_cli.py list --limit 100
+
+봇이 사용하는 엔드포인트만 흉내 낸다.
+  GET  /api/bsc/api/v2/topic       일반 토픽 (page / limit 페이지네이션, 최신순)
+  GET  /api/bsc/api/v2/indicator   지표 토픽 (page / limit 페이지네이션, 최신순)
+  GET  /openapi/quoteToken         SDK place_order 가 조회하는 견적 토큰
+  GET  /openapi/market/{id}        SDK place_order 가 조회하는 마켓
+  GET  /openapi/token/orderbook    토큰 오더북 (price_drift 확률로 호가가 ±0.01 변동)
+  POST /openapi/order              주문 제출 (서명은 검사하지 않음, 주문을 저장)
+  GET  /openapi/order              내 주문 목록 (status / marketId 필터, 최신순, fill_rate 확률로 체결 진행)
+  GET  /openapi/order/{id}         주문 상세
+  POST /openapi/order/cancel       주문 취소 (대기 주문만)
+토픽 데이터와 장애 주입은 seed 로 고정되어 같은 설정이면 같은 결과가 나온다.
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+CHAIN_ID = '56'
+QUOTE_TOKEN = '0x55d398326f99059fF775485246999027B3197955'
+EXCHANGE = '0x5F45344126D6488025B0b84A3A8189F2487a7246'
+
+
+def make_option(rng, topic_id, title):
+    """토픽 / childList 항목 JSON"""
+    yes = round(rng.uniform(0.02, 0.98), 3)
+    return {
+        'topicId': topic_id,
+        'title': title,
+        'yesPos': str(rng.getrandbits(128)),
+        'noPos': str(rng.getrandbits(128)),
+        'yesBuyPrice': str(yes),
+        'noBuyPrice': str(round(1 - yes + 0.01, 3))
+    }
+
+
+def add_market_info(rng, topic):
+    """마감(cutoffAt, ms) / 거래량 (지금부터 10분 ~ 30일 뒤)"""
+    topic['cutoffAt'] = int((time.time() + rng.randint(600, 30 * 86400)) * 1000)
+    topic['volume'] = str(round(rng.uniform(0, 100000), 2))
+    return topic
+
+
+def make_topics(count, seed=0, first_id=100000, max_children=4, start=0):
+    """일반 토픽 목록 (오래된 순, 일부는 childList 가 있는 다중 옵션 토픽)"""
+    rng = random.Random(seed)
+    info_rng = random.Random(seed + 3)  # 가격 / 토큰 데이터가 시드별로 그대로이도록 따로
+    topics = []
+    next_id = first_id
+
+    for i in range(start, start + count):
+        topic_id = next_id
+        next_id += 1
+        topic = make_option(rng, topic_id, f"Mock topic {i} will BTC close above {rng.randint(10, 200)}k?")
+
+        children = rng.randint(2, max_children) if rng.random() < 0.2 else 0
+        if children:
+            topic['childList'] = []
+            for c in range(children):
+                topic['childList'].append(make_option(rng, next_id, f"Option {c}"))
+                next_id += 1
+
+        topics.append(add_market_info(info_rng, topic))
+    return topics
+
+
+def make_indicators(count, seed=0, first_id=900000, start=0):
+    """지표 토픽 목록 ({id, title, topic}, 오래된 순)"""
+    rng = random.Random(seed + 1)
+    info_rng = random.Random(seed + 4)
+    return [
+        {
+            'id': i + 1,
+            'title': f"Mock indicator {i}",
+            'topic': add_market_info(info_rng, make_option(rng, first_id + i, f"Mock indicator topic {i}"))
+        }
+        for i in range(start, start + count)
+    ]
+
+
+class MockOpinionServer:
+    """모의 서버 (스레드 HTTP 서버)
+
+    latency / jitter: 응답 지연(ms), order_latency 가 있으면 주문 요청에만 사용
+    error_rate: 500 응답 비율, rate_429: 429 응답 비율 (Retry-After 헤더 포함)
+    fill_rate: 주문 목록 조회마다 대기 주문이 체결(절반은 부분 체결)될 확률
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, topics=1000, indicators=100, seed=0,
+                 latency=0, jitter=0, order_latency=None, error_rate=0, rate_429=0, retry_after=1,
+                 price_drift=0, fill_rate=0):
+        self.seed = seed
+        self.price_drift = price_drift
+        self.prices = {}
+        self.tokens = {}
+        # 목록은 실제 API 처럼 최신순 (새 토픽이 맨 앞)
+        self.topics = []
+        self.indicators = []
+        self.add_topics(topics, indicators)
+        self.fill_rate = fill_rate
+        self.orders = {}
+        self.latency = latency
+        self.jitter = jitter
+        self.order_latency = latency if order_latency is None else order_latency
+        self.error_rate = error_rate
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+
+        self.rng = random.Random(seed + 2)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'orders': 0, 'errors': 0, 'rate_limited': 0}
+
+        self.httpd = ThreadingHTTPServer((host, port), self.make_handler())
+        self.httpd.daemon_threads = True
+        self.httpd.handle_error = self.handle_error
+        self.thread = None
+
+    def add_topics(self, count=0, indicators=0):
+        """새 토픽 / 지표 추가 (목록 맨 앞에 최신으로 나타남)"""
+        last_id = max([option['topicId'] for topic in self.topics
+                       for option in [topic] + topic.get('childList', [])], default=100000 - 1)
+        topics = make_topics(count, self.seed + len(self.topics), first_id=last_id + 1, start=len(self.topics))
+        new_indicators = make_indicators(indicators, self.seed + len(self.indicators),
+                                         first_id=900000 + len(self.indicators), start=len(self.indicators))
+        for topic in topics + [indicator['topic'] for indicator in new_indicators]:
+            for option in topic.get('childList') or [topic]:
+                self.prices[option['yesPos']] = float(option['yesBuyPrice'])
+                self.prices[option['noPos']] = float(option['noBuyPrice'])
+                self.tokens[option['yesPos']] = (option['topicId'], 1, option['title'])
+                self.tokens[option['noPos']] = (option['topicId'], 2, option['title'])
+        self.topics[:0] = topics[::-1]
+        self.indicators[:0] = new_indicators[::-1]
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """백그라운드 스레드에서 서버 시작"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def handle_error(self, request, client_address):
+        """클라이언트가 요청을 취소해 끊긴 연결은 무시"""
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        ThreadingHTTPServer.handle_error(self.httpd, request, client_address)
+
+    def count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+            return self.stats[key]
+
+    def fault(self):
+        """장애 주입 → (상태 코드 또는 None, 추가 헤더, 추가 지연 ms)"""
+        with self.lock:
+            roll = self.rng.random()
+            delay_jitter = self.rng.uniform(0, self.jitter) if self.jitter else 0
+
+        if roll < self.rate_429:
+            self.count('rate_limited')
+            return 429, {'Retry-After': str(self.retry_after)}, delay_jitter
+        if roll < self.rate_429 + self.error_rate:
+            self.count('errors')
+            return 500, {}, delay_jitter
+        return None, {}, delay_jitter
+
+    def page(self, items, query):
+        page = max(1, int(query.get('page', ['1'])[0]))
+        limit = max(1, int(query.get('limit', ['20'])[0]))
+        start = (page - 1) * limit
+        return {'list': items[start:start + limit], 'total': len(items)}
+
+    def orderbook(self, token_id):
+        """토큰 오더북 (매도 3단계 / 매수 3단계)"""
+        with self.lock:
+            price = self.prices.get(token_id)
+            if price is None:
+                return {'tokenId': token_id, 'asks': [], 'bids': []}
+            if self.price_drift and self.rng.random() < self.price_drift:
+                price = min(0.99, max(0.01, round(price + self.rng.choice((-0.01, 0.01)), 3)))
+                self.prices[token_id] = price
+
+        levels = range(3)
+        return {
+            'tokenId': token_id,
+            'timestamp': int(time.time() * 1000),
+            'asks': [{'price': str(round(price + 0.01 * i, 3)), 'size': '100'} for i in levels],
+            'bids': [{'price': str(round(price - 0.01 * (i + 1), 3)), 'size': '100'} for i in levels],
+        }
+
+    def store_order(self, order_no, order):
+        """제출된 주문 저장 → 주문 JSON (내 주문 목록 형식)"""
+        market_id, outcome_side, title = self.tokens.get(order['tokenId'], (0, 1, ''))
+        amount = int(order.get('makerAmount') or 0) / 10 ** 18
+        data = {
+            'orderId': f"mock-{order_no}",
+            'marketId': int(order.get('topicId') or market_id),
+            'marketTitle': title,
+            'outcome': 'YES' if outcome_side == 1 else 'NO',
+            'outcomeSide': outcome_side,
+            'price': str(order.get('price')),
+            'orderAmount': str(round(amount, 6)),
+            'filledAmount': '0',
+            'side': 1,
+            'status': 1,
+            'tradingMethod': 2,
+            'createdAt': int(time.time()),
+        }
+        with self.lock:
+            self.orders[data['orderId']] = data
+        return data
+
+    def advance_fills(self):
+        """대기 주문 체결 진행 (fill_rate 확률로 절반 체결 또는 전부 체결)"""
+        if not self.fill_rate:
+            return
+        with self.lock:
+            for order in self.orders.values():
+                if order['status'] != 1 or self.rng.random() >= self.fill_rate:
+                    continue
+                amount = float(order['orderAmount'])
+                if float(order['filledAmount']) == 0 and self.rng.random() < 0.5:
+                    order['filledAmount'] = str(round(amount / 2, 6))
+                else:
+                    order['filledAmount'] = order['orderAmount']
+                    order['status'] = 2
+
+    def my_orders(self, query):
+        """내 주문 목록 (최신순)"""
+        self.advance_fills()
+        statuses = {int(s) for s in query.get('status', [''])[0].split(',') if s.strip()}
+        market_id = int(query.get('marketId', ['0'])[0] or 0)
+        with self.lock:
+            orders = [
+                dict(order) for order in reversed(list(self.orders.values()))
+                if (not statuses or order['status'] in statuses)
+                and (not market_id or order['marketId'] == market_id)
+            ]
+        return self.page(orders, query)
+
+    def cancel_order(self, order_id):
+        with self.lock:
+            order = self.orders.get(order_id)
+            if order is None or order['status'] != 1:
+                return False
+            order['status'] = 3
+            return True
+
+    def route(self, method, path, query, body):
+        """경로 → (상태 코드, 응답 JSON)"""
+        if method == 'GET' and path == '/api/bsc/api/v2/topic':
+            return 200, {'errno': 0, 'errmsg': '', 'result': self.page(self.topics, query)}
+
+        if method == 'GET' and path == '/api/bsc/api/v2/indicator':
+            return 200, {'errno': 0, 'errmsg': '', 'result': self.page(self.indicators, query)}
+
+        if method == 'GET' and path == '/openapi/quoteToken':
+            return 200, {'errno': 0, 'errmsg': '', 'result': {'total': 1, 'list': [{
+                'chainId': CHAIN_ID,
+                'ctfExchangeAddress': EXCHANGE,
+                'decimal': 18,
+                'id': 1,
+                'quoteTokenAddress': QUOTE_TOKEN,
+                'quoteTokenName': 'Tether USD',
+                'symbol': 'USDT'
+            }]}}
+
+        if method == 'GET' and path.startswith('/openapi/market/'):
+            market_id = path.rsplit('/', 1)[-1]
+            return 200, {'errno': 0, 'errmsg': '', 'result': {'data': {
+                'marketId': int(market_id) if market_id.isdigit() else 0,
+                'chainId': CHAIN_ID,
+                'quoteToken': QUOTE_TOKEN
+            }}}
+
+        if method == 'GET' and path == '/openapi/token/orderbook':
+            return 200, {'errno': 0, 'errmsg': '', 'result': self.orderbook(query.get('token_id', [''])[0])}
+
+        if method == 'POST' and path == '/openapi/order':
+            order_no = self.count('orders')
+            order = json.loads(body or b'{}')
+            if not order.get('signature') or not order.get('tokenId'):
+                return 200, {'errno': 10001, 'errmsg': 'invalid order', 'result': None}
+            data = self.store_order(order_no, order)
+            return 200, {'errno': 0, 'errmsg': '', 'result': {'orderData': {
+                'orderId': data['orderId'],
+                'topicId': data['marketId'],
+                'price': data['price'],
+                'status': 1
+            }}}
+
+        if method == 'GET' and path == '/openapi/order':
+            return 200, {'errno': 0, 'errmsg': '', 'result': self.my_orders(query)}
+
+        if method == 'POST' and path == '/openapi/order/cancel':
+            order_id = str(json.loads(body or b'{}').get('orderId', ''))
+            if not self.cancel_order(order_id):
+                return 200, {'errno': 10002, 'errmsg': f'order not cancelable: {order_id}', 'result': {'result': False}}
+            return 200, {'errno': 0, 'errmsg': '', 'result': {'result': True}}
+
+        if method == 'GET' and path.startswith('/openapi/order/'):
+            with self.lock:
+                order = self.orders.get(path.rsplit('/', 1)[-1])
+                order = dict(order) if order else None
+            if order is None:
+                return 200, {'errno': 10003, 'errmsg': 'order not found', 'result': None}
+            return 200, {'errno': 0, 'errmsg': '', 'result': {'orderData': order}}
+
+        return 404, {'errno': 404, 'errmsg': f'not found: {path}'}
+
+    def make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True  # 헤더/본문 분할 전송 시 지연 ACK(40ms) 방지
+
+            def handle_request(self, method):
+                server.count('requests')
+                url = urlparse(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+
+                status, headers, delay_jitter = server.fault()
+                is_order = url.path == '/openapi/order'
+                delay = (server.order_latency if is_order else server.latency) + delay_jitter
+                if delay > 0:
+                    time.sleep(delay / 1000)
+
+                if status is None:
+                    status, payload = server.route(method, url.path, parse_qs(url.query), body)
+                else:
+                    payload = {'errno': status, 'errmsg': 'injected failure'}
+
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self.handle_request('GET')
+
+            def do_POST(self):
+                self.handle_request('POST')
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Opinion API 모의 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8999)
+    parser.add_argument('--topics', type=int, default=1000, help="일반 토픽 개수 (기본값: 1000)")
+    parser.add_argument('--indicators', type=int, default=100, help="지표 토픽 개수 (기본값: 100)")
+    parser.add_argument('--seed', type=int, default=0, help="데이터 / 장애 주입 시드")
+    parser.add_argument('--latency', type=float, default=0, help="응답 지연(ms)")
+    parser.add_argument('--jitter', type=float, default=0, help="추가 무작위 지연 최대값(ms)")
+    parser.add_argument('--order-latency', type=float, help="주문 응답 지연(ms) (기본값: --latency)")
+    parser.add_argument('--error-rate', type=float, default=0, help="500 응답 비율 (0~1)")
+    parser.add_argument('--rate-429', type=float, default=0, help="429 응답 비율 (0~1)")
+    parser.add_argument('--retry-after', type=int, default=1, help="429 응답의 Retry-After(초)")
+    parser.add_argument('--price-drift', type=float, default=0, help="오더북 조회마다 호가가 변할 확률 (0~1)")
+    parser.add_argument('--fill-rate', type=float, default=0, help="주문 목록 조회마다 대기 주문이 체결될 확률 (0~1)")
+    parser.add_argument('--new-topic-every', type=float, default=0, metavar='SEC',
+                        help="SEC 초마다 새 일반 토픽 1개 추가 (새 토픽 탐색 테스트용, 기본값: 0 = 추가 안 함)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    server = MockOpinionServer(
+        args.host, args.port, topics=args.topics, indicators=args.indicators, seed=args.seed,
+        latency=args.latency, jitter=args.jitter, order_latency=args.order_latency,
+        error_rate=args.error_rate, rate_429=args.rate_429, retry_after=args.retry_after,
+        price_drift=args.price_drift, fill_rate=args.fill_rate
+    )
+    print(f"🧪 모의 서버 실행: {server.url} (토픽 {args.topics}개, 지표 {args.indicators}개)", flush=True)
+    if args.new_topic_every > 0:
+        def add_loop():
+            while True:
+                time.sleep(args.new_topic_every)
+                server.add_topics(1)
+                print(f"🆕 새 토픽 추가: {server.topics[0]['topicId']}", flush=True)
+
+        threading.Thread(target=add_loop, daemon=True).start()
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"⏹️  종료: {server.stats}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""
+토픽 데이터 모델
+
+API 응답 JSON 전체를 들고 있는 대신 봇이 실제로 쓰는 필드만 __slots__ 객체로 보관한다.
+토큰 ID / 타입 / 가격처럼 반복되는 문자열은 intern 해서 한 번만 저장한다.
+"""
+
+import sys
+
+REGULAR = sys.intern('REGULAR')
+INDICATOR = sys.intern('INDICATOR')
+
+
+def intern_str(value):
+    """문자열이면 intern, 아니면 그대로"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def parse_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def parse_epoch(value):
+    """API 시각(초 또는 ms) → epoch 초 (없으면 0)"""
+    value = parse_number(value)
+    return value / 1000 if value > 1e12 else value
+
+
+class Option:
+    """거래 옵션 (childList 항목, childList가 없으면 토픽 자신)"""
+
+    __slots__ = ('topic_id', 'title', 'yes_pos', 'no_pos', 'yes_price', 'no_price')
+
+    def __init__(self, topic_id, title, yes_pos, no_pos, yes_price, no_price):
+        self.topic_id = topic_id
+        self.title = title
+        self.yes_pos = intern_str(yes_pos)
+        self.no_pos = intern_str(no_pos)
+        self.yes_price = intern_str(yes_price)
+        self.no_price = intern_str(no_price)
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(
+            data.get('topicId'),
+            data.get('title', ''),
+            data.get('yesPos', ''),
+            data.get('noPos', ''),
+            data.get('yesBuyPrice', '0.5'),
+            data.get('noBuyPrice', '0.5')
+        )
+
+    def to_json(self):
+        return [self.topic_id, self.title, self.yes_pos, self.no_pos, self.yes_price, self.no_price]
+
+
+class Topic:
+    """토픽 (REGULAR / INDICATOR)"""
+
+    __slots__ = ('topic_id', 'indicator_id', 'title', 'type', 'options', 'cutoff', 'volume')
+
+    def __init__(self, topic_id, indicator_id, title, topic_type, options, cutoff=0.0, volume=0.0):
+        self.topic_id = topic_id
+        self.indicator_id = indicator_id
+        self.title = title
+        self.type = intern_str(topic_type)
+        self.options = tuple(options)
+        self.cutoff = cutoff  # 거래 마감 (epoch 초, 모르면 0)
+        self.volume = volume
+
+    @classmethod
+    def from_json(cls, data, topic_type, title=None, indicator_id=None):
+        """API 토픽 JSON → Topic (childList가 없으면 토픽 자신이 유일한 옵션)"""
+        child_list = data.get('childList') or [data]
+        return cls(
+            data.get('topicId'),
+            indicator_id,
+            data.get('title', '') if title is None else title,
+            topic_type,
+            [Option.from_json(child) for child in child_list],
+            cutoff=parse_epoch(data.get('cutoffAt')),
+            volume=parse_number(data.get('volume'))
+        )
+
+    @classmethod
+    def from_cache(cls, row):
+        topic_id, indicator_id, title, topic_type, options, cutoff, volume = row
+        return cls(topic_id, indicator_id, title, topic_type, [Option(*option) for option in options],
+                   cutoff=cutoff, volume=volume)
+
+    def to_json(self):
+        return [self.topic_id, self.indicator_id, self.title, self.type,
+                [option.to_json() for option in self.options], self.cutoff, self.volume]
+
+    @property
+    def key(self):
+        """토픽 키 (REGULAR → R:topicId, INDICATOR → I:indicatorId)"""
+        if self.type == INDICATOR:
+            return f"I:{self.indicator_id}"
+        return f"R:{self.topic_id}"
+
+
+class TopicIndex:
+    """topicId / 토픽 키로 토픽 조회"""
+
+    def __init__(self, topics=()):
+        self.by_id = {}
+        self.by_key = {}
+        self.update(topics)
+
+    def update(self, topics):
+        for topic in topics:
+            self.by_id[topic.topic_id] = topic
+            self.by_key[topic.key] = topic
+
+    def get(self, topic_id):
+        return self.by_id.get(topic_id)
+
+    def __len__(self):
+        return len(self.by_key)
+
+
+class TopicSearch:
+    """제목 / topicId / indicatorId / 타입 검색 인덱스
+
+    검색어는 공백으로 나눈 단어가 모두 포함된 토픽만 남긴다 (대소문자 무시).
+    이전 검색어에 글자를 덧붙인 경우에는 이전 결과 안에서만 다시 찾는다.
+    """
+
+    def __init__(self, topics=()):
+        self.reset(topics)
+
+    @staticmethod
+    def haystack(topic):
+        return f"{topic.title} {topic.topic_id} {topic.indicator_id or ''} {topic.type}".lower()
+
+    def reset(self, topics):
+        self.topics = list(topics)
+        self.haystacks = [self.haystack(topic) for topic in self.topics]
+        self.last_query = ''
+        self.last_result = list(range(len(self.topics)))
+
+    def extend(self, topics):
+        """토픽 추가 → 추가된 토픽 중 마지막 검색어에 맞는 목록"""
+        start = len(self.topics)
+        self.topics.extend(topics)
+        self.haystacks.extend(self.haystack(topic) for topic in topics)
+
+        words = self.last_query.split()
+        matched = [
+            i for i in range(start, len(self.topics))
+            if all(word in self.haystacks[i] for word in words)
+        ]
+        self.last_result.extend(matched)
+        return [self.topics[i] for i in matched]
+
+    def search(self, query):
+        """검색어에 맞는 토픽 목록 (로드 순서 유지)"""
+        query = query.strip().lower()
+        words = query.split()
+
+        if query.startswith(self.last_query):
+            candidates = self.last_result
+        else:
+            candidates = range(len(self.topics))
+
+        result = [i for i in candidates if all(word in self.haystacks[i] for word in words)]
+
+        self.last_query = query
+        self.last_result = result
+        return [self.topics[i] for i in result]
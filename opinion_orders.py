@@ -0,0 +1,324 @@
+"""
+주문 추적 (대기 / 부분 체결 / 체결 로컬 색인 + 일괄 동기화 / 취소 / 재주문)
+
+제출에 성공한 주문은 Order ID 로 색인에 넣고, 주문마다 조회하는 대신 내 주문 목록을 페이지 단위로 동기화한다.
+  1) 미체결(status=1) 목록: 첫 페이지의 total 로 나머지 페이지를 병렬 요청 → 대기 / 부분 체결 갱신
+     (이 프로세스가 모르는 미체결 주문도 색인에 추가)
+  2) 색인에서 미체결이었는데 1)에 없는 주문만 종료 목록(status=2,3,4,5)에서 최신순으로 찾고,
+     모두 찾았거나 가장 오래된 대상보다 오래된 페이지가 나오면 멈춘다.
+백그라운드 동기화는 ORDER_SYNC_INTERVAL 마다, 미체결 주문이 있을 때만 요청한다.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PENDING = 1
+FILLED = 2
+CANCELED = 3
+EXPIRED = 4
+FAILED = 5
+
+STATUS_NAMES = {PENDING: '대기', FILLED: '체결', CANCELED: '취소', EXPIRED: '만료', FAILED: '실패'}
+PARTIAL_NAME = '부분 체결'
+CLOSED_STATUSES = '2,3,4,5'
+
+PAGE_LIMIT = 20  # 서버 최대 페이지 크기
+MIN_ORDER_AMOUNT = 1.0  # 거래소 최소 주문 금액 (USDT)
+CLOSED_LOOKBACK = 300  # 종료 목록 조기 중단 여유(초, 로컬 / 서버 시각 차이)
+
+
+def field(row, name, alias):
+    """SDK 모델(속성) / dict(JSON 키) 모두에서 값 읽기"""
+    if isinstance(row, dict):
+        return row.get(alias)
+    return getattr(row, name, None)
+
+
+def parse_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def parse_time(value):
+    """서버 시각(초 또는 ms) → epoch 초"""
+    value = parse_float(value)
+    return value / 1000 if value > 1e12 else value
+
+
+class TrackedOrder:
+    """색인에 있는 주문 1건"""
+
+    __slots__ = ('order_id', 'market_id', 'token_id', 'outcome', 'title', 'price', 'amount', 'filled',
+                 'status', 'created', 'synced')
+
+    def __init__(self, order_id, market_id, token_id, outcome, title, price, amount, filled=0.0,
+                 status=PENDING, created=None, synced=0.0):
+        self.order_id = order_id
+        self.market_id = market_id
+        self.token_id = token_id
+        self.outcome = outcome
+        self.title = title
+        self.price = price
+        self.amount = amount
+        self.filled = filled
+        self.status = status
+        self.created = created or time.time()
+        self.synced = synced
+
+    @classmethod
+    def from_leg(cls, leg, order_id):
+        return cls(str(order_id), leg.child_topic_id, leg.token_id, leg.outcome,
+                   leg.child_title or leg.title, str(leg.price), float(leg.amount))
+
+    @classmethod
+    def from_api(cls, row):
+        side = field(row, 'outcome_side', 'outcomeSide')
+        return cls(
+            str(field(row, 'order_id', 'orderId')),
+            field(row, 'market_id', 'marketId'),
+            None,  # 목록 응답에는 토큰 ID 가 없음
+            'YES' if side == 1 else 'NO' if side == 2 else '',
+            field(row, 'market_title', 'marketTitle') or '',
+            str(field(row, 'price', 'price') or ''),
+            parse_float(field(row, 'order_amount', 'orderAmount')),
+            parse_float(field(row, 'filled_amount', 'filledAmount')),
+            field(row, 'status', 'status') or PENDING,
+            parse_time(field(row, 'created_at', 'createdAt')) or None,
+            time.time()
+        )
+
+    @property
+    def state(self):
+        if self.status == PENDING and self.filled > 0:
+            return PARTIAL_NAME
+        return STATUS_NAMES.get(self.status, str(self.status))
+
+    @property
+    def remaining(self):
+        return max(0.0, round(self.amount - self.filled, 2))
+
+    def describe(self, now=None):
+        """확인 창 / CLI 목록용 한 줄"""
+        minutes = ((now or time.time()) - self.created) / 60
+        return (f"[{self.market_id}] {self.title} {self.outcome} @ {self.price} "
+                f"체결 {self.filled:g}/{self.amount:g} USDT, {self.state}, {minutes:.0f}분 전")
+
+    def update(self, other):
+        """서버 목록 값으로 상태 / 체결량 갱신 → 바뀌었으면 True"""
+        changed = (self.status, self.filled) != (other.status, other.filled)
+        self.status = other.status
+        self.filled = other.filled
+        self.amount = other.amount or self.amount
+        self.market_id = self.market_id or other.market_id
+        self.title = self.title or other.title
+        self.synced = other.synced
+        return changed
+
+
+class OrderTracker:
+    """내 주문 색인 + 페이지 단위 동기화 + 일괄 취소
+
+    fetch_page(status, page, limit) → (주문 목록, 전체 개수), cancel_one(order_id) → (성공 여부, 에러)
+    """
+
+    def __init__(self, fetch_page, cancel_one, interval=30.0, workers=4, log=None):
+        self.fetch_page = fetch_page
+        self.cancel_one = cancel_one
+        self.interval = interval
+        self.workers = max(1, int(workers))
+        self.log = log or (lambda message, level="INFO": None)
+
+        self.lock = threading.Lock()
+        self.sync_lock = threading.Lock()
+        self.orders = {}
+        self.synced_at = 0.0
+        self.requests = 0
+
+        self.wakeup = threading.Event()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    # ---- 색인 ----
+
+    def add(self, leg, order_id):
+        """제출 성공한 주문 추가 (주문 스레드에서 호출)"""
+        if not order_id or order_id == 'N/A':
+            return
+        order = TrackedOrder.from_leg(leg, order_id)
+        with self.lock:
+            self.orders.setdefault(order.order_id, order)
+
+    def snapshot(self, states=None):
+        """주문 목록 (최신순, states 가 있으면 해당 상태만)"""
+        with self.lock:
+            orders = list(self.orders.values())
+        if states:
+            orders = [order for order in orders if order.state in states]
+        return sorted(orders, key=lambda order: order.created, reverse=True)
+
+    def counts(self):
+        """상태별 주문 수"""
+        counts = {}
+        with self.lock:
+            for order in self.orders.values():
+                counts[order.state] = counts.get(order.state, 0) + 1
+        return counts
+
+    def summary_line(self):
+        counts = self.counts()
+        if not counts:
+            return "추적 중인 주문 없음"
+        names = list(STATUS_NAMES.values()) + [PARTIAL_NAME]
+        parts = [f"{name} {counts[name]}" for name in sorted(counts, key=names.index)]
+        age = f", {int(time.time() - self.synced_at)}초 전 동기화" if self.synced_at else ''
+        return f"주문 {sum(counts.values())}건: " + ' / '.join(parts) + age
+
+    def open_orders(self):
+        return self.snapshot((STATUS_NAMES[PENDING], PARTIAL_NAME))
+
+    def stale(self, max_age):
+        """max_age 초보다 오래 걸려 있는 미체결 주문"""
+        cutoff = time.time() - max_age
+        return [order for order in self.open_orders() if order.created <= cutoff]
+
+    # ---- 동기화 ----
+
+    def sync(self):
+        """색인을 서버 주문 목록과 맞춤 → {'open', 'changed', 'added', 'requests', 'seconds'}"""
+        with self.sync_lock:
+            started = time.perf_counter()
+            requests_before = self.requests
+
+            open_rows = self._fetch_all(str(PENDING))
+            seen = set()
+            changed = added = 0
+            with self.lock:
+                for row in open_rows:
+                    order = TrackedOrder.from_api(row)
+                    seen.add(order.order_id)
+                    known = self.orders.get(order.order_id)
+                    if known is None:
+                        self.orders[order.order_id] = order
+                        added += 1
+                    elif known.update(order):
+                        changed += 1
+                missing = {
+                    order_id: order for order_id, order in self.orders.items()
+                    if order.status == PENDING and order_id not in seen
+                }
+
+            if missing:
+                changed += self._resolve_closed(missing)
+
+            self.synced_at = time.time()
+            return {
+                'open': len(open_rows),
+                'changed': changed,
+                'added': added,
+                'requests': self.requests - requests_before,
+                'seconds': time.perf_counter() - started,
+            }
+
+    def _fetch(self, status, page):
+        rows, total = self.fetch_page(status, page, PAGE_LIMIT)
+        with self.lock:
+            self.requests += 1
+        return rows, total
+
+    def _fetch_all(self, status):
+        """모든 페이지 (첫 페이지 total 로 나머지를 병렬 요청)"""
+        rows, total = self._fetch(status, 1)
+        pages = -(-total // PAGE_LIMIT) if total else (2 if len(rows) >= PAGE_LIMIT else 1)
+        if pages <= 1:
+            return list(rows)
+
+        result = list(rows)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for page_rows, _ in pool.map(lambda page: self._fetch(status, page), range(2, pages + 1)):
+                result.extend(page_rows)
+
+        if not total and len(rows) >= PAGE_LIMIT:
+            # total 이 없으면 짧은 페이지가 나올 때까지 순서대로
+            page = pages
+            while len(page_rows) >= PAGE_LIMIT:
+                page += 1
+                page_rows, _ = self._fetch(status, page)
+                result.extend(page_rows)
+        return result
+
+    def _resolve_closed(self, missing):
+        """미체결 목록에서 빠진 주문을 종료 목록에서 찾아 갱신 → 바뀐 수"""
+        oldest = min(order.created for order in missing.values()) - CLOSED_LOOKBACK
+        changed = 0
+        page = 1
+        while missing:
+            rows, _ = self._fetch(CLOSED_STATUSES, page)
+            for row in rows:
+                order = TrackedOrder.from_api(row)
+                known = missing.pop(order.order_id, None)
+                if known is not None:
+                    with self.lock:
+                        if known.update(order):
+                            changed += 1
+            if len(rows) < PAGE_LIMIT:
+                break
+            created = [parse_time(field(row, 'created_at', 'createdAt')) for row in rows]
+            if min(created) < oldest:
+                break
+            page += 1
+        return changed
+
+    # ---- 취소 ----
+
+    def cancel(self, orders):
+        """주문 일괄 취소 (병렬) → (취소된 주문 목록, 실패 수)"""
+        orders = list(orders)
+        if not orders:
+            return [], 0
+
+        cancelled, failed = [], 0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for order, (ok, error) in zip(orders, pool.map(self._cancel_safe, orders)):
+                if ok:
+                    with self.lock:
+                        order.status = CANCELED
+                    cancelled.append(order)
+                else:
+                    failed += 1
+                    self.log(f"     ❌ 주문 취소 실패 [{order.market_id}] {order.order_id}: {error}", "ERROR")
+        return cancelled, failed
+
+    def _cancel_safe(self, order):
+        try:
+            return self.cancel_one(order.order_id)
+        except Exception as e:
+            return False, str(e)
+
+    # ---- 백그라운드 동기화 ----
+
+    def start(self):
+        if self.thread is None and self.interval > 0:
+            self.thread = threading.Thread(target=self._poll_loop, daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        self.wakeup.set()
+
+    def _poll_loop(self):
+        while not self.stopped.is_set():
+            # 처음 한 번은 기존 미체결 주문을 가져오고, 이후에는 미체결 주문이 있을 때만
+            if not self.synced_at or self.open_orders():
+                try:
+                    result = self.sync()
+                    if result['changed'] or result['added']:
+                        self.log(f"📑 주문 동기화: 변경 {result['changed']}건, 새로 찾음 {result['added']}건 "
+                                 f"({result['requests']}회 요청)", "INFO")
+                except Exception as e:
+                    self.log(f"⚠️  주문 동기화 실패: {e}", "WARNING")
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
@@ -0,0 +1,236 @@
+"""
+주문 계획 (선택한 모든 YES/NO 주문에 총 예산 배분 + SafeRate 가격)
+
+    plan = build_plan(legs, budget=100, weighting='odds', min_amount=1, max_amount=10, safe_rate=0.01)
+    for line in plan.summary_lines():
+        print(line)
+
+배분 방식 (weighting)
+  equal  모든 주문에 같은 금액
+  price  가격에 비례 (비싼 = 확률 높은 쪽에 더 많이)
+  odds   1/가격에 비례 (싼 = 배당 높은 쪽에 더 많이)
+
+금액은 clip(λ × 가중치, min, max) 의 합이 예산이 되도록 λ 를 이분 탐색해 정하고
+센트 단위로 맞춘다 (최대 잉여 방식). min 은 거래소 최소 주문 금액(1 USDT) 이상이며,
+예산이 min × 주문 수보다 적으면 가중치가 낮은 주문부터 제외한다.
+numpy 가 있으면 전체 주문을 배열 연산 한 번으로 계산하고, 없으면 같은 계산을 순수 파이썬으로 한다.
+budget <= 0 이면 기존처럼 모든 주문에 order_amount 를 그대로 쓴다 (max 로만 제한).
+"""
+
+import math
+import time
+
+WEIGHTINGS = ('equal', 'price', 'odds')
+
+MIN_PRICE = 0.001
+MAX_PRICE = 0.999
+EXCHANGE_MIN_AMOUNT = 1.0  # SDK: makerAmountInQuoteToken must be at least 1
+BISECT_STEPS = 48
+
+
+def get_numpy():
+    """numpy 모듈 (설치되지 않았으면 None)"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def parse_price(value):
+    """가격 문자열 → float (없거나 0~1 밖이면 nan)"""
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        return math.nan
+    return price if 0 < price < 1 else math.nan
+
+
+class OrderPlan:
+    """주문 계획 결과 (legs 의 price / amount 는 계획대로 채워져 있음)"""
+
+    def __init__(self, legs, dropped, invalid, budget, weighting, backend, seconds, skipped=0):
+        self.legs = legs
+        self.dropped = dropped  # 예산 부족으로 제외
+        self.invalid = invalid  # 가격 오류로 제외
+        self.budget = budget
+        self.weighting = weighting
+        self.backend = backend
+        self.seconds = seconds
+        self.skipped = skipped  # 토큰 ID 없음 (build_legs)
+
+    @property
+    def total(self):
+        return round(sum(leg.amount for leg in self.legs), 2)
+
+    def summary_lines(self):
+        """미리보기 / 확인 창용 요약"""
+        if not self.legs:
+            lines = ["주문 없음"]
+        else:
+            amounts = [leg.amount for leg in self.legs]
+            prices = [float(leg.price) for leg in self.legs]
+            budget = f"예산 {self.budget} USDT, {self.weighting}" if self.budget > 0 else "건당 고정 금액"
+            lines = [
+                f"주문 {len(self.legs)}건, 합계 {self.total} USDT ({budget})",
+                f"건당 금액: 최소 {min(amounts)} / 평균 {sum(amounts) / len(amounts):.2f} / 최대 {max(amounts)} USDT",
+                f"주문 가격: {min(prices)} ~ {max(prices)}",
+            ]
+
+        if self.dropped:
+            lines.append(f"예산 부족으로 제외: {len(self.dropped)}건")
+        if self.invalid:
+            lines.append(f"가격 오류로 제외: {len(self.invalid)}건")
+        if self.skipped:
+            lines.append(f"토큰 ID 없음: {self.skipped}건")
+        lines.append(f"계산: {self.seconds * 1000:.1f}ms ({self.backend})")
+        return lines
+
+    def preview_rows(self, limit=20):
+        """금액이 큰 순서로 limit 개 주문 줄"""
+        rows = sorted(self.legs, key=lambda leg: leg.amount, reverse=True)[:limit]
+        return [
+            f"{leg.amount:>8.2f} USDT @ {leg.price:<6} {leg.outcome:<3} "
+            f"[{leg.child_topic_id}] {leg.title[:40]}"
+            + (f" / {leg.child_title[:20]}" if leg.child_title and leg.child_title != leg.title else '')
+            for leg in rows
+        ]
+
+
+def build_plan(legs, order_amount=5.0, budget=0, weighting='equal', min_amount=0, max_amount=0,
+               safe_rate=0, use_numpy=True, skipped=0):
+    """주문 목록 → OrderPlan (각 leg 의 base_price 기준으로 price / amount 설정)"""
+    if weighting not in WEIGHTINGS:
+        raise ValueError(f"배분 방식은 {', '.join(WEIGHTINGS)} 중 하나여야 합니다: {weighting}")
+
+    started = time.perf_counter()
+    min_amount = max(min_amount, EXCHANGE_MIN_AMOUNT)
+    np = get_numpy() if use_numpy else None
+    base_prices = [parse_price(leg.base_price) for leg in legs]
+
+    if np is not None:
+        amounts, prices = _plan_numpy(np, base_prices, order_amount, budget, weighting, min_amount, max_amount, safe_rate)
+    else:
+        amounts, prices = _plan_python(base_prices, order_amount, budget, weighting, min_amount, max_amount, safe_rate)
+
+    planned, dropped, invalid = [], [], []
+    for leg, base, amount, price in zip(legs, base_prices, amounts, prices):
+        if math.isnan(base):
+            invalid.append(leg)
+        elif amount <= 0:
+            dropped.append(leg)
+        else:
+            leg.amount = amount
+            leg.price = str(round(price, 3))
+            planned.append(leg)
+
+    return OrderPlan(planned, dropped, invalid, budget, weighting,
+                     'numpy' if np is not None else 'python', time.perf_counter() - started, skipped)
+
+
+def _plan_numpy(np, base_prices, order_amount, budget, weighting, min_amount, max_amount, safe_rate):
+    prices = np.asarray(base_prices, dtype=float)
+    valid = ~np.isnan(prices)
+
+    safe = np.clip(prices * (1 + safe_rate), MIN_PRICE, MAX_PRICE)
+
+    if budget <= 0:
+        amount = min(order_amount, max_amount) if max_amount > 0 else order_amount
+        return np.where(valid, amount, 0.0).tolist(), safe.tolist()
+
+    if weighting == 'equal':
+        weights = np.ones_like(prices)
+    elif weighting == 'price':
+        weights = prices.copy()
+    else:
+        weights = 1 / prices
+    weights[~valid] = 0
+
+    # 예산으로 min 을 다 채울 수 없으면 가중치가 큰 주문만 남김 (같으면 앞쪽 우선)
+    funded = valid.copy()
+    if min_amount > 0:
+        keep = int(budget // min_amount + 1e-9)
+        if keep < funded.sum():
+            order = np.argsort(-weights, kind='stable')[:keep]
+            funded[:] = False
+            funded[order] = True
+    weights = np.where(funded, weights, 0)
+
+    upper = max_amount if max_amount > 0 else math.inf
+    lower = min_amount
+
+    def total(scale):
+        return np.clip(scale * weights, lower, upper)[funded].sum()
+
+    # λ 이분 탐색: λ=0 이면 모두 min, λ=hi 이면 모두 max (또는 예산 전부를 가중치 비율로)
+    lo = 0.0
+    hi = budget / weights[funded].min() if funded.any() else 0.0
+    for _ in range(BISECT_STEPS):
+        mid = (lo + hi) / 2
+        if total(mid) > budget:
+            hi = mid
+        else:
+            lo = mid
+
+    # 센트 단위로 내리고, 내림으로 남은 센트는 나머지가 큰 주문부터 1센트씩 (max 이하로)
+    raw = np.where(funded, np.clip(lo * weights, lower, upper), 0.0) * 100
+    cents = np.floor(raw + 1e-9)
+    leftover = int(round(raw.sum() - cents.sum()))
+    if leftover > 0:
+        room = funded & (cents + 1 <= upper * 100 + 1e-9)
+        ranked = np.argsort(-np.where(room, raw - cents, -1.0), kind='stable')[:min(leftover, int(room.sum()))]
+        cents[ranked] += 1
+    return (cents / 100).tolist(), safe.tolist()
+
+
+def _plan_python(base_prices, order_amount, budget, weighting, min_amount, max_amount, safe_rate):
+    valid = [not math.isnan(price) for price in base_prices]
+    safe = [
+        min(MAX_PRICE, max(MIN_PRICE, price * (1 + safe_rate))) if ok else math.nan
+        for price, ok in zip(base_prices, valid)
+    ]
+
+    if budget <= 0:
+        amount = min(order_amount, max_amount) if max_amount > 0 else order_amount
+        return [amount if ok else 0.0 for ok in valid], safe
+
+    if weighting == 'equal':
+        weights = [1.0 if ok else 0.0 for ok in valid]
+    elif weighting == 'price':
+        weights = [price if ok else 0.0 for price, ok in zip(base_prices, valid)]
+    else:
+        weights = [1 / price if ok else 0.0 for price, ok in zip(base_prices, valid)]
+
+    funded = list(valid)
+    if min_amount > 0:
+        keep = int(budget // min_amount + 1e-9)
+        if keep < sum(funded):
+            ranked = sorted((idx for idx, ok in enumerate(valid) if ok), key=lambda idx: -weights[idx])
+            kept = set(ranked[:keep])
+            funded = [idx in kept for idx in range(len(valid))]
+    weights = [weight if ok else 0.0 for weight, ok in zip(weights, funded)]
+
+    upper = max_amount if max_amount > 0 else math.inf
+    lower = min_amount
+    active = [weight for weight, ok in zip(weights, funded) if ok]
+
+    def total(scale):
+        return sum(min(upper, max(lower, scale * weight)) for weight in active)
+
+    lo = 0.0
+    hi = budget / min(active) if active else 0.0
+    for _ in range(BISECT_STEPS):
+        mid = (lo + hi) / 2
+        if total(mid) > budget:
+            hi = mid
+        else:
+            lo = mid
+
+    raw = [min(upper, max(lower, lo * weight)) * 100 if ok else 0.0 for weight, ok in zip(weights, funded)]
+    cents = [math.floor(value + 1e-9) for value in raw]
+    leftover = int(round(sum(raw) - sum(cents)))
+    if leftover > 0:
+        room = [idx for idx, ok in enumerate(funded) if ok and cents[idx] + 1 <= upper * 100 + 1e-9]
+        for idx in sorted(room, key=lambda idx: -(raw[idx] - cents[idx]))[:leftover]:
+            cents[idx] += 1
+    return [value / 100 for value in cents], safe
@@ -0,0 +1,309 @@
+"""
+주문 사전 서명 파이프라인
+
+1단계: 서명 스레드 풀이 앞으로 제출할 주문(look-ahead)을 미리 생성하고 EIP-712 서명
+2단계: 주문 워커는 이미 서명된 주문을 제출만 한다
+
+SDK의 Client.place_order 는 생성 / 서명 / 제출을 한 번에 처리하므로
+SDK 내부(OrderBuilder, market_api.openapi_order_post)를 직접 사용해 단계를 나눈다.
+SDK 구조가 달라 나눌 수 없으면 SdkOrderSigner.supported() 가 False 가 되고
+코어는 기존 place_order 경로를 사용한다.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from opinion_core import parse_order_result
+from opinion_metrics import Metrics
+
+
+class SignedOrder:
+    """서명 완료된 주문 (제출 요청 + 서명 당시 가격/시각)"""
+
+    def __init__(self, leg, price, request):
+        self.leg = leg
+        self.price = price
+        self.request = request
+        self.signed_at = time.monotonic()
+
+
+class SdkOrderSigner:
+    """opinion_clob_sdk Client 로 주문 생성/서명과 제출을 분리"""
+
+    def __init__(self, client, metrics=None, api_governor=None, order_governor=None):
+        self.client = client
+        self.metrics = metrics or Metrics()
+        self.api_governor = api_governor
+        self.order_governor = order_governor
+        self.lock = threading.Lock()
+        self.quote_tokens = None  # [(quote_token_addr, exchange_addr, decimals)]
+        self.markets = {}   # marketId → (exchange_addr, quote_token_addr, decimals)
+        self.builders = {}  # exchange_addr → OrderBuilder
+
+    def supported(self):
+        """현재 SDK 에서 단계 분리가 가능한지"""
+        required = ('contract_caller', 'market_api', 'get_market', 'get_quote_tokens',
+                    '_parse_list_response', '_validate_market_response')
+        return all(hasattr(self.client, name) for name in required)
+
+    def call(self, func):
+        return self.api_governor.call(func) if self.api_governor else func()
+
+    def seed(self, quote_tokens=None, markets=None):
+        """캐시해 둔 견적 토큰 / 마켓 정보 넣기 (다음 주문부터 조회 생략)"""
+        with self.lock:
+            if quote_tokens:
+                self.quote_tokens = [tuple(item) for item in quote_tokens]
+            for market_id, info in (markets or {}).items():
+                self.markets.setdefault(int(market_id), tuple(info))
+
+    def quote_token_list(self):
+        """[(견적 토큰 주소, 거래소 주소, decimals)] (처음 한 번만 조회)"""
+        with self.lock:
+            if self.quote_tokens is not None:
+                return self.quote_tokens
+
+        client = self.client
+        items = client._parse_list_response(self.call(client.get_quote_tokens), "get quote tokens")
+        quote_tokens = [
+            (item.quote_token_address, item.ctf_exchange_address, int(item.decimal)) for item in items
+        ]
+        with self.lock:
+            self.quote_tokens = quote_tokens
+        return quote_tokens
+
+    def market_info(self, market_id):
+        """마켓의 거래소/견적 토큰 정보 (마켓별 1회 조회)"""
+        with self.lock:
+            if market_id in self.markets:
+                return self.markets[market_id]
+
+        client = self.client
+        quote_tokens = self.quote_token_list()
+        market = client._validate_market_response(
+            self.call(lambda: client.get_market(market_id)), "get market for place order"
+        )
+
+        if int(market.chain_id) != client.chain_id:
+            raise ValueError('Cannot place order on different chain')
+
+        quote_token = next(
+            (item for item in quote_tokens if item[0].lower() == market.quote_token.lower()),
+            None
+        )
+        if not quote_token:
+            raise ValueError('Quote token not found for this market')
+
+        info = (quote_token[1], market.quote_token, quote_token[2])
+        with self.lock:
+            self.markets[market_id] = info
+        return info
+
+    def builder(self, exchange_addr):
+        """거래소 주소별 OrderBuilder (재사용)"""
+        from opinion_clob_sdk.chain.py_order_utils.builders.order_builder import OrderBuilder
+
+        with self.lock:
+            if exchange_addr not in self.builders:
+                self.builders[exchange_addr] = OrderBuilder(
+                    exchange_addr, self.client.chain_id, self.client.contract_caller.signer
+                )
+            return self.builders[exchange_addr]
+
+    def warm(self):
+        """거래소별 빌더 생성 + 더미 주문 서명 (첫 주문이 서명 준비 비용을 내지 않도록, 제출하지 않음)"""
+        from opinion_clob_sdk.chain.py_order_utils.constants import ZERO_ADDRESS
+        from opinion_clob_sdk.chain.py_order_utils.model.order import OrderData
+        from opinion_clob_sdk.chain.py_order_utils.model.sides import OrderSide
+        from opinion_clob_sdk.chain.py_order_utils.model.signatures import POLY_GNOSIS_SAFE
+
+        caller = self.client.contract_caller
+        for _, exchange_addr, _ in self.quote_token_list():
+            self.builder(exchange_addr).build_signed_order(OrderData(
+                maker=caller.multi_sig_addr,
+                taker=ZERO_ADDRESS,
+                tokenId='1',
+                makerAmount='1000000',
+                takerAmount='1000000',
+                feeRateBps='0',
+                side=OrderSide.BUY,
+                signatureType=POLY_GNOSIS_SAFE,
+                signer=caller.signer.address()
+            ))
+
+    def sign(self, leg, price):
+        """지정가 매수 주문 생성 + 서명 (Client.place_order 의 제출 직전 단계까지)"""
+        from opinion_api.models.v2_add_order_req import V2AddOrderReq
+        from opinion_clob_sdk.sdk import safe_amount_to_wei
+        from opinion_clob_sdk.chain.py_order_utils.constants import ZERO_ADDRESS
+        from opinion_clob_sdk.chain.py_order_utils.model.order import OrderData
+        from opinion_clob_sdk.chain.py_order_utils.model.order_type import LIMIT_ORDER
+        from opinion_clob_sdk.chain.py_order_utils.model.sides import OrderSide
+        from opinion_clob_sdk.chain.py_order_utils.model.signatures import POLY_GNOSIS_SAFE
+        from opinion_clob_sdk.chain.py_order_utils.utils import calculate_order_amounts
+
+        if float(leg.amount) < 1:
+            raise ValueError("makerAmountInQuoteToken must be at least 1")
+
+        with self.metrics.timer('opinion_order_phase_seconds', phase='build'):
+            market_id = int(leg.child_topic_id)
+            exchange_addr, quote_token_addr, decimals = self.market_info(market_id)
+            caller = self.client.contract_caller
+
+            maker_amount, taker_amount = calculate_order_amounts(
+                price=float(price),
+                maker_amount=safe_amount_to_wei(float(leg.amount), decimals),
+                side=OrderSide.BUY,
+                decimals=decimals
+            )
+            order_data = OrderData(
+                maker=caller.multi_sig_addr,
+                taker=ZERO_ADDRESS,
+                tokenId=leg.token_id,
+                makerAmount=maker_amount,
+                takerAmount=taker_amount,
+                feeRateBps='0',
+                side=OrderSide.BUY,
+                signatureType=POLY_GNOSIS_SAFE,
+                signer=caller.signer.address()
+            )
+
+        with self.metrics.timer('opinion_order_phase_seconds', phase='sign'):
+            signed = self.builder(exchange_addr).build_signed_order(order_data)
+        order = signed.order.dict()
+
+        request = V2AddOrderReq(
+            salt=str(order['salt']),
+            topic_id=market_id,
+            maker=order['maker'],
+            signer=order['signer'],
+            taker=order['taker'],
+            token_id=str(order['tokenId']),
+            maker_amount=str(order['makerAmount']),
+            taker_amount=str(order['takerAmount']),
+            expiration=str(order['expiration']),
+            nonce=str(order['nonce']),
+            fee_rate_bps=str(order['feeRateBps']),
+            side=str(order['side']),
+            signature_type=str(order['signatureType']),
+            signature=signed.signature,
+            sign=signed.signature,
+            contract_address="",
+            currency_address=quote_token_addr,
+            price=str(price),
+            trading_method=int(LIMIT_ORDER),
+            timestamp=int(time.time()),
+            safe_rate='0',
+            order_exp_time='0'
+        )
+        return SignedOrder(leg, str(price), request)
+
+    def submit(self, signed):
+        """서명된 주문 제출 → (성공 여부, Order ID 또는 에러)"""
+        try:
+            with self.metrics.timer('opinion_order_phase_seconds', phase='submit'):
+                result = self.post_order(signed.request)
+        except Exception as e:
+            self.metrics.inc('opinion_errors_total', endpoint='order', code=str(getattr(e, 'status', None) or type(e).__name__))
+            raise
+
+        errno = getattr(result, 'errno', 0)
+        if errno:
+            self.metrics.inc('opinion_errors_total', endpoint='order', code=f"errno{errno}")
+        return parse_order_result(result)
+
+    def post_order(self, request):
+        """주문 제출 API 호출 (주문 조절기가 있으면 재시도 / 속도 조절 적용)"""
+        def post():
+            return self.client.market_api.openapi_order_post(apikey=self.client.api_key, add_order_req=request)
+
+        return self.order_governor.call(post) if self.order_governor else post()
+
+
+class PresignPipeline:
+    """주문 사전 서명 파이프라인 (서명 스레드 풀 + look-ahead 깊이)
+
+    start() 로 받은 순서대로 최대 depth 개까지 미리 서명해 두고,
+    take() 로 하나를 가져갈 때마다 다음 주문 서명을 시작한다.
+    서명 후 가격이 바뀌었거나 max_age 초가 지난 서명은 버리고 다시 서명한다.
+    """
+
+    def __init__(self, sign, depth=8, workers=2, max_age=30, price_of=None):
+        self.sign = sign
+        self.depth = max(1, int(depth))
+        self.max_age = max_age
+        self.price_of = price_of or (lambda leg: leg.price)
+        self.pool = ThreadPoolExecutor(max_workers=max(1, int(workers)))
+
+        self.lock = threading.Lock()
+        self.pending = deque()
+        self.futures = {}
+        self.taken = set()
+
+        self.hits = 0
+        self.stale = 0
+        self.inline = 0
+
+    def start(self, legs):
+        """서명 대기열 등록 후 look-ahead 만큼 서명 시작"""
+        with self.lock:
+            self.pending.extend(legs)
+            self._fill()
+
+    def _fill(self):
+        while len(self.futures) < self.depth and self.pending:
+            leg = self.pending.popleft()
+            if id(leg) in self.taken:
+                continue
+            self.futures[id(leg)] = self.pool.submit(self._sign_current, leg)
+
+    def _sign_current(self, leg):
+        """현재 가격으로 서명 (가격 조회도 서명 스레드에서)"""
+        return self.sign(leg, self.price_of(leg))
+
+    def take(self, leg):
+        """제출할 서명 주문 반환 (미리 서명이 없거나 오래됐으면 즉시 서명)"""
+        with self.lock:
+            self.taken.add(id(leg))
+            future = self.futures.pop(id(leg), None)
+            self._fill()
+
+        signed = None
+        if future is not None:
+            try:
+                signed = future.result()
+            except Exception:
+                signed = None
+
+        # 미리 서명이 끝난 뒤 가격 확인 (서명 스레드가 조회한 호가를 다시 조회하지 않도록)
+        price = self.price_of(leg)
+
+        if signed is not None and self.is_fresh(signed, price):
+            with self.lock:
+                self.hits += 1
+            return signed
+
+        with self.lock:
+            if signed is not None:
+                self.stale += 1
+            else:
+                self.inline += 1
+
+        return self.sign(leg, price)
+
+    def is_fresh(self, signed, price):
+        """서명 당시 가격과 같고 max_age 이내인지"""
+        if str(price) != signed.price:
+            return False
+        return self.max_age <= 0 or time.monotonic() - signed.signed_at <= self.max_age
+
+    def close(self):
+        """남은 서명 작업 취소"""
+        with self.lock:
+            for future in self.futures.values():
+                future.cancel()
+            self.futures.clear()
+            self.pending.clear()
+        self.pool.shutdown(wait=False)
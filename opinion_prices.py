@@ -0,0 +1,124 @@
+"""
+실시간 가격 캐시 (선택한 토픽의 yesPos / noPos 토큰)
+
+토픽 로드 시점의 yesBuyPrice / noBuyPrice 는 오래될 수 있으므로
+오더북 최우선 매도 호가(best ask)를 묶음 단위로 병렬 조회해 캐시하고,
+바뀐 가격만 on_change 로 알린다. 주문 경로는 max_age 이내의 가격만 사용한다.
+
+SDK 웹소켓은 체결가(last price)와 호가 변경분(depth diff)만 보내고
+호가 스냅샷이 없어 매수 호가를 바로 얻을 수 없으므로 폴링을 사용한다.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PriceCache:
+    """토큰 ID → (가격 문자열, 갱신 시각) 캐시 + 백그라운드 폴링"""
+
+    def __init__(self, fetch, max_age=10.0, interval=2.0, batch_size=20, workers=4, on_change=None, log=None):
+        self.fetch = fetch
+        self.max_age = max_age
+        self.interval = interval
+        self.batch_size = max(1, int(batch_size))
+        self.workers = max(1, int(workers))
+        self.on_change = on_change
+        self.log = log
+
+        self.lock = threading.Lock()
+        self.prices = {}
+        self.watched = []
+        self.wakeup = threading.Event()
+        self.stopped = threading.Event()
+        self.thread = None
+
+        self.polls = 0
+        self.changes = 0
+        self.errors = 0
+
+    def watch(self, token_ids):
+        """폴링할 토큰 목록 교체 (빈 목록이면 폴링 대기)"""
+        with self.lock:
+            self.watched = list(dict.fromkeys(token_id for token_id in token_ids if token_id))
+        self.wakeup.set()
+
+    def start(self):
+        """백그라운드 폴링 시작 (interval <= 0 이면 폴링 없이 refresh / get 만)"""
+        if self.thread is None and self.interval > 0:
+            self.thread = threading.Thread(target=self._poll_loop, daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        self.wakeup.set()
+
+    def _poll_loop(self):
+        while not self.stopped.is_set():
+            with self.lock:
+                tokens = list(self.watched)
+            if tokens:
+                self.refresh(tokens)
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+
+    def refresh(self, token_ids):
+        """토큰 가격을 batch_size 묶음으로 병렬 조회 → 바뀐 {토큰: 가격}"""
+        token_ids = [token_id for token_id in dict.fromkeys(token_ids) if token_id]
+        changed = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for start in range(0, len(token_ids), self.batch_size):
+                batch = token_ids[start:start + self.batch_size]
+                for token_id, price in zip(batch, pool.map(self._fetch_one, batch)):
+                    if price is None:
+                        continue
+                    now = time.monotonic()
+                    with self.lock:
+                        previous = self.prices.get(token_id)
+                        self.prices[token_id] = (price, now)
+                    if previous is None or previous[0] != price:
+                        changed[token_id] = price
+
+        with self.lock:
+            self.polls += 1
+            self.changes += len(changed)
+
+        if changed and self.on_change:
+            self.on_change(changed)
+        return changed
+
+    def _fetch_one(self, token_id):
+        try:
+            return self.fetch(token_id)
+        except Exception as e:
+            with self.lock:
+                self.errors += 1
+            if self.log:
+                self.log(f"⚠️  가격 조회 실패 ({token_id[:10]}...): {e}", "WARNING")
+            return None
+
+    def get(self, token_id, max_age=None):
+        """max_age 초 이내에 갱신된 가격 (없거나 오래됐으면 None)"""
+        max_age = self.max_age if max_age is None else max_age
+        with self.lock:
+            entry = self.prices.get(token_id)
+        if entry is None:
+            return None
+        price, updated = entry
+        if max_age > 0 and time.monotonic() - updated > max_age:
+            return None
+        return price
+
+
+def best_ask(orderbook_response):
+    """SDK get_orderbook 응답 → 최우선 매도 호가 문자열 (호가가 없으면 None)"""
+    if getattr(orderbook_response, 'errno', 0):
+        raise ValueError(f"orderbook errno={orderbook_response.errno} {getattr(orderbook_response, 'errmsg', '')}")
+
+    asks = getattr(getattr(orderbook_response, 'result', None), 'asks', None) or []
+    prices = [float(level.price) for level in asks if level.price]
+    if not prices:
+        return None
+    return str(min(prices))
@@ -0,0 +1,202 @@
+"""
+주문 스케줄러 (우선순위 큐 + 토픽별 마감 + 느린 토픽 뒤로 보내기)
+
+주문은 토픽 단위로 묶고(per_topic_order 면 같은 토픽은 한 번에 하나씩 YES → NO 순서), 각 토픽의 다음 주문을
+우선순위 힙에 넣는다. 작업자는 선택 순서 대신 힙에서 가장 급한 토픽의 다음 주문을 가져가고,
+제출이 끝나면 그 토픽의 다음 주문을 다시 힙에 넣는다.
+
+우선순위 키 (ORDER_PRIORITY, 쉼표로 여러 개, 앞에 '-' 를 붙이면 반대 순서, 비우면 선택 순서)
+  end     마감(cutoffAt)이 가까운 토픽 먼저 (마감을 모르면 맨 뒤)
+  edge    옵션의 YES + NO 가격 합이 1보다 많이 낮은 주문 먼저
+  volume  거래량이 큰 토픽 먼저
+  type    REGULAR 먼저 (-type 이면 INDICATOR 먼저)
+
+토픽별 마감은 마감 - cutoff_margin 초와 실행 시작 + topic_timeout 초(0 이면 없음) 중 이른 시각이다.
+마감까지 시작하지 못한 주문은 그 토픽의 남은 주문과 함께 제외한다 (이미 제출 중인 주문은 그대로).
+제출이 실패했거나 slow_seconds 초 또는 평균의 SLOW_FACTOR 배보다 오래 걸린 토픽은 한 단계 뒤(round)로
+다시 넣어 다른 토픽을 막지 않게 한다.
+"""
+
+import heapq
+import threading
+import time
+
+from opinion_models import INDICATOR, parse_number
+
+PRIORITY_KEYS = ('end', 'edge', 'volume', 'type')
+
+SLOW_FACTOR = 3.0
+SLOW_MIN_SECONDS = 0.5
+AVERAGE_WEIGHT = 0.2  # 주문 소요 시간 이동 평균 가중치
+
+
+def parse_priority(spec):
+    """'end,-edge' → [('end', 1), ('edge', -1)] (모르는 키는 ValueError)"""
+    keys = []
+    for item in (spec or '').replace(' ', '').split(','):
+        if not item:
+            continue
+        name = item.lstrip('+-')
+        if name not in PRIORITY_KEYS:
+            raise ValueError(f"우선순위 키를 알 수 없습니다: {name} (사용 가능: {', '.join(PRIORITY_KEYS)})")
+        keys.append((name, -1 if item.startswith('-') else 1))
+    return keys
+
+
+def format_priority(keys):
+    return ','.join(('-' if direction < 0 else '') + name for name, direction in keys) or '선택 순서'
+
+
+def option_edges(legs):
+    """옵션별 1 - (YES + NO 기준 가격) (두 주문이 모두 있는 옵션만)"""
+    sums, counts = {}, {}
+    for leg in legs:
+        key = leg.child_topic_id
+        sums[key] = sums.get(key, 0.0) + parse_number(leg.base_price)
+        counts[key] = counts.get(key, 0) + 1
+    return {key: 1.0 - total for key, total in sums.items() if counts[key] >= 2}
+
+
+class TopicGroup:
+    """한 토픽의 주문 (next 번째부터 남음)"""
+
+    __slots__ = ('legs', 'next', 'seq', 'rounds', 'deadline')
+
+    def __init__(self, legs, seq, deadline):
+        self.legs = legs
+        self.next = 0
+        self.seq = seq
+        self.rounds = 0
+        self.deadline = deadline
+
+
+class LegScheduler:
+    """주문 우선순위 스케줄러 (스레드 / asyncio 엔진 공용, 스레드 안전)
+
+    poll() 로 시작할 주문을 받고, 제출이 끝나면 done(), 시작하지 않고 놓으면 drop() / close().
+    """
+
+    def __init__(self, legs, keys=(), per_topic_order=True, cutoff_margin=60.0, topic_timeout=0.0, slow_seconds=2.0):
+        self.keys = list(keys)
+        self.slow_seconds = slow_seconds
+        self.total = len(legs)
+        self.edges = option_edges(legs) if any(name == 'edge' for name, _ in self.keys) else {}
+        started = time.time()
+
+        groups = {}
+        for leg in legs:
+            key = str(leg.topic_id) if per_topic_order else id(leg)
+            groups.setdefault(key, []).append(leg)
+
+        self.lock = threading.Lock()
+        self.heap = []
+        self.group_of = {}
+        for seq, group_legs in enumerate(groups.values()):
+            cutoff = group_legs[0].cutoff
+            deadlines = [cutoff - cutoff_margin] if cutoff else []
+            if topic_timeout > 0:
+                deadlines.append(started + topic_timeout)
+            group = TopicGroup(group_legs, seq, min(deadlines) if deadlines else None)
+            for leg in group_legs:
+                self.group_of[id(leg)] = group
+            self._push(group)
+
+        self.in_flight = 0
+        self.closed = False
+        self.dropped = []
+        self.demoted = 0
+        self.average = None
+
+    def sort_key(self, leg):
+        values = []
+        for name, direction in self.keys:
+            if name == 'end':
+                values.append((0, leg.cutoff * direction) if leg.cutoff else (1, 0))
+            elif name == 'edge':
+                values.append(-self.edges.get(leg.child_topic_id, 0.0) * direction)
+            elif name == 'volume':
+                values.append(-leg.volume * direction)
+            else:
+                values.append((1 if leg.topic_type == INDICATOR else 0) * direction)
+        return tuple(values)
+
+    def _push(self, group):
+        leg = group.legs[group.next]
+        heapq.heappush(self.heap, (group.rounds, self.sort_key(leg), group.seq, group))
+
+    def _drop_rest(self, group):
+        self.dropped.extend(group.legs[group.next:])
+        group.next = len(group.legs)
+
+    def poll(self, now=None):
+        """다음에 시작할 주문 (없으면 None - 모두 끝났거나 남은 토픽이 제출 중)"""
+        now = time.time() if now is None else now
+        with self.lock:
+            while self.heap and not self.closed:
+                group = heapq.heappop(self.heap)[-1]
+                if group.deadline is not None and now > group.deadline:
+                    self._drop_rest(group)
+                    continue
+                leg = group.legs[group.next]
+                group.next += 1
+                self.in_flight += 1
+                return leg
+            return None
+
+    def expired(self, leg, now=None):
+        """이 주문의 토픽 마감이 지났는지 (속도 제한 대기 후 시작 직전 확인)"""
+        deadline = self.group_of[id(leg)].deadline
+        return deadline is not None and (time.time() if now is None else now) > deadline
+
+    def drop(self, leg):
+        """시작하지 못한 주문 → 그 토픽의 남은 주문까지 제외"""
+        with self.lock:
+            self.in_flight -= 1
+            group = self.group_of[id(leg)]
+            group.next -= 1
+            self._drop_rest(group)
+
+    def done(self, leg, seconds, success=True):
+        """제출 완료 → 토픽의 다음 주문을 다시 큐에 (실패했거나 느렸으면 한 단계 뒤로)"""
+        with self.lock:
+            self.in_flight -= 1
+            average = self.average
+            self.average = seconds if average is None else average + (seconds - average) * AVERAGE_WEIGHT
+
+            group = self.group_of[id(leg)]
+            if self.closed or group.next >= len(group.legs):
+                return
+            slow = seconds > self.slow_seconds > 0 or (
+                average and seconds > max(SLOW_MIN_SECONDS, average * SLOW_FACTOR)
+            )
+            if not success or slow:
+                group.rounds += 1
+                self.demoted += 1
+            self._push(group)
+
+    def close(self, leg=None):
+        """중단: 남은 주문은 시작하지 않음 (leg 는 받았지만 시작하지 않은 주문)"""
+        with self.lock:
+            self.closed = True
+            self.heap = []
+            if leg is not None:
+                self.in_flight -= 1
+
+    @property
+    def exhausted(self):
+        """더 받을 주문이 없음 (중단됐거나 큐가 비고 제출 중인 주문도 없음)"""
+        with self.lock:
+            return self.closed or (not self.heap and self.in_flight == 0)
+
+    def expected_order(self):
+        """예상 제출 순서 (사전 서명 look-ahead 용: 토픽 안 순번, 우선순위 순)"""
+        with self.lock:
+            entries = sorted(self.heap)
+        order = []
+        for _, _, _, group in entries:
+            for position, leg in enumerate(group.legs[group.next:]):
+                order.append((position, len(order), leg))
+        return [leg for _, _, leg in sorted(order, key=lambda item: item[:2])]
+
+    def dropped_topics(self):
+        return len({str(leg.topic_id) for leg in self.dropped})
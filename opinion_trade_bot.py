@@ -4,19 +4,139 @@ Opinion Trade 자동 거래 봇 (Python GUI 버전)
 """
 
 import os
+import queue
 import threading
 import time
-import requests
 from tkinter import *
 from tkinter import ttk, scrolledtext, messagebox
-from dotenv import load_dotenv
-from opinion_clob_sdk import Client
-from opinion_clob_sdk.chain.py_order_utils.model.order import PlaceOrderDataInput
-from opinion_clob_sdk.chain.py_order_utils.model.sides import OrderSide
-from opinion_clob_sdk.chain.py_order_utils.model.order_type import LIMIT_ORDER
+from opinion_core import TradingCore, create_env_file_logger, format_topic
+from opinion_models import TopicSearch
+from opinion_plan import WEIGHTINGS
+from opinion_schedule import PRIORITY_KEYS, format_priority, parse_priority
+
+LOG_COLORS = {
+    "INFO": "black",
+    "SUCCESS": "green",
+    "ERROR": "red",
+    "WARNING": "orange"
+}
+
+
+class VirtualTopicList(Frame):
+    """보이는 줄만 그리는 토픽 목록 (Canvas + Scrollbar)
+
+    선택은 토픽 키로 저장하므로 검색 / 새로고침 후에도 유지된다.
+    클릭: 선택 토글, Shift+클릭: 마지막으로 클릭한 줄부터 범위 선택
+    """
+
+    def __init__(self, master, on_select=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.on_select = on_select
+
+        self.rows = []
+        self.selected = set()
+        self.anchor = None
+        self.top = 0
+
+        self.font = 'TkDefaultFont'
+        self.row_height = int(self.tk.call('font', 'metrics', self.font, '-linespace')) + 4
+
+        self.scrollbar = Scrollbar(self, command=self.yview)
+        self.scrollbar.pack(side=RIGHT, fill=Y)
+
+        self.canvas = Canvas(self, background='white', highlightthickness=0)
+        self.canvas.pack(side=LEFT, fill=BOTH, expand=True)
+
+        self.canvas.bind('<Configure>', lambda event: self.redraw())
+        self.canvas.bind('<Button-1>', self.on_click)
+        self.canvas.bind('<Shift-Button-1>', lambda event: self.on_click(event, extend=True))
+        self.canvas.bind('<MouseWheel>', lambda event: self.scroll(-1 if event.delta > 0 else 1, 'units'))
+        self.canvas.bind('<Button-4>', lambda event: self.scroll(-1, 'units'))
+        self.canvas.bind('<Button-5>', lambda event: self.scroll(1, 'units'))
+
+    def visible_count(self):
+        return max(1, self.canvas.winfo_height() // self.row_height)
+
+    def set_rows(self, rows, keep_scroll=False):
+        """표시할 토픽 목록 교체 (선택은 유지, keep_scroll=False 면 맨 위로)"""
+        self.rows = rows
+        if not keep_scroll:
+            self.top = 0
+        self.anchor = None
+        self.redraw()
+
+    def append_rows(self, rows):
+        """목록 끝에 토픽 추가 (스크롤 위치 유지)"""
+        if rows:
+            self.rows.extend(rows)
+            self.redraw()
+
+    def redraw(self):
+        """현재 스크롤 위치에서 보이는 줄만 다시 그림"""
+        canvas = self.canvas
+        canvas.delete('all')
+
+        count = self.visible_count()
+        self.top = max(0, min(self.top, len(self.rows) - count))
+        width = canvas.winfo_width()
+
+        for offset, topic in enumerate(self.rows[self.top:self.top + count + 1]):
+            y = offset * self.row_height
+            if topic.key in self.selected:
+                canvas.create_rectangle(0, y, width, y + self.row_height, fill='#cce4ff', outline='')
+            canvas.create_text(4, y + self.row_height // 2, text=format_topic(topic), anchor=W, font=self.font)
+
+        if self.rows:
+            total = len(self.rows)
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + count) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def yview(self, *args):
+        """스크롤바 명령 (moveto / scroll)"""
+        if args[0] == 'moveto':
+            self.top = int(float(args[1]) * len(self.rows))
+            self.redraw()
+        elif args[0] == 'scroll':
+            self.scroll(int(args[1]), args[2])
+
+    def scroll(self, amount, what):
+        step = self.visible_count() if what == 'pages' else 3
+        self.top += amount * step
+        self.redraw()
+
+    def on_click(self, event, extend=False):
+        idx = self.top + event.y // self.row_height
+        if idx >= len(self.rows):
+            return
+
+        if extend and self.anchor is not None and self.anchor < len(self.rows):
+            start, end = sorted((self.anchor, idx))
+            self.selected.update(topic.key for topic in self.rows[start:end + 1])
+        else:
+            key = self.rows[idx].key
+            if key in self.selected:
+                self.selected.discard(key)
+            else:
+                self.selected.add(key)
+            self.anchor = idx
+
+        self.changed()
+
+    def select_all(self):
+        """표시 중인 토픽 전체 선택"""
+        self.selected.update(topic.key for topic in self.rows)
+        self.changed()
+
+    def clear_selection(self):
+        self.selected.clear()
+        self.changed()
+
+    def changed(self):
+        self.redraw()
+        if self.on_select:
+            self.on_select()
 
-# 환경변수 로드
-load_dotenv()
 
 class OpinionTradeBot:
     def __init__(self, root):
@@ -24,20 +144,46 @@ class OpinionTradeBot:
         self.root.title("Opinion Trade Bot")
         self.root.geometry("1000x700")
 
-        # 설정
-        self.api_key = os.getenv('API_KEY', '')
-        self.rpc_url = os.getenv('RPC_URL', 'https://bsc-dataseed.binance.org')
-        self.private_key = os.getenv('PRIVATE_KEY', '')
-        self.signer_address = os.getenv('SIGNER_ADDRESS', '')
-        self.maker_address = os.getenv('MAKER_ADDRESS', '')
-        self.order_amount = float(os.getenv('ORDER_AMOUNT', '5.0'))
+        # 로그 파이프라인 설정
+        self.ui_queue = queue.SimpleQueue()
+        self.log_line_count = 0
+        self.file_logger = None
+        self.file_listener = None
+
+        # 코어 (설정, 토픽 로드, 주문 실행)
+        self.core = TradingCore(log=self.log)
+
+        self.log_max_lines = int(os.getenv('LOG_MAX_LINES', '5000'))
+        self.log_flush_ms = int(os.getenv('LOG_FLUSH_MS', '100'))
+        self.log_batch = int(os.getenv('LOG_BATCH', '1000'))
+        self.stats_refresh_ms = int(os.getenv('STATS_REFRESH_MS', '1000'))
+        self.file_logger, self.file_listener = create_env_file_logger()
 
-        self.client = None
         self.topics = []
-        self.selected_topics = []
+        self.topic_search = TopicSearch()
+        self.search_job = None
+        self.search_delay_ms = int(os.getenv('SEARCH_DELAY_MS', '150'))
+        self.loading = False
+        self.client_ready = False  # 백그라운드 초기화가 끝났는지 (core.client 는 초기화 도중에 생김)
+        self.watched_keys = None  # 실시간 호가를 갱신 중인 선택
+
+        # 거래 예약 큐 (로딩 중에도 먼저 도착한 토픽부터 거래)
+        self.trade_queue = queue.Queue()
+        self.trade_thread = None
 
         self.create_widgets()
 
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after(self.log_flush_ms, self.process_ui_queue)
+        self.root.after(self.stats_refresh_ms, self.refresh_stats)
+
+        self.show_cached_topics()
+
+        # SDK import(수 초)를 창이 뜬 뒤 백그라운드로 미리 해 두어 Client 초기화를 빠르게
+        self.core.preload()
+        if os.getenv('AUTO_INIT', '0') == '1':
+            self.root.after(0, self.init_client)
+
     def create_widgets(self):
         # 상단 설정 패널
         config_frame = ttk.LabelFrame(self.root, text="설정", padding=10)
@@ -45,22 +191,22 @@ class OpinionTradeBot:
 
         # API Key
         ttk.Label(config_frame, text="API Key:").grid(row=0, column=0, sticky=W, padx=5, pady=2)
-        self.api_key_var = StringVar(value=self.api_key[:20] + "...")
+        self.api_key_var = StringVar(value=self.core.api_key[:20] + "...")
         ttk.Entry(config_frame, textvariable=self.api_key_var, width=40, state='readonly').grid(row=0, column=1, padx=5, pady=2)
 
         # Signer
         ttk.Label(config_frame, text="Signer:").grid(row=1, column=0, sticky=W, padx=5, pady=2)
-        self.signer_var = StringVar(value=self.signer_address)
+        self.signer_var = StringVar(value=self.core.signer_address)
         ttk.Entry(config_frame, textvariable=self.signer_var, width=50, state='readonly').grid(row=1, column=1, padx=5, pady=2)
 
         # Maker
         ttk.Label(config_frame, text="Maker:").grid(row=2, column=0, sticky=W, padx=5, pady=2)
-        self.maker_var = StringVar(value=self.maker_address)
+        self.maker_var = StringVar(value=self.core.maker_address)
         ttk.Entry(config_frame, textvariable=self.maker_var, width=50, state='readonly').grid(row=2, column=1, padx=5, pady=2)
 
         # 주문 금액
         ttk.Label(config_frame, text="주문 금액:").grid(row=3, column=0, sticky=W, padx=5, pady=2)
-        self.amount_var = DoubleVar(value=self.order_amount)
+        self.amount_var = DoubleVar(value=self.core.order_amount)
         amount_entry = ttk.Entry(config_frame, textvariable=self.amount_var, width=20)
         amount_entry.grid(row=3, column=1, sticky=W, padx=5, pady=2)
         ttk.Label(config_frame, text="USDT").grid(row=3, column=2, sticky=W, padx=5, pady=2)
@@ -80,6 +226,39 @@ class OpinionTradeBot:
         type_combo.grid(row=5, column=1, sticky=W, padx=5, pady=2)
         ttk.Label(config_frame, text="(REGULAR=일반, INDICATOR=지표)").grid(row=5, column=2, sticky=W, padx=5, pady=2)
 
+        # 주문 속도 제한
+        ttk.Label(config_frame, text="초당 주문 한도:").grid(row=6, column=0, sticky=W, padx=5, pady=2)
+        self.rate_var = DoubleVar(value=self.core.order_rate)
+        ttk.Entry(config_frame, textvariable=self.rate_var, width=20).grid(row=6, column=1, sticky=W, padx=5, pady=2)
+        ttk.Label(config_frame, text="건/초 (0 = 제한 없음)").grid(row=6, column=2, sticky=W, padx=5, pady=2)
+
+        # 동시 주문 작업자 수
+        ttk.Label(config_frame, text="동시 주문 작업자:").grid(row=7, column=0, sticky=W, padx=5, pady=2)
+        self.workers_var = IntVar(value=self.core.order_workers)
+        ttk.Entry(config_frame, textvariable=self.workers_var, width=20).grid(row=7, column=1, sticky=W, padx=5, pady=2)
+        ttk.Label(config_frame, text="개").grid(row=7, column=2, sticky=W, padx=5, pady=2)
+
+        # 총 예산 / 배분 방식
+        ttk.Label(config_frame, text="총 예산:").grid(row=8, column=0, sticky=W, padx=5, pady=2)
+        self.budget_var = DoubleVar(value=self.core.order_budget)
+        ttk.Entry(config_frame, textvariable=self.budget_var, width=20).grid(row=8, column=1, sticky=W, padx=5, pady=2)
+        ttk.Label(config_frame, text="USDT (0 = 주문마다 주문 금액)").grid(row=8, column=2, sticky=W, padx=5, pady=2)
+
+        ttk.Label(config_frame, text="배분 방식:").grid(row=9, column=0, sticky=W, padx=5, pady=2)
+        self.weighting_var = StringVar(value=self.core.order_weighting)
+        weighting_combo = ttk.Combobox(config_frame, textvariable=self.weighting_var, width=18, state='readonly')
+        weighting_combo['values'] = WEIGHTINGS
+        weighting_combo.grid(row=9, column=1, sticky=W, padx=5, pady=2)
+        ttk.Label(config_frame, text="(equal=균등, price=가격 비례, odds=1/가격 비례)").grid(row=9, column=2, sticky=W, padx=5, pady=2)
+
+        # 주문 우선순위 (비우면 선택 순서)
+        ttk.Label(config_frame, text="우선순위:").grid(row=10, column=0, sticky=W, padx=5, pady=2)
+        priority = self.core.order_priority
+        self.priority_var = StringVar(value=format_priority(priority) if priority else '')
+        ttk.Entry(config_frame, textvariable=self.priority_var, width=20).grid(row=10, column=1, sticky=W, padx=5, pady=2)
+        ttk.Label(config_frame, text=f"({', '.join(PRIORITY_KEYS)}, 쉼표 구분, '-'는 반대 순서, 비우면 선택 순서)").grid(
+            row=10, column=2, sticky=W, padx=5, pady=2)
+
         # 버튼 프레임
         button_frame = Frame(self.root)
         button_frame.pack(fill=X, padx=10, pady=5)
@@ -90,9 +269,18 @@ class OpinionTradeBot:
         self.load_btn = ttk.Button(button_frame, text="토픽 로드", command=self.load_topics, state=DISABLED)
         self.load_btn.pack(side=LEFT, padx=5)
 
+        self.new_btn = ttk.Button(button_frame, text="새 토픽만", command=self.discover_topics, state=DISABLED)
+        self.new_btn.pack(side=LEFT, padx=5)
+
         self.trade_btn = ttk.Button(button_frame, text="선택한 토픽 거래", command=self.execute_trading, state=DISABLED)
         self.trade_btn.pack(side=LEFT, padx=5)
 
+        ttk.Button(button_frame, text="주문 계획", command=self.preview_plan).pack(side=LEFT, padx=5)
+
+        ttk.Button(button_frame, text="중지", command=self.stop_running).pack(side=LEFT, padx=5)
+
+        ttk.Button(button_frame, text="이어서 실행", command=self.resume_trading).pack(side=LEFT, padx=5)
+
         ttk.Button(button_frame, text="로그 지우기", command=self.clear_log).pack(side=RIGHT, padx=5)
 
         # 중간 패널 - 토픽 리스트와 로그
@@ -103,18 +291,25 @@ class OpinionTradeBot:
         topic_frame = ttk.LabelFrame(main_frame, text="토픽 목록", padding=10)
         main_frame.add(topic_frame, weight=1)
 
-        # 토픽 리스트박스 (스크롤바 포함)
-        topic_scroll_frame = Frame(topic_frame)
-        topic_scroll_frame.pack(fill=BOTH, expand=True)
+        # 검색 (제목 / topicId / 타입, 입력 후 잠시 멈추면 필터)
+        search_frame = Frame(topic_frame)
+        search_frame.pack(fill=X, pady=(0, 5))
+        ttk.Label(search_frame, text="검색:").pack(side=LEFT)
+        self.search_var = StringVar()
+        ttk.Entry(search_frame, textvariable=self.search_var).pack(side=LEFT, fill=X, expand=True, padx=5)
+        self.search_var.trace_add('write', lambda *args: self.schedule_search())
 
-        topic_scrollbar = Scrollbar(topic_scroll_frame)
-        topic_scrollbar.pack(side=RIGHT, fill=Y)
+        # 토픽 리스트 (보이는 줄만 렌더링)
+        self.topic_list = VirtualTopicList(topic_frame, on_select=self.on_topic_select)
+        self.topic_list.pack(fill=BOTH, expand=True)
 
-        self.topic_listbox = Listbox(topic_scroll_frame, selectmode=MULTIPLE, yscrollcommand=topic_scrollbar.set)
-        self.topic_listbox.pack(side=LEFT, fill=BOTH, expand=True)
-        topic_scrollbar.config(command=self.topic_listbox.yview)
+        self.topic_count_var = StringVar(value="선택 0 / 표시 0 / 전체 0")
+        ttk.Label(topic_frame, textvariable=self.topic_count_var).pack(fill=X, pady=(5, 0))
 
-        ttk.Button(topic_frame, text="전체 선택", command=self.select_all_topics).pack(fill=X, pady=5)
+        select_frame = Frame(topic_frame)
+        select_frame.pack(fill=X, pady=5)
+        ttk.Button(select_frame, text="전체 선택", command=self.select_all_topics).pack(side=LEFT, fill=X, expand=True)
+        ttk.Button(select_frame, text="선택 해제", command=self.topic_list.clear_selection).pack(side=LEFT, fill=X, expand=True)
 
         # 오른쪽 - 로그
         log_frame = ttk.LabelFrame(main_frame, text="로그", padding=10)
@@ -122,421 +317,572 @@ class OpinionTradeBot:
 
         self.log_text = scrolledtext.ScrolledText(log_frame, wrap=WORD, width=60, height=30)
         self.log_text.pack(fill=BOTH, expand=True)
-
-        # 상태바
+        for level, color in LOG_COLORS.items():
+            self.log_text.tag_config(level, foreground=color)
+
+        # 지표 요약 (요청 / 주문 단계 / UI 지연, 에러 코드)
+        stats_frame = ttk.LabelFrame(log_frame, text="통계", padding=5)
+        stats_frame.pack(fill=X, pady=(5, 0))
+        self.stats_var = StringVar(value="아직 기록 없음")
+        ttk.Label(stats_frame, textvariable=self.stats_var, justify=LEFT, font='TkFixedFont').pack(fill=X)
+
+        # 주문 관리 (추적 중인 주문 요약, 일괄 취소 / 오래된 주문 재주문)
+        orders_frame = ttk.LabelFrame(log_frame, text="주문 관리", padding=5)
+        orders_frame.pack(fill=X, pady=(5, 0))
+        self.orders_var = StringVar(value="추적 중인 주문 없음")
+        ttk.Label(orders_frame, textvariable=self.orders_var).pack(fill=X)
+
+        orders_buttons = Frame(orders_frame)
+        orders_buttons.pack(fill=X, pady=(5, 0))
+        ttk.Button(orders_buttons, text="동기화", command=self.sync_orders).pack(side=LEFT, padx=(0, 5))
+        ttk.Button(orders_buttons, text="미체결 전체 취소", command=self.cancel_open_orders).pack(side=LEFT, padx=5)
+        ttk.Button(orders_buttons, text="오래된 주문 재주문", command=self.replace_stale_orders).pack(side=RIGHT, padx=(5, 0))
+        ttk.Label(orders_buttons, text="분 이상").pack(side=RIGHT)
+        self.stale_var = DoubleVar(value=self.core.order_stale_minutes)
+        ttk.Entry(orders_buttons, textvariable=self.stale_var, width=6).pack(side=RIGHT, padx=5)
+
+        # 상태바 (Client 초기화 진행 표시 포함)
+        status_frame = Frame(self.root)
+        status_frame.pack(fill=X, side=BOTTOM, padx=10, pady=5)
         self.status_var = StringVar(value="대기 중...")
-        status_bar = ttk.Label(self.root, textvariable=self.status_var, relief=SUNKEN, anchor=W)
-        status_bar.pack(fill=X, side=BOTTOM, padx=10, pady=5)
+        status_bar = ttk.Label(status_frame, textvariable=self.status_var, relief=SUNKEN, anchor=W)
+        status_bar.pack(fill=X, side=LEFT, expand=True)
+        self.init_progress = ttk.Progressbar(status_frame, length=160, mode='determinate')
+        self.init_progress.pack(side=RIGHT, padx=(5, 0))
 
     def log(self, message, level="INFO"):
-        """로그 출력"""
-        timestamp = time.strftime("%H:%M:%S")
-        colors = {
-            "INFO": "black",
-            "SUCCESS": "green",
-            "ERROR": "red",
-            "WARNING": "orange"
-        }
-
-        self.log_text.insert(END, f"[{timestamp}] {message}\n")
-
-        # 마지막 줄 색상 변경
-        line_start = self.log_text.index("end-2c linestart")
-        line_end = self.log_text.index("end-1c")
-        self.log_text.tag_add(level, line_start, line_end)
-        self.log_text.tag_config(level, foreground=colors.get(level, "black"))
+        """로그 출력 (어느 스레드에서든 호출 가능, 큐에 넣기만 함)"""
+        self.ui_queue.put(('log', time.time(), level, message))
+
+        if self.file_logger:
+            self.file_logger.info(message, extra={'bot_level': level})
+
+    def update_status(self, message):
+        """상태바 업데이트"""
+        self.ui_queue.put(('status', message))
+
+    def run_on_ui(self, func, *args, **kwargs):
+        """Tk 메인 스레드에서 실행할 작업 예약"""
+        self.ui_queue.put(('call', func, args, kwargs))
+
+    def process_ui_queue(self):
+        """UI 큐를 묶음 단위로 처리 (after 타이머, 메인 스레드)"""
+        chunks = []
+        status = None
+        started = time.perf_counter()
+        processed = 0
+
+        try:
+            for _ in range(self.log_batch):
+                try:
+                    record = self.ui_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                processed += 1
+
+                kind = record[0]
+                if kind == 'log':
+                    _, created, level, message = record
+                    timestamp = time.strftime("%H:%M:%S", time.localtime(created))
+                    chunks.extend((f"[{timestamp}] {message}\n", level))
+                    self.log_line_count += message.count("\n") + 1
+                elif kind == 'status':
+                    status = record[1]
+                else:
+                    # 작업 전에 쌓인 로그를 먼저 출력해 순서 유지
+                    self.flush_log_chunks(chunks)
+                    chunks = []
+                    _, func, args, kwargs = record
+                    func(*args, **kwargs)
+
+            self.flush_log_chunks(chunks)
+
+            if status is not None:
+                self.status_var.set(status)
+        finally:
+            if processed:
+                self.core.metrics.observe('opinion_ui_refresh_seconds', time.perf_counter() - started)
+            self.root.after(self.log_flush_ms, self.process_ui_queue)
+
+    def refresh_stats(self):
+        """통계 패널 갱신 (after 타이머)"""
+        try:
+            lines = self.core.metrics.summary()
+            if lines:
+                self.stats_var.set("\n".join(lines))
+            if self.core.order_tracker:
+                self.orders_var.set(self.core.order_tracker.summary_line())
+        finally:
+            self.root.after(self.stats_refresh_ms, self.refresh_stats)
+
+    def flush_log_chunks(self, chunks):
+        """로그 묶음 삽입 + 최대 줄 수 초과분 삭제 (링 버퍼)"""
+        if not chunks:
+            return
+
+        self.log_text.insert(END, *chunks)
+
+        excess = self.log_line_count - self.log_max_lines
+        if excess > 0:
+            self.log_text.delete("1.0", f"{excess + 1}.0")
+            self.log_line_count -= excess
 
         self.log_text.see(END)
-        self.root.update()
 
     def clear_log(self):
         """로그 지우기"""
         self.log_text.delete(1.0, END)
+        self.log_line_count = 0
 
-    def update_status(self, message):
-        """상태바 업데이트"""
-        self.status_var.set(message)
-        self.root.update()
+    def on_close(self):
+        """창 닫기 (진행 중인 작업 중단, 파일 로그 마무리)"""
+        self.core.close()
+        if self.file_listener:
+            self.file_listener.stop()
+        self.root.destroy()
 
     def init_client(self):
-        """Client 초기화"""
-        try:
-            self.update_status("Client 초기화 중...")
-            self.log("=" * 60, "INFO")
-            self.log("Opinion Trade Client 초기화", "INFO")
-            self.log("=" * 60, "INFO")
-
-            if not self.private_key:
-                messagebox.showerror("오류", "PRIVATE_KEY가 설정되지 않았습니다.\n.env 파일을 확인하세요.")
-                return
-
-            self.order_amount = self.amount_var.get()
-
-            self.log(f"API Key: {self.api_key[:8]}...", "INFO")
-            self.log(f"Signer: {self.signer_address}", "INFO")
-            self.log(f"Maker: {self.maker_address}", "INFO")
-            self.log(f"주문 금액: {self.order_amount} USDT", "INFO")
-
-            self.client = Client(
-                host='https://proxy.opinion.trade:8443',
-                apikey=self.api_key,
-                chain_id=56,
-                rpc_url=self.rpc_url,
-                private_key=self.private_key,
-                multi_sig_addr=self.maker_address,
-                conditional_tokens_addr='0xAD1a38cEc043e70E83a3eC30443dB285ED10D774',
-                multisend_addr='0x998739BFdAAdde7C933B942a68053933098f9EDa'
-            )
-
-            self.log("✅ Client 초기화 완료", "SUCCESS")
-            self.update_status("Client 초기화 완료")
-
-            self.init_btn.config(state=DISABLED)
-            self.load_btn.config(state=NORMAL)
+        """Client 초기화 (백그라운드 스레드, 단계별 진행 표시)"""
+        # WALLETS_FILE 만 있어도 됨 (지갑 키는 core.init_client 가 읽음, CLI 와 같은 조건)
+        if not self.core.private_key and not self.core.wallets_file:
+            messagebox.showerror("오류", "PRIVATE_KEY 또는 WALLETS_FILE이 설정되지 않았습니다.\n.env 파일을 확인하세요.")
+            return
 
-        except Exception as e:
-            self.log(f"❌ Client 초기화 실패: {e}", "ERROR")
+        self.update_status("Client 초기화 중...")
+        self.log("=" * 60, "INFO")
+        self.log("Opinion Trade Client 초기화", "INFO")
+        self.log("=" * 60, "INFO")
+
+        self.core.order_amount = self.amount_var.get()
+
+        self.log(f"API Key: {self.core.api_key[:8]}...", "INFO")
+        if self.core.private_key:
+            self.log(f"Signer: {self.core.signer_address}", "INFO")
+            self.log(f"Maker: {self.core.maker_address}", "INFO")
+        else:
+            self.log(f"지갑 파일: {self.core.wallets_file}", "INFO")
+        self.log(f"주문 금액: {self.core.order_amount} USDT", "INFO")
+
+        self.init_btn.config(state=DISABLED)
+        self.init_progress.config(value=0)
+        future = self.core.start_init(progress=self.show_init_progress)
+        future.add_done_callback(lambda done: self.run_on_ui(self.finish_init, done))
+
+    def show_init_progress(self, phase, done, total):
+        """초기화 단계 진행 (초기화 스레드에서 호출)"""
+        def update():
+            self.init_progress.config(maximum=total, value=done)
+            if done < total:
+                self.status_var.set(f"Client 초기화 중... {phase} ({done + 1}/{total})")
+
+        self.run_on_ui(update)
+
+    def finish_init(self, future):
+        """초기화 완료 / 실패 처리 (Tk 메인 스레드)"""
+        error = future.exception()
+        if error:
+            self.log(f"❌ Client 초기화 실패: {error}", "ERROR")
             self.update_status("초기화 실패")
-            messagebox.showerror("초기화 실패", str(e))
+            self.init_progress.config(value=0)
+            self.init_btn.config(state=NORMAL)
+            messagebox.showerror("초기화 실패", str(error))
+            return
 
-    def load_topics(self):
-        """토픽 로드 (일반 + 지표 토픽)"""
-        def load():
-            try:
-                target_limit = self.limit_var.get()
-                if target_limit < 1:
-                    messagebox.showwarning("경고", "토픽 개수는 1개 이상으로 설정하세요.")
-                    return
+        self.client_ready = True
+        self.watched_keys = None
+        self.watch_selected_prices()
 
-                topic_type_filter = self.topic_type_var.get()
+        report = self.core.startup_report
+        self.log("✅ Client 초기화 완료", "SUCCESS")
+        self.update_status(f"Client 초기화 완료 ({report.lines()[-1]})" if report else "Client 초기화 완료")
+        self.core.unfinished_notice()
 
-                self.update_status("토픽 로딩 중...")
-                self.log(f"🔎 토픽 로딩 시작 (목표: {target_limit}개, 타입: {topic_type_filter})", "INFO")
-
-                all_topics = []
-
-                # 1. 일반 토픽 로드 (/api/v2/topic)
-                if topic_type_filter in ['ALL', 'REGULAR']:
-                    self.log("📋 일반 토픽 로딩 중...", "INFO")
-                    regular_topics = self.load_regular_topics(target_limit)
-                    for topic in regular_topics:
-                        topic['_type'] = 'REGULAR'
-                    all_topics.extend(regular_topics)
-                    self.log(f"   ✅ 일반 토픽: {len(regular_topics)}개", "SUCCESS")
-
-                # 2. 지표 토픽 로드 (/api/v2/indicator)
-                if topic_type_filter in ['ALL', 'INDICATOR']:
-                    self.log("📊 지표 토픽 로딩 중...", "INFO")
-                    indicator_topics = self.load_indicator_topics(target_limit)
-                    for topic in indicator_topics:
-                        topic['_type'] = 'INDICATOR'
-                    all_topics.extend(indicator_topics)
-                    self.log(f"   ✅ 지표 토픽: {len(indicator_topics)}개", "SUCCESS")
-
-                # 목표 개수만큼만 저장
-                self.topics = all_topics[:target_limit]
-                self.log(f"✅ 총 {len(self.topics)}개 토픽 로드 완료", "SUCCESS")
-
-                # 리스트박스에 추가
-                self.topic_listbox.delete(0, END)
-                for idx, topic in enumerate(self.topics):
-                    # 토픽 타입 표시
-                    topic_type = topic.get('_type', 'UNKNOWN')
-                    type_label = f"[{topic_type[0]}]"  # [R] 또는 [I]
-
-                    # 제목 추출
-                    title = topic.get('title', 'Unknown')
-                    topic_id = topic.get('topicId', 'N/A')
-
-                    if not title or title == 'Unknown':
-                        title = "No Title"
-
-                    # 제목 길이 제한
-                    if len(title) > 65:
-                        title = title[:65] + "..."
-
-                    display_text = f"{type_label} [{topic_id}] {title}"
-                    self.topic_listbox.insert(END, display_text)
-
-                self.update_status(f"{len(self.topics)}개 토픽 로드 완료")
-                self.trade_btn.config(state=NORMAL)
+        self.load_btn.config(state=NORMAL)
+        self.new_btn.config(state=NORMAL)
+        if self.topics:
+            self.trade_btn.config(state=NORMAL)
 
-            except Exception as e:
-                self.log(f"❌ 토픽 로딩 실패: {e}", "ERROR")
-                import traceback
-                self.log(traceback.format_exc(), "ERROR")
-                self.update_status("토픽 로딩 실패")
-                messagebox.showerror("로딩 실패", str(e))
-
-        threading.Thread(target=load, daemon=True).start()
+    def show_cached_topics(self):
+        """시작 시 캐시된 토픽을 즉시 표시하고 오래됐으면 백그라운드 갱신"""
+        cache = self.core.topic_cache
+        if not cache:
+            return
 
-    def load_regular_topics(self, limit):
-        """일반 토픽 로드 (/api/v2/topic)"""
-        all_topics = []
-        page = 1
-        per_page = 20
-
-        while len(all_topics) < limit:
-            url = "https://proxy.opinion.trade:8443/api/bsc/api/v2/topic"
-            params = {
-                "page": page,
-                "limit": per_page,
-                "sortBy": "1",
-                "chainId": "56",
-                "status": "2",  # ACTIVATED
-                "isShow": "1",
-                "topicType": "2",
-                "indicatorType": "2"
-            }
-
-            headers = {
-                "accept": "application/json",
-                "apikey": self.api_key
-            }
-
-            response = requests.get(url, params=params, headers=headers)
-
-            if response.status_code != 200:
-                break
+        topics = cache.load()
+        if not topics:
+            return
 
-            data = response.json()
+        self.show_topics(topics)
+        age = int(time.time() - cache.saved_at)
+        self.log(f"💾 캐시된 토픽 {len(topics)}개 표시 ({age}초 전 저장)", "INFO")
 
-            if data.get('errno') != 0:
-                break
+        query = cache.query
+        if query.get('type') in ('ALL', 'REGULAR', 'INDICATOR'):
+            self.limit_var.set(query.get('limit', self.limit_var.get()))
+            self.topic_type_var.set(query['type'])
 
-            result = data.get('result', {})
-            topics_in_page = result.get('list', [])
+        if self.core.api_key and not cache.is_fresh(query):
+            self.start_topic_load(self.limit_var.get(), self.topic_type_var.get())
 
-            if not topics_in_page:
-                break
+    def load_topics(self):
+        """토픽 로드 (일반 + 지표 토픽)"""
+        target_limit = self.limit_var.get()
+        if target_limit < 1:
+            messagebox.showwarning("경고", "토픽 개수는 1개 이상으로 설정하세요.")
+            return
 
-            all_topics.extend(topics_in_page)
+        topic_type_filter = self.topic_type_var.get()
 
-            if len(topics_in_page) < per_page:
-                break
+        cache = self.core.topic_cache
+        if cache and cache.is_fresh({'type': topic_type_filter, 'limit': target_limit}):
+            self.log("💾 캐시된 토픽이 최신입니다 (TTL 이내) - 요청 생략", "INFO")
+            self.show_topics(cache.topics())
+            self.trade_btn.config(state=NORMAL)
+            return
 
-            page += 1
-            time.sleep(0.2)
+        self.start_topic_load(target_limit, topic_type_filter)
 
-        return all_topics[:limit]
+    def start_topic_load(self, target_limit, topic_type_filter):
+        """백그라운드 토픽 로드 시작 (페이지가 도착하는 대로 목록에 추가)"""
+        if self.loading:
+            self.log("⏳ 토픽 로딩이 이미 진행 중입니다", "WARNING")
+            return
 
-    def load_indicator_topics(self, limit):
-        """지표 토픽 로드 (/api/v2/indicator)"""
-        all_topics = []
-        page = 1
-        per_page = 20
+        self.loading = True
+        self.load_btn.config(state=DISABLED)
+        self.new_btn.config(state=DISABLED)
 
-        while len(all_topics) < limit:
-            url = "https://proxy.opinion.trade:8443/api/bsc/api/v2/indicator"
-            params = {
-                "page": page,
-                "limit": per_page,
-                "chainId": "56"
-            }
+        def load():
+            loaded = 0
 
-            headers = {
-                "accept": "application/json",
-                "apikey": self.api_key
-            }
+            def on_page(page):
+                nonlocal loaded
+                self.run_on_ui(self.append_topics, page, loaded == 0)
+                loaded += len(page)
+                self.update_status(f"토픽 로딩 중... ({loaded}개 도착)")
 
-            response = requests.get(url, params=params, headers=headers)
+            try:
+                self.update_status("토픽 로딩 중...")
 
-            if response.status_code != 200:
-                break
+                # 가상 목록은 보이는 줄만 다시 그리므로 캐시 갱신(변경된 키)도 전체 목록으로 반영
+                topics, _ = self.core.load_topics(target_limit, topic_type_filter, on_page=on_page)
+                self.run_on_ui(self.show_topics, topics)
 
-            data = response.json()
+                self.update_status(f"{len(topics)}개 토픽 로드 완료")
 
-            if data.get('errno') != 0:
-                break
+            except Exception as e:
+                self.log(f"❌ 토픽 로딩 실패: {e}", "ERROR")
+                import traceback
+                self.log(traceback.format_exc(), "ERROR")
+                self.update_status("토픽 로딩 실패")
+                self.run_on_ui(messagebox.showerror, "로딩 실패", str(e))
+            finally:
+                self.run_on_ui(self.finish_topic_load)
 
-            result = data.get('result', {})
-            indicators = result.get('list', [])
+        threading.Thread(target=load, daemon=True).start()
 
-            if not indicators:
-                break
+    def discover_topics(self):
+        """지난 탐색 이후 새로 생긴 토픽만 받아 목록 맨 앞에 추가하고 그 토픽만 선택"""
+        if self.loading:
+            self.log("⏳ 토픽 로딩이 이미 진행 중입니다", "WARNING")
+            return
+        if not self.core.seen_topics:
+            messagebox.showwarning("경고", "TOPIC_SEEN_FILE 이 비어 있어 새 토픽 탐색을 사용할 수 없습니다.")
+            return
 
-            # indicator를 토픽 형식으로 변환
-            for indicator in indicators:
-                topic_data = indicator.get('topic', {})
-                if topic_data:
-                    # indicator 제목 사용
-                    topic_data['title'] = indicator.get('title', topic_data.get('title', ''))
-                    topic_data['indicatorId'] = indicator.get('id')
-                    all_topics.append(topic_data)
+        target_limit = self.limit_var.get()
+        topic_type_filter = self.topic_type_var.get()
+        self.loading = True
+        self.load_btn.config(state=DISABLED)
+        self.new_btn.config(state=DISABLED)
 
-            if len(indicators) < per_page:
-                break
+        def load():
+            try:
+                self.update_status("새 토픽 탐색 중...")
+                topics = self.core.discover_topics(target_limit, topic_type_filter)
+                self.run_on_ui(self.select_new_topics, topics)
+                self.update_status(f"새 토픽 {len(topics)}개")
+            except Exception as e:
+                self.log(f"❌ 새 토픽 탐색 실패: {e}", "ERROR")
+                self.update_status("새 토픽 탐색 실패")
+                self.run_on_ui(messagebox.showerror, "탐색 실패", str(e))
+            finally:
+                self.run_on_ui(self.finish_topic_load)
 
-            page += 1
-            time.sleep(0.2)
+        threading.Thread(target=load, daemon=True).start()
 
-        return all_topics[:limit]
+    def select_new_topics(self, topics):
+        """새 토픽을 목록 맨 앞에 두고 새 토픽만 선택 (메인 스레드)"""
+        keys = {topic.key for topic in topics}
+        self.topic_list.selected.clear()
+        self.topic_list.selected.update(keys)
+        self.show_topics(topics + [topic for topic in self.topics if topic.key not in keys])
+        if topics and self.client_ready:
+            self.trade_btn.config(state=NORMAL)
+
+    def finish_topic_load(self):
+        self.loading = False
+        if self.client_ready:
+            self.load_btn.config(state=NORMAL)
+            self.new_btn.config(state=NORMAL)
+
+    def append_topics(self, page, first):
+        """도착한 토픽 페이지를 목록에 추가 (첫 페이지면 이전 목록 교체, 선택은 유지)"""
+        if first:
+            self.topics = list(page)
+            self.topic_search.reset(self.topics)
+            self.topic_list.set_rows(self.topic_search.search(self.search_var.get()), keep_scroll=True)
+        else:
+            self.topics.extend(page)
+            self.topic_list.append_rows(self.topic_search.extend(page))
+
+        self.update_topic_count()
+        if self.client_ready:
+            self.trade_btn.config(state=NORMAL)
+
+    def show_topics(self, topics):
+        """토픽 목록 표시 (메인 스레드, 선택은 토픽 키로 유지)"""
+        self.topics = topics
+        self.topic_search.reset(topics)
+
+        # 사라진 토픽은 선택에서 제외
+        keys = {topic.key for topic in topics}
+        self.topic_list.selected.intersection_update(keys)
+        self.watched_keys = None
+        self.watch_selected_prices()
+
+        self.apply_search(keep_scroll=True)
+
+    def schedule_search(self):
+        """검색어 입력 후 search_delay_ms 동안 추가 입력이 없으면 필터"""
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(self.search_delay_ms, self.apply_search)
+
+    def apply_search(self, keep_scroll=False):
+        """현재 검색어로 목록 필터"""
+        self.search_job = None
+        self.topic_list.set_rows(self.topic_search.search(self.search_var.get()), keep_scroll=keep_scroll)
+        self.update_topic_count()
+
+    def selected_topics(self):
+        selected_keys = self.topic_list.selected
+        return [topic for topic in self.topics if topic.key in selected_keys]
+
+    def on_topic_select(self):
+        self.update_topic_count()
+        self.watch_selected_prices()
+
+    def watch_selected_prices(self):
+        """선택이 바뀌었으면 선택한 토픽의 실시간 호가 갱신 대상 교체"""
+        selected = frozenset(self.topic_list.selected)
+        if selected != self.watched_keys:
+            self.watched_keys = selected
+            self.core.watch_prices(self.selected_topics())
+
+    def update_topic_count(self):
+        self.topic_count_var.set(
+            f"선택 {len(self.topic_list.selected)} / 표시 {len(self.topic_list.rows)} / 전체 {len(self.topics)}"
+        )
 
     def select_all_topics(self):
-        """전체 토픽 선택"""
-        self.topic_listbox.select_set(0, END)
+        """검색 결과 전체 선택"""
+        self.topic_list.select_all()
+
+    def make_plan(self, selected_topics):
+        """현재 설정으로 주문 계획 (메인 스레드, 1만 건도 수 ms)"""
+        return self.core.plan_orders(
+            selected_topics,
+            order_amount=self.amount_var.get(),
+            budget=self.budget_var.get(),
+            weighting=self.weighting_var.get()
+        )
+
+    def preview_plan(self):
+        """거래 전에 주문 계획 미리보기"""
+        selected_topics = self.selected_topics()
+        if not selected_topics:
+            messagebox.showwarning("경고", "거래할 토픽을 선택하세요.")
+            return
+
+        plan = self.make_plan(selected_topics)
+        rows = plan.preview_rows(15)
+        more = len(plan.legs) - len(rows)
+        messagebox.showinfo(
+            "주문 계획",
+            "\n".join(plan.summary_lines()) + "\n\n" + "\n".join(rows)
+            + (f"\n... 외 {more}건" if more > 0 else '')
+        )
 
     def execute_trading(self):
         """거래 실행 (JavaScript 방식과 동일)"""
-        selected_indices = self.topic_listbox.curselection()
+        selected_topics = self.selected_topics()
 
-        if not selected_indices:
+        if not selected_topics:
             messagebox.showwarning("경고", "거래할 토픽을 선택하세요.")
             return
 
-        selected_topics = [self.topics[i] for i in selected_indices]
+        try:
+            priority = parse_priority(self.priority_var.get())
+        except ValueError as e:
+            messagebox.showerror("오류", str(e))
+            return
 
         # ✅ 최신 Order Amount 값 읽기
         current_order_amount = self.amount_var.get()
+        order_rate = self.rate_var.get()
+        order_workers = self.workers_var.get()
+        plan = self.make_plan(selected_topics)
 
         confirm = messagebox.askyesno(
             "거래 확인",
             f"{len(selected_topics)}개 토픽에 거래를 시작하시겠습니까?\n\n"
-            f"주문 금액: {current_order_amount} USDT per order"
+            + "\n".join(plan.summary_lines()) + "\n"
+            f"속도 제한: {order_rate}건/초, 작업자 {order_workers}개\n"
+            f"우선순위: {format_priority(priority)}"
         )
 
         if not confirm:
             return
 
-        def trade():
+        # 우선순위는 거래마다 예약에 담아 넘김 (대기 중인 거래가 나중 설정을 따르지 않게)
+        self.trade_queue.put((selected_topics, current_order_amount, order_rate, order_workers, plan, None, priority))
+        self.log(f"🧾 거래 예약: {len(selected_topics)}개 토픽 (대기 {self.trade_queue.qsize()}건)", "INFO")
+        self.start_trade_worker()
+
+    def resume_trading(self):
+        """거래 저널에서 마지막으로 끝나지 않은 거래의 남은 주문 제출"""
+        if not self.client_ready:
+            messagebox.showwarning("경고", "먼저 Client를 초기화하세요.")
+            return
+
+        try:
+            run_id, plan, done, unknown = self.core.resume_plan()
+        except ValueError as e:
+            messagebox.showinfo("이어서 실행", str(e))
+            return
+
+        try:
+            priority = parse_priority(self.priority_var.get())
+        except ValueError as e:
+            messagebox.showerror("오류", str(e))
+            return
+
+        order_rate = self.rate_var.get()
+        order_workers = self.workers_var.get()
+        confirm = messagebox.askyesno(
+            "이어서 실행",
+            f"{run_id}\n\n완료 {done}건, 남은 주문 {len(plan.legs)}건\n"
+            f"확인 필요(제출 후 결과 없음, 다시 보내지 않음): {unknown}건\n\n"
+            + "\n".join(plan.summary_lines()) + "\n"
+            f"속도 제한: {order_rate}건/초, 작업자 {order_workers}개\n"
+            f"우선순위: {format_priority(priority)}"
+        )
+        if not confirm or not plan.legs:
+            return
+
+        self.trade_queue.put(([], None, order_rate, order_workers, plan, run_id, priority))
+        self.log(f"🧾 이어서 실행 예약: {run_id} 남은 주문 {len(plan.legs)}건", "INFO")
+        self.start_trade_worker()
+
+    def start_trade_worker(self):
+        if self.trade_thread is None:
+            self.trade_thread = threading.Thread(target=self.trade_worker, daemon=True)
+            self.trade_thread.start()
+
+    def stop_running(self):
+        """진행 중인 토픽 로드 / 거래 중단 + 예약된 거래 취소 (이미 제출된 주문은 그대로)"""
+        dropped = 0
+        while True:
             try:
-                self.update_status("거래 실행 중...")
-                self.trade_btn.config(state=DISABLED)
-                self.load_btn.config(state=DISABLED)
-
-                total_success = 0
-                total_fail = 0
-
-                for topic_idx, topic in enumerate(selected_topics, 1):
-                    # 딕셔너리로 접근 (JavaScript와 동일)
-                    topic_id = topic.get('topicId')
-                    title = topic.get('title', 'Unknown')
-                    child_list = topic.get('childList', [])
-
-                    # childList가 없으면 topic 자체를 사용
-                    if not child_list:
-                        child_list = [topic]
-
-                    if not topic_id:
-                        self.log(f"❌ Topic ID 없음: {title}", "ERROR")
-                        total_fail += len(child_list) * 2
-                        continue
-
-                    self.log("\n" + "=" * 60, "INFO")
-                    self.log(f"💰 거래 시작 [{topic_idx}/{len(selected_topics)}]", "INFO")
-                    self.log(f"   제목: {title}", "INFO")
-                    self.log(f"   Topic ID: {topic_id}", "INFO")
-                    self.log(f"   {len(child_list)}개 옵션 × 2 (YES/NO) = {len(child_list) * 2}개 주문", "INFO")
-                    self.log(f"   주문 금액: {current_order_amount} USDT", "INFO")
-                    self.log("=" * 60, "INFO")
-
-                    try:
-                        for child_idx, child in enumerate(child_list, 1):
-                            child_topic_id = child.get('topicId')
-                            child_title = child.get('title', '')
-                            yes_pos = child.get('yesPos', '')
-                            no_pos = child.get('noPos', '')
-                            yes_price = child.get('yesBuyPrice', '0.5')
-                            no_price = child.get('noBuyPrice', '0.5')
-
-                            self.log(f"\n[{child_idx}/{len(child_list)}] {child_title} (topicId={child_topic_id})", "INFO")
-
-                            # YES 주문
-                            if yes_pos:
-                                self.log(f"  → YES 주문 ({current_order_amount} USDT, price={yes_price})...", "INFO")
-                                success, result = self.place_order(child_topic_id, yes_pos, OrderSide.BUY, yes_price, current_order_amount)
-
-                                if success:
-                                    self.log(f"     ✅ YES 성공 (Order ID: {result})", "SUCCESS")
-                                    total_success += 1
-                                else:
-                                    self.log(f"     ❌ YES 실패: {result}", "ERROR")
-                                    total_fail += 1
-
-                                time.sleep(0.5)
-                            else:
-                                self.log("  ⚠️  YES: yesPos 없음, 스킵", "WARNING")
-                                total_fail += 1
-
-                            # NO 주문
-                            if no_pos:
-                                self.log(f"  → NO 주문 ({current_order_amount} USDT, price={no_price})...", "INFO")
-                                success, result = self.place_order(child_topic_id, no_pos, OrderSide.BUY, no_price, current_order_amount)
-
-                                if success:
-                                    self.log(f"     ✅ NO 성공 (Order ID: {result})", "SUCCESS")
-                                    total_success += 1
-                                else:
-                                    self.log(f"     ❌ NO 실패: {result}", "ERROR")
-                                    total_fail += 1
-
-                                time.sleep(0.5)
-                            else:
-                                self.log("  ⚠️  NO: noPos 없음, 스킵", "WARNING")
-                                total_fail += 1
-
-                    except Exception as e:
-                        self.log(f"❌ 거래 실행 중 에러: {e}", "ERROR")
-                        import traceback
-                        self.log(traceback.format_exc(), "ERROR")
-                        total_fail += len(child_list) * 2
-                        continue
-
-                self.log("\n" + "=" * 60, "INFO")
-                self.log(f"🏁 전체 거래 완료", "INFO")
-                self.log(f"   성공: {total_success}", "SUCCESS")
-                self.log(f"   실패: {total_fail}", "ERROR")
-                self.log("=" * 60, "INFO")
-
-                self.update_status("모든 거래 완료")
-                messagebox.showinfo("완료", f"거래 완료\n성공: {total_success}, 실패: {total_fail}")
+                self.trade_queue.get_nowait()
+            except queue.Empty:
+                break
+            dropped += 1
+
+        stopped = self.core.cancel()
+        if stopped or dropped:
+            self.log(f"⏹️  중지 요청: 진행 중 {stopped}건 중단, 예약 {dropped}건 취소", "WARNING")
+            self.update_status("중지됨")
+        else:
+            self.log("진행 중인 작업이 없습니다", "INFO")
+
+    def order_task(self, func, *args):
+        """주문 관리 작업을 백그라운드 스레드에서 실행"""
+        if not self.client_ready:
+            messagebox.showwarning("경고", "먼저 Client를 초기화하세요.")
+            return
+
+        def run():
+            try:
+                func(*args)
+            except Exception as e:
+                self.log(f"❌ 주문 관리 실패: {e}", "ERROR")
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def sync_orders(self):
+        """주문 목록 동기화"""
+        self.order_task(self.core.sync_orders)
+
+    def cancel_open_orders(self):
+        """미체결 주문 전체 취소"""
+        self.order_task(self.confirm_orders, 0, "미체결 전체 취소", self.core.cancel_orders)
+
+    def replace_stale_orders(self):
+        """오래 걸려 있는 미체결 주문을 취소하고 현재 호가로 재주문"""
+        minutes = self.stale_var.get()
+        order_rate = self.rate_var.get()
+        order_workers = self.workers_var.get()
+        self.order_task(
+            self.confirm_orders, minutes, f"{minutes:g}분 이상 주문 재주문",
+            lambda orders: self.core.replace_orders(orders, order_rate, order_workers)
+        )
+
+    def confirm_orders(self, minutes, title, action):
+        """동기화 후 대상 주문을 확인 창으로 묻고 실행 (백그라운드 스레드)"""
+        orders = self.core.stale_orders(minutes)
+        if not orders:
+            self.log(f"{title}: 대상 주문이 없습니다", "INFO")
+            return
+
+        now = time.time()
+        lines = [order.describe(now) for order in orders[:10]]
+        if len(orders) > 10:
+            lines.append(f"... 외 {len(orders) - 10}건")
+        remaining = sum(order.remaining for order in orders)
+
+        answer = queue.Queue()
+        self.run_on_ui(lambda: answer.put(messagebox.askyesno(
+            title, f"{len(orders)}건 (미체결 금액 {remaining:.2f} USDT)\n\n" + "\n".join(lines)
+        )))
+        if answer.get():
+            action(orders)
+
+    def trade_worker(self):
+        """예약된 거래를 순서대로 실행 (백그라운드 스레드)"""
+        while True:
+            selected_topics, order_amount, order_rate, order_workers, plan, run_id, priority = self.trade_queue.get()
+
+            try:
+                self.update_status(f"거래 실행 중... (대기 {self.trade_queue.qsize()}건)")
+
+                total_success, total_fail = self.core.execute(
+                    selected_topics, order_amount, rate=order_rate, workers=order_workers, plan=plan, run_id=run_id,
+                    priority=priority
+                )
+
+                if self.trade_queue.empty():
+                    self.update_status("모든 거래 완료")
+                self.run_on_ui(messagebox.showinfo, "완료", f"거래 완료\n성공: {total_success}, 실패: {total_fail}")
 
             except Exception as e:
                 self.log(f"❌ 거래 실행 실패: {e}", "ERROR")
                 import traceback
                 self.log(traceback.format_exc(), "ERROR")
-                messagebox.showerror("거래 실패", str(e))
-            finally:
-                self.trade_btn.config(state=NORMAL)
-                self.load_btn.config(state=NORMAL)
-
-        threading.Thread(target=trade, daemon=True).start()
-
-    def calculate_safe_price(self, base_price, safe_rate=0.05):
-        """SafeRate 적용"""
-        price = float(base_price) * (1 + safe_rate)
-        if price > 0.999:
-            price = 0.999
-        elif price < 0.001:
-            price = 0.001
-        return str(round(price, 3))
-
-    def place_order(self, topic_id, token_id, side, price, order_amount):
-        """주문 실행 (SDK 사용)"""
-        try:
-            # marketId는 정수형이어야 함
-            order = PlaceOrderDataInput(
-                marketId=int(topic_id),  # ✅ 정수로 변환
-                tokenId=token_id,
-                side=side,
-                orderType=LIMIT_ORDER,
-                price=price,
-                makerAmountInQuoteToken=order_amount  # ✅ 파라미터로 받은 값 사용
-            )
-
-            result = self.client.place_order(order)
-
-            if hasattr(result, 'errno'):
-                if result.errno == 0:
-                    order_id = result.result.orderData.orderId if hasattr(result.result, 'orderData') else 'N/A'
-                    return True, order_id
-                else:
-                    return False, result.errmsg
-            else:
-                return True, str(result)
+                self.run_on_ui(messagebox.showerror, "거래 실패", str(e))
 
-        except Exception as e:
-            return False, str(e)
 
 def main():
     root = Tk()
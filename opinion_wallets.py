@@ -0,0 +1,271 @@
+"""
+다중 지갑 분산 실행 (지갑마다 프로세스 1개 + 자체 Client)
+
+WALLETS_FILE 에 지갑 프로필 목록(JSON)을 두면 선택한 주문을 지갑 수만큼 나눠 동시에 제출한다.
+
+    [
+      {"name": "main", "private_key": "...", "maker_address": "0x...", "signer_address": "0x..."},
+      {"name": "sub1", "private_key_env": "SUB1_PRIVATE_KEY", "maker_address": "0x..."}
+    ]
+
+- 주문은 토픽 단위로 나눈다 (같은 토픽의 YES → NO 순서 유지, 주문 수가 많은 토픽부터 가장 한가한 지갑에)
+- 지갑 프로세스는 spawn 으로 시작해 자기 TradingCore 로 init_client → 제출하고 로그 / 결과를 큐로 보낸다
+  (Tk / 이벤트 루프 스레드가 있는 프로세스를 fork 하지 않기 위해 spawn 사용)
+- ORDER_RATE / ORDER_WORKERS / 조절기는 지갑마다 따로 적용되므로 처리량은 지갑 수에 비례해 늘어난다
+- 코디네이터의 stop 이벤트가 설정되면 모든 지갑 프로세스에 중단을 전달한다
+"""
+
+import heapq
+import json
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+
+class WalletProfile:
+    """지갑 프로필 (이름 + 주문 서명 / 조회용 자격 증명)"""
+
+    def __init__(self, name, private_key, maker_address, signer_address='', api_key=''):
+        self.name = name
+        self.private_key = private_key
+        self.maker_address = maker_address
+        self.signer_address = signer_address or maker_address
+        self.api_key = api_key
+
+    def env(self):
+        """지갑 프로세스에 덮어쓸 환경변수"""
+        env = {
+            'PRIVATE_KEY': self.private_key,
+            'MAKER_ADDRESS': self.maker_address,
+            'SIGNER_ADDRESS': self.signer_address,
+            # 지갑 프로세스는 주문 제출만 (지표 포트 / 토픽 캐시 / 새 토픽 기록 / 재분산 / 주문 동기화 /
+            # 호가 폴링 스레드 / Client 캐시 파일 / 승인 확인 RPC 사용 안 함, 호가는 제출 직전에 한 번 갱신)
+            'METRICS_PORT': '0',
+            'ORDER_SYNC_INTERVAL': '0',
+            'PRICE_POLL_INTERVAL': '0',
+            'CLIENT_CACHE_FILE': '',
+            'APPROVAL_CHECK': '0',
+            'TOPIC_CACHE_FILE': '',
+            'TOPIC_SEEN_FILE': '',
+            'WALLETS_FILE': '',
+        }
+        if self.api_key:
+            env['API_KEY'] = self.api_key
+        return env
+
+
+def load_wallets(path):
+    """지갑 파일(JSON 목록) → [WalletProfile] (형식이 틀리면 ValueError)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            entries = json.load(f)
+    except OSError as e:
+        raise ValueError(f"지갑 파일을 읽을 수 없습니다: {path} ({e})")
+    except ValueError:
+        raise ValueError(f"지갑 파일 JSON 형식 오류: {path}")
+
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"지갑 파일에는 지갑 프로필 목록이 있어야 합니다: {path}")
+
+    wallets = []
+    for idx, entry in enumerate(entries, 1):
+        name = str(entry.get('name') or f"wallet{idx}")
+        private_key = entry.get('private_key') or os.getenv(entry.get('private_key_env', ''), '')
+        maker_address = entry.get('maker_address', '')
+        if not private_key or not maker_address:
+            raise ValueError(f"지갑 {name}: private_key(또는 private_key_env) / maker_address 가 필요합니다")
+        wallets.append(WalletProfile(
+            name, private_key, maker_address,
+            signer_address=entry.get('signer_address', ''),
+            api_key=entry.get('api_key', '')
+        ))
+
+    names = [wallet.name for wallet in wallets]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"지갑 이름이 중복되었습니다: {', '.join(duplicates)}")
+    return wallets
+
+
+def shard_legs(legs, count):
+    """주문 목록 → 지갑 수만큼의 주문 목록 (토픽 단위, 각 목록 안은 원래 순서)"""
+    groups = {}
+    for leg in legs:
+        topic = str(leg.topic_id)
+        groups[topic] = groups.get(topic, 0) + 1
+
+    # 큰 토픽부터 가장 적게 받은 지갑에 (같으면 앞 지갑)
+    loads = [(0, idx) for idx in range(count)]
+    assigned = {}
+    for topic, size in sorted(groups.items(), key=lambda item: -item[1]):
+        load, idx = heapq.heappop(loads)
+        assigned[topic] = idx
+        heapq.heappush(loads, (load + size, idx))
+
+    shards = [[] for _ in range(count)]
+    for leg in legs:
+        shards[assigned[str(leg.topic_id)]].append(leg)
+    return shards
+
+
+def run_wallet(profile, legs, rate, workers, results, stop_event, run_id=None, priority=None):
+    """지갑 프로세스 본체 (로그 / 결과는 results 큐로)"""
+    os.environ.update(profile.env())
+
+    def log(message, level="INFO"):
+        results.put(('log', profile.name, message, level))
+
+    core = None
+    outcome = None
+    finished = threading.Event()
+    try:
+        from opinion_core import TradingCore
+
+        core = TradingCore(log=log)
+        core.init_client()
+
+        # 프로세스 간 Event.wait() 는 대기자가 먼저 종료되면 set() 이 멈출 수 있어 is_set() 으로 확인
+        def watch_stop():
+            while not finished.wait(WalletPool.POLL_SECONDS):
+                if stop_event.is_set():
+                    core.cancel()
+                    return
+
+        threading.Thread(target=watch_stop, daemon=True).start()
+
+        started = time.perf_counter()
+        with core.run_scope() as stop:
+            if stop_event.is_set():
+                stop.set()
+            success, fail, cancelled, _ = core.submit_planned(legs, rate, workers, stop, run_id=run_id, priority=priority)
+
+        for governor in (core.api_governor, core.order_governor):
+            log(f"🔁 {governor.report()}", "INFO")
+        outcome = ('done', profile.name, success, fail, cancelled, time.perf_counter() - started)
+    except Exception as e:
+        outcome = ('error', profile.name, f"{type(e).__name__}: {e}")
+    finally:
+        finished.set()
+        # 거래 저널 기록 스레드까지 끝낸 뒤 보고 (코디네이터가 저널로 집계할 때 빠진 기록이 없게)
+        if core:
+            try:
+                core.close()
+            except Exception as e:
+                log(f"⚠️  지갑 프로세스 정리 실패: {e}", "WARNING")
+        if outcome:
+            results.put(outcome)
+
+
+class WalletPool:
+    """지갑별 프로세스로 주문을 나눠 제출하고 결과를 모으는 코디네이터"""
+
+    POLL_SECONDS = 0.2
+
+    def __init__(self, wallets, log=None):
+        self.wallets = list(wallets)
+        self.log = log or (lambda message, level="INFO": None)
+
+    def execute(self, legs, rate, workers, stop=None, run_id=None, journal=None, priority=None):
+        """주문 분산 제출 → (성공, 실패, 미제출) (run_id 가 있으면 지갑 프로세스가 거래 저널에 기록)
+
+        결과를 보내지 못하고 끝난 지갑의 주문은 저널에 남은 결과로 집계하고, 결과가 없는 주문은 미제출로 센다
+        (실행이 done 으로 닫히지 않아 resume 으로 이어서 제출할 수 있게).
+        """
+        stop = stop or threading.Event()
+        context = multiprocessing.get_context('spawn')
+        results = context.Queue()
+        stop_event = context.Event()
+
+        shards = shard_legs(legs, len(self.wallets))
+        jobs = {}
+        for wallet, shard in zip(self.wallets, shards):
+            if shard:
+                process = context.Process(
+                    target=run_wallet,
+                    args=(wallet, shard, rate, workers, results, stop_event, run_id, priority),
+                    name=f"opinion-wallet-{wallet.name}",
+                    daemon=True
+                )
+                jobs[wallet.name] = (process, shard)
+
+        self.log("\n" + "=" * 60, "INFO")
+        self.log(f"👛 {len(legs)}개 주문을 지갑 {len(jobs)}개에 분산 ({rate}건/초 × 지갑 수)", "INFO")
+        for wallet, shard in zip(self.wallets, shards):
+            self.log(f"   {wallet.name}: {len(shard)}건", "INFO")
+        self.log("=" * 60, "INFO")
+
+        for process, _ in jobs.values():
+            process.start()
+
+        success = fail = cancelled = 0
+        pending = set(jobs)
+        exited = {}
+        try:
+            while pending:
+                if stop.is_set() and not stop_event.is_set():
+                    stop_event.set()
+                    self.log("⏹️  모든 지갑 프로세스에 중단 전달", "WARNING")
+
+                try:
+                    item = results.get(timeout=self.POLL_SECONDS)
+                except queue.Empty:
+                    # 결과 없이 끝난 프로세스 (큐가 한 번 더 비어 있을 때만 판정)
+                    for name in list(pending):
+                        process, shard = jobs[name]
+                        if process.exitcode is None:
+                            continue
+                        exited[name] = exited.get(name, 0) + 1
+                        if exited[name] >= 2:
+                            pending.discard(name)
+                            self.log(f"❌ [{name}] 지갑 프로세스가 결과 없이 종료 (exit code {process.exitcode})", "ERROR")
+                            ok, failed, unknown = self.settle(name, shard, run_id, journal)
+                            success, fail, cancelled = success + ok, fail + failed, cancelled + unknown
+                    continue
+
+                kind, name = item[0], item[1]
+                if kind == 'log':
+                    message, level = item[2], item[3]
+                    self.log(f"[{name}] {message.lstrip()}", level)
+                elif kind == 'done':
+                    pending.discard(name)
+                    ok, failed, skipped, seconds = item[2:]
+                    success += ok
+                    fail += failed
+                    cancelled += skipped
+                    per_sec = (ok + failed) / seconds if seconds else 0.0
+                    self.log(f"👛 [{name}] 성공 {ok} / 실패 {failed} / 미제출 {skipped} "
+                             f"({seconds:.1f}초, {per_sec:.1f}건/초)", "INFO")
+                elif kind == 'error':
+                    pending.discard(name)
+                    self.log(f"❌ [{name}] 지갑 프로세스 에러: {item[2]}", "ERROR")
+                    ok, failed, unknown = self.settle(name, jobs[name][1], run_id, journal)
+                    success, fail, cancelled = success + ok, fail + failed, cancelled + unknown
+        finally:
+            for process, _ in jobs.values():
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+
+        return success, fail, cancelled
+
+    def settle(self, name, legs, run_id, journal):
+        """결과 없이 끝난 지갑의 주문 → (저널상 성공, 저널상 실패, 결과 없음)"""
+        if not (journal and run_id):
+            self.log(f"   [{name}] 저널이 없어 {len(legs)}건을 미제출로 집계", "WARNING")
+            return 0, 0, len(legs)
+
+        from opinion_journal import CONFIRMED, EXPIRED, FAILED, leg_key
+
+        states = journal.states(run_id)
+        ok = failed = 0
+        for leg in legs:
+            state = states.get(leg_key(leg))
+            if state == CONFIRMED:
+                ok += 1
+            elif state in (FAILED, EXPIRED):
+                failed += 1
+        unknown = len(legs) - ok - failed
+        self.log(f"   [{name}] 저널 기준 성공 {ok} / 실패 {failed} / 결과 없음 {unknown} (resume 으로 이어서 제출)", "WARNING")
+        return ok, failed, unknown
@@ -0,0 +1,140 @@
+"""
+Client 초기화 예열 (체인 상수 / 승인 확인 캐시 + 시작 시간 보고)
+
+- 견적 토큰(거래소 주소, decimals), 마켓별 거래소 정보, 승인(allowance) 확인 결과를 CLIENT_CACHE_FILE 에
+  API 호스트 / 체인 / 지갑별로 저장하고 CLIENT_CACHE_TTL 이내면 다음 시작에서 다시 조회하지 않는다
+- 승인 확인은 읽기 전용 (allowance / isApprovedForAll 조회만, 승인 트랜잭션은 보내지 않음)
+- StartupReport: 시작 → 첫 주문 준비까지 단계별 소요 시간
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# SDK enable_trading 과 같은 기준 (이보다 적으면 승인 필요)
+MIN_ALLOWANCE_UNITS = 10 ** 9
+
+
+class ClientCache:
+    """체인 상수 / 승인 확인 디스크 캐시 (여러 지갑 프로세스가 같은 파일을 써도 됨)"""
+
+    VERSION = 1
+
+    def __init__(self, path, ttl=86400):
+        self.path = path
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = self.read()  # 캐시 키 → {항목: {'saved': 시각, 'value': 값}}
+
+    @staticmethod
+    def key(host, chain_id, maker):
+        return f"{host}|{chain_id}|{maker.lower()}"
+
+    def read(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data.get('entries', {}) if data.get('version') == self.VERSION else {}
+
+    def get(self, key, name):
+        """TTL 이내의 값 (없거나 오래됐으면 None)"""
+        with self.lock:
+            item = self.entries.get(key, {}).get(name)
+        if item and time.time() - item['saved'] < self.ttl:
+            return item['value']
+        return None
+
+    def put(self, key, name, value):
+        with self.lock:
+            self.entries.setdefault(key, {})[name] = {'saved': time.time(), 'value': value}
+
+    def markets(self, key):
+        """TTL 이내의 마켓 정보 {marketId: (거래소, 견적 토큰, decimals)}"""
+        now = time.time()
+        with self.lock:
+            markets = self.entries.get(key, {}).get('markets', {})
+            return {
+                market_id: item['value'] for market_id, item in markets.items()
+                if now - item['saved'] < self.ttl
+            }
+
+    def put_markets(self, key, markets):
+        """새로 알게 된 마켓만 추가 (이미 있는 마켓의 저장 시각은 유지)"""
+        now = time.time()
+        with self.lock:
+            stored = self.entries.setdefault(key, {}).setdefault('markets', {})
+            for market_id, info in markets.items():
+                stored.setdefault(str(market_id), {'saved': now, 'value': list(info)})
+
+    def save(self):
+        """디스크의 다른 프로세스 기록과 합쳐(항목별 최신) 원자적으로 저장"""
+        merged = self.read()
+        with self.lock:
+            for key, items in self.entries.items():
+                target = merged.setdefault(key, {})
+                for name, item in items.items():
+                    if name == 'markets':
+                        target.setdefault('markets', {}).update(item)
+                    elif item['saved'] >= target.get(name, {}).get('saved', 0):
+                        target[name] = item
+            self.entries = merged
+
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.VERSION, 'entries': merged}, f)
+            os.replace(tmp_path, self.path)
+
+
+def missing_approvals(client, quote_tokens):
+    """거래에 필요한 승인 중 빠진 것 (읽기 전용 RPC 조회) → 설명 목록"""
+    from opinion_clob_sdk.chain.contracts.erc20 import abi
+    from web3 import Web3
+
+    caller = client.contract_caller
+    maker = caller.multi_sig_addr
+    missing = []
+    for quote_token, exchange, decimals in quote_tokens:
+        quote_token = Web3.to_checksum_address(quote_token)
+        exchange = Web3.to_checksum_address(exchange)
+        erc20 = caller.w3.eth.contract(quote_token, abi=abi)
+        if erc20.functions.allowance(maker, exchange).call() < MIN_ALLOWANCE_UNITS * 10 ** decimals:
+            missing.append(f"{quote_token} allowance → {exchange}")
+        if not caller.conditional_tokens.functions.isApprovedForAll(maker, exchange).call():
+            missing.append(f"조건부 토큰 setApprovalForAll → {exchange}")
+    return missing
+
+
+class StartupReport:
+    """시작 시간 단계별 기록 (started: 기준 시각, perf_counter)"""
+
+    def __init__(self, started, metrics=None):
+        self.started = started
+        self.init_started = time.perf_counter()
+        self.metrics = metrics
+        self.phases = []  # (단계, 초, 비고)
+
+    @contextmanager
+    def phase(self, name):
+        """with 블록 시간을 단계로 기록 (yield 한 dict 의 'note' 가 비고)"""
+        info = {}
+        started = time.perf_counter()
+        try:
+            yield info
+        finally:
+            seconds = time.perf_counter() - started
+            self.phases.append((name, seconds, info.get('note', '')))
+            if self.metrics:
+                self.metrics.observe('opinion_startup_seconds', seconds, phase=name)
+
+    def lines(self):
+        ready = time.perf_counter()
+        lines = [f"시작 → 초기화 요청: {(self.init_started - self.started) * 1000:.0f}ms"]
+        for name, seconds, note in self.phases:
+            lines.append(f"{name}: {seconds * 1000:.0f}ms" + (f" ({note})" if note else ''))
+        lines.append(f"초기화 합계: {(ready - self.init_started) * 1000:.0f}ms, "
+                     f"시작 → 첫 주문 준비: {(ready - self.started) * 1000:.0f}ms")
+        return lines
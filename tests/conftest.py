@@ -0,0 +1,35 @@
+"""테스트 공통 설정 (저장소 루트의 opinion_* 모듈을 import 할 수 있게) + 주문 목록 팩토리"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def build_legs(topic_id=1, count=1, prices=None, outcomes=('YES',), amount=5, cutoff=0.0, volume=0.0, topic_type=None):
+    """한 토픽의 주문 목록
+
+    주문 수는 count (가격 모두 0.5) 또는 주문별 가격 목록 prices. outcomes 를 돌아가며 붙이고
+    outcomes 한 바퀴가 옵션 하나다 (('YES', 'NO') 면 같은 옵션의 YES / NO 가 이어짐).
+    토큰 ID 는 token-{topicId}-{순번}.
+    """
+    from opinion_core import OrderLeg
+    from opinion_models import REGULAR
+
+    if prices is None:
+        prices = ['0.5'] * count
+    legs = []
+    for idx, price in enumerate(prices):
+        option = idx // len(outcomes)
+        legs.append(OrderLeg(topic_id, f"토픽 {topic_id}", f"{topic_id}-{option}", f"옵션 {option}",
+                             outcomes[idx % len(outcomes)], f"token-{topic_id}-{idx}", price, amount,
+                             topic_type=topic_type or REGULAR, cutoff=cutoff, volume=volume))
+    return legs
+
+
+@pytest.fixture
+def make_legs():
+    """주문 목록 팩토리 (build_legs)"""
+    return build_legs
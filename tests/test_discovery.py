@@ -0,0 +1,111 @@
+"""새 토픽 탐색: 종류별 최고 ID / 본 ID 기록"""
+
+import pytest
+
+from opinion_discovery import SeenTopics, family_id
+from opinion_models import INDICATOR, REGULAR, Topic
+
+
+def test_family_id_uses_indicator_id_for_indicators():
+    assert family_id(Topic('12', None, "토픽", REGULAR, [])) == 12
+    assert family_id(Topic('12', '7', "지표", INDICATOR, [])) == 7
+    assert family_id(Topic('abc', None, "토픽", REGULAR, [])) is None
+
+
+def test_mark_tracks_high_water_mark(tmp_path):
+    seen = SeenTopics(str(tmp_path / 'seen.json'))
+    assert not seen.has_baseline(REGULAR)
+
+    assert seen.mark(REGULAR, [3, 5, None]) == 2
+    assert seen.mark(REGULAR, [5, 8]) == 1
+    assert seen.has_baseline(REGULAR)
+    assert seen.is_seen(REGULAR, 5)
+    assert not seen.is_seen(REGULAR, 4)
+    assert not seen.is_seen(INDICATOR, 5)
+    assert seen.describe(REGULAR) == "최고 ID 8, 본 ID 3개"
+
+
+def test_old_ids_compact_into_floor(tmp_path):
+    seen = SeenTopics(str(tmp_path / 'seen.json'), max_ids=3)
+    seen.mark(REGULAR, [10, 20, 30, 40, 50])
+
+    assert seen.families[REGULAR]['floor'] == 20
+    assert seen.is_seen(REGULAR, 15)  # floor 이하는 모두 본 것
+    assert not seen.is_seen(REGULAR, 25)
+    assert seen.mark(REGULAR, [5]) == 0
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / 'seen.json')
+    seen = SeenTopics(path)
+    seen.mark(INDICATOR, [1, 2])
+    seen.save()
+
+    loaded = SeenTopics(path)
+    assert loaded.has_baseline(INDICATOR)
+    assert loaded.is_seen(INDICATOR, 2)
+    assert not loaded.has_baseline(REGULAR)
+
+
+def test_corrupt_file_starts_empty(tmp_path):
+    path = tmp_path / 'seen.json'
+    path.write_text('{not json', encoding='utf-8')
+
+    assert not SeenTopics(str(path)).has_baseline(REGULAR)
+
+
+@pytest.fixture
+def discovery(tmp_path, monkeypatch):
+    """모의 서버 (일반 토픽 5개, 지표 없음) + 새 토픽 탐색용 TradingCore"""
+    from opinion_core import TradingCore
+    from opinion_mock_server import MockOpinionServer
+
+    with MockOpinionServer(topics=5, indicators=0, latency=0, seed=1) as server:
+        for name, value in {
+            'API_HOST': server.url, 'TOPIC_CACHE_FILE': '', 'JOURNAL_FILE': '', 'CLIENT_CACHE_FILE': '',
+            'TOPIC_SEEN_FILE': str(tmp_path / 'seen.json'), 'PAGE_SIZE': '20',
+        }.items():
+            monkeypatch.setenv(name, value)
+        core = TradingCore(log=lambda message, level="INFO": None)
+        try:
+            yield server, core
+        finally:
+            core.close()
+
+
+def discover_ids(core, limit, **kwargs):
+    return [family_id(topic) for topic in core.discover_topics(limit, 'REGULAR', **kwargs)]
+
+
+def test_more_new_topics_than_limit_across_runs(discovery):
+    server, core = discovery
+    assert discover_ids(core, 10) == []  # 기준선
+
+    server.add_topics(30)
+    first = discover_ids(core, 10)
+    assert len(first) == 10
+    assert first == sorted(first, reverse=True)
+
+    # 나머지 20개(더 오래된 것)는 경고대로 본 것으로 처리 → 다시 보고하지 않음
+    assert discover_ids(core, 10) == []
+    assert discover_ids(core, 10) == []
+
+    server.add_topics(3)
+    latest = discover_ids(core, 10)
+    assert len(latest) == 3
+    assert min(latest) > max(first)
+    assert discover_ids(core, 10) == []
+
+
+def test_unmarked_topics_are_offered_again_until_marked(discovery):
+    server, core = discovery
+    discover_ids(core, 10)
+
+    server.add_topics(4)
+    preview = core.discover_topics(10, 'REGULAR', mark=False)
+    assert len(preview) == 4
+    assert [family_id(topic) for topic in core.discover_topics(10, 'REGULAR', mark=False)] == \
+        [family_id(topic) for topic in preview]
+
+    core.mark_topics_seen(preview)
+    assert discover_ids(core, 10) == []
@@ -0,0 +1,239 @@
+"""요청 조절기: 재시도 / 속도 조절 / 회로 차단"""
+
+import pytest
+import requests
+
+import opinion_governor
+from opinion_governor import (
+    CircuitOpenError, HTTPStatusError, RequestGovernor, RetryableError, parse_retry_after,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    """재시도 대기는 기록만 하고 실제로 기다리지 않음"""
+    slept = []
+    monkeypatch.setattr(opinion_governor.time, 'sleep', slept.append)
+    return slept
+
+
+def failing(*errors, result='ok'):
+    """errors 를 차례로 던진 뒤 result 를 돌려주는 함수 (호출 횟수는 calls)"""
+    errors = list(errors)
+
+    def func():
+        func.calls += 1
+        if errors:
+            raise errors.pop(0)
+        return result
+
+    func.calls = 0
+    return func
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after('-1') == 0.0
+    assert parse_retry_after('') is None
+    assert parse_retry_after('soon') is None
+
+
+def test_retries_with_backoff_then_succeeds(no_sleep):
+    governor = RequestGovernor('t', base_delay=0.01)
+    func = failing(RetryableError(503), RetryableError(503))
+
+    assert governor.call(func) == 'ok'
+    assert func.calls == 3
+    assert len(no_sleep) == 2
+    assert governor.snapshot() == (2, 0, 0, 0)
+
+
+def test_retry_after_is_a_lower_bound(no_sleep):
+    governor = RequestGovernor('t', base_delay=0.01)
+    governor.call(failing(RetryableError(503, retry_after=7)))
+
+    assert no_sleep == [7]
+
+
+def test_gives_up_after_max_retries():
+    governor = RequestGovernor('t', max_retries=2, base_delay=0.01)
+    func = failing(*[RetryableError(502)] * 5)
+
+    with pytest.raises(RetryableError):
+        governor.call(func)
+    assert func.calls == 3
+    assert governor.gave_up == 1
+
+
+def test_unpaced_until_first_429():
+    governor = RequestGovernor('t', max_rate=20, decrease=0.5, max_retries=0)
+    assert governor.reserve() == 0
+    assert governor.reserve() == 0
+
+    with pytest.raises(RetryableError):
+        governor.call(failing(RetryableError(429)))
+    assert governor.rate == 10
+
+    governor.on_success()
+    assert governor.rate == 10.5
+
+
+def test_retry_after_starts_pacing_without_429():
+    governor = RequestGovernor('t', max_rate=20, max_retries=0)
+    with pytest.raises(RetryableError):
+        governor.call(failing(RetryableError(503, retry_after=1)))
+
+    assert governor.rate == 10
+    assert governor.throttled == 0
+
+
+def test_429_halves_rate_down_to_minimum():
+    governor = RequestGovernor('t', rate=4, min_rate=1.5)
+    governor.on_error(429)
+    assert governor.rate == 2
+    governor.on_error(429)
+    assert governor.rate == 1.5
+
+
+def test_breaker_opens_after_threshold_and_rejects():
+    governor = RequestGovernor('t', breaker_threshold=3, breaker_cooldown=60, max_retries=0)
+    for _ in range(3):
+        with pytest.raises(RetryableError):
+            governor.call(failing(RetryableError(500)))
+
+    assert governor.state == 'open'
+    func = failing()
+    with pytest.raises(CircuitOpenError):
+        governor.call(func)
+    assert func.calls == 0
+    assert governor.rejected == 1
+
+
+def test_429_does_not_count_toward_breaker():
+    governor = RequestGovernor('t', breaker_threshold=1)
+    governor.on_error(429)
+    assert governor.state == 'closed'
+
+
+def test_half_open_allows_a_single_probe():
+    governor = RequestGovernor('t', breaker_threshold=1, breaker_cooldown=0)
+    governor.on_error(500)
+    assert governor.state == 'open'
+
+    governor.check_breaker()  # 상태 확인 요청
+    assert governor.state == 'half-open'
+    for _ in range(3):
+        with pytest.raises(CircuitOpenError):
+            governor.check_breaker()
+
+    governor.on_success()
+    assert governor.state == 'closed'
+    governor.check_breaker()
+    governor.check_breaker()
+
+
+def test_failed_probe_reopens_breaker():
+    governor = RequestGovernor('t', breaker_threshold=1, breaker_cooldown=0)
+    governor.on_error('network')
+    governor.check_breaker()
+
+    governor.on_error('network')
+    assert governor.state == 'open'
+    assert not governor.probing
+
+
+def test_client_error_releases_probe():
+    governor = RequestGovernor('t', breaker_threshold=1, breaker_cooldown=0)
+    governor.on_error(500)
+
+    with pytest.raises(HTTPStatusError):
+        governor.call(failing(HTTPStatusError(400)))
+    assert governor.state == 'half-open'
+    governor.check_breaker()  # 다음 요청이 다시 상태 확인
+
+
+def test_order_failures_count_without_retry():
+    """주문용 (500 / 네트워크 에러 재시도 안 함) 도 회로 차단은 센다"""
+    governor = RequestGovernor('order', retry_statuses=(429, 502, 503, 504), retry_network=False,
+                               breaker_threshold=2, breaker_cooldown=60)
+
+    server_error = failing(HTTPStatusError(500))
+    with pytest.raises(HTTPStatusError):
+        governor.call(server_error)
+    assert server_error.calls == 1
+
+    timeout = failing(requests.ConnectionError())
+    with pytest.raises(requests.ConnectionError):
+        governor.call(timeout)
+    assert timeout.calls == 1
+
+    assert governor.state == 'open'
+    assert governor.retries == 0
+
+
+def test_other_exceptions_pass_through():
+    governor = RequestGovernor('t', breaker_threshold=1)
+    func = failing(ValueError('bad'))
+
+    with pytest.raises(ValueError):
+        governor.call(func)
+    assert func.calls == 1
+    assert governor.state == 'closed'
+
+
+def test_call_async_retries():
+    import asyncio
+
+    governor = RequestGovernor('t', base_delay=0)
+    calls = []
+
+    async def func():
+        calls.append(1)
+        if len(calls) < 2:
+            raise RetryableError(503)
+        return 'ok'
+
+    assert asyncio.run(governor.call_async(func)) == 'ok'
+    assert len(calls) == 2
+
+
+def test_cancelled_async_probe_is_released():
+    import asyncio
+
+    governor = RequestGovernor('t', breaker_threshold=1, breaker_cooldown=0)
+    governor.on_error(500)
+
+    async def scenario():
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.sleep(60)
+
+        probe = asyncio.ensure_future(governor.call_async(hang))
+        await started.wait()
+        with pytest.raises(CircuitOpenError):
+            governor.check_breaker()  # 상태 확인 중에는 거절
+
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        async def ok():
+            return 'ok'
+
+        return await governor.call_async(ok)
+
+    assert asyncio.run(scenario()) == 'ok'
+    assert governor.state == 'closed'
+
+
+def test_interrupted_probe_is_released():
+    governor = RequestGovernor('t', breaker_threshold=1, breaker_cooldown=0)
+    governor.on_error(500)
+
+    with pytest.raises(KeyboardInterrupt):
+        governor.call(failing(KeyboardInterrupt()))
+    assert governor.state == 'half-open'
+    assert governor.call(failing()) == 'ok'
+    assert governor.state == 'closed'
@@ -0,0 +1,108 @@
+"""거래 저널: 기록 / 이어서 실행 대상 계산"""
+
+import pytest
+
+from opinion_core import journal_leg
+from opinion_journal import TradeJournal
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = TradeJournal(str(tmp_path / 'journal.db'), flush_interval=0.01)
+    yield journal
+    journal.close()
+
+
+def test_start_run_records_all_legs_as_planned(journal, make_legs):
+    legs = make_legs(count=4)
+    run_id = journal.start_run(legs)
+
+    (recorded, _, status, count), = journal.runs()
+    assert (recorded, status, count) == (run_id, 'running', 4)
+    pending, done, unknown = journal.pending_legs(run_id, journal_leg)
+    assert [leg.token_id for leg in pending] == [leg.token_id for leg in legs]
+    assert (done, unknown) == (0, 0)
+
+
+def test_pending_legs_skip_confirmed_and_submitted(journal, make_legs):
+    legs = make_legs(count=4)
+    run_id = journal.start_run(legs)
+
+    journal.submitted(run_id, legs[0])
+    journal.result(run_id, legs[0], True, 'order-1')
+    journal.submitted(run_id, legs[1])  # 결과 없음 → 확인 필요, 다시 보내지 않음
+    journal.submitted(run_id, legs[2])
+    journal.result(run_id, legs[2], False, 'HTTP 400')  # 실패 → 다시 제출
+    journal.flush()
+
+    pending, done, unknown = journal.pending_legs(run_id, journal_leg)
+    assert [leg.token_id for leg in pending] == [legs[2].token_id, legs[3].token_id]
+    assert (done, unknown) == (1, 1)
+
+
+def test_restored_leg_keeps_plan_values(journal, make_legs):
+    leg = make_legs(count=1)[0]
+    leg.price = '0.53'
+    leg.amount = 7.5
+    run_id = journal.start_run([leg])
+
+    restored = journal.pending_legs(run_id, journal_leg)[0][0]
+    assert (restored.topic_id, restored.token_id, restored.outcome) == ('1', leg.token_id, 'YES')
+    assert (restored.price, restored.base_price, restored.amount) == ('0.53', '0.5', 7.5)
+
+
+def test_last_unfinished_ignores_done_runs(journal, make_legs):
+    first = journal.start_run(make_legs(topic_id=1, count=2))
+    second = journal.start_run(make_legs(topic_id=2, count=2))
+    assert journal.last_unfinished() == second
+
+    journal.finish_run(second, 'done')
+    assert journal.last_unfinished() == first
+
+    journal.finish_run(first, 'cancelled')
+    assert journal.last_unfinished() == first
+
+    journal.reopen_run(first)
+    journal.finish_run(first, 'done')
+    assert journal.last_unfinished() is None
+
+
+def test_order_tokens_from_confirmed_entries(journal, make_legs):
+    legs = make_legs(count=2)
+    run_id = journal.start_run(legs)
+    journal.result(run_id, legs[0], True, 'order-1')
+    journal.result(run_id, legs[1], False, 'rejected')
+    journal.flush()
+
+    assert journal.order_tokens(['order-1', 'order-2']) == {'order-1': legs[0].token_id}
+
+
+def test_records_survive_reopen(tmp_path, make_legs):
+    path = str(tmp_path / 'journal.db')
+    legs = make_legs(count=2)
+    journal = TradeJournal(path)
+    run_id = journal.start_run(legs)
+    journal.result(run_id, legs[0], True, 'order-1')
+    journal.close()
+
+    reopened = TradeJournal(path)
+    try:
+        assert reopened.last_unfinished() == run_id
+        pending, done, _ = reopened.pending_legs(run_id, journal_leg)
+        assert [leg.token_id for leg in pending] == [legs[1].token_id]
+        assert done == 1
+    finally:
+        reopened.close()
+
+
+def test_expired_legs_are_not_resumed(journal, make_legs):
+    legs = make_legs(count=4)
+    run_id = journal.start_run(legs)
+    journal.result(run_id, legs[0], True, 'order-1')
+    journal.expired(run_id, legs[2])
+    journal.expired(run_id, legs[3])
+    journal.finish_run(run_id, 'cancelled')
+
+    pending, done, unknown = journal.pending_legs(run_id, journal_leg)
+    assert [leg.token_id for leg in pending] == [legs[1].token_id]
+    assert (done, unknown) == (1, 0)
@@ -0,0 +1,114 @@
+"""주문 계획: 예산 배분 / 센트 단위 맞춤 / SafeRate 가격"""
+
+import random
+
+import pytest
+
+from opinion_plan import build_plan, get_numpy
+
+BACKENDS = [pytest.param(True, id='numpy'), pytest.param(False, id='python')]
+if get_numpy() is None:
+    BACKENDS[0] = pytest.param(True, id='numpy', marks=pytest.mark.skip(reason="numpy 없음"))
+
+
+def cents(amount):
+    return round(amount * 100)
+
+
+@pytest.mark.parametrize('use_numpy', BACKENDS)
+def test_equal_split_uses_largest_remainder(use_numpy, make_legs):
+    plan = build_plan(make_legs(prices=['0.5'] * 3), budget=10, weighting='equal', use_numpy=use_numpy)
+
+    amounts = [leg.amount for leg in plan.legs]
+    assert sum(cents(amount) for amount in amounts) == 1000
+    assert sorted(amounts) == [3.33, 3.33, 3.34]
+    assert all(cents(amount) == amount * 100 for amount in amounts)
+
+
+@pytest.mark.parametrize('use_numpy', BACKENDS)
+def test_odds_weighting_favours_cheap_legs(use_numpy, make_legs):
+    plan = build_plan(make_legs(prices=['0.2', '0.8']), budget=10, weighting='odds', use_numpy=use_numpy)
+
+    cheap, expensive = (leg.amount for leg in plan.legs)
+    assert (cheap, expensive) == (8.0, 2.0)
+
+
+@pytest.mark.parametrize('use_numpy', BACKENDS)
+def test_price_weighting_favours_expensive_legs(use_numpy, make_legs):
+    plan = build_plan(make_legs(prices=['0.2', '0.8']), budget=10, weighting='price', use_numpy=use_numpy)
+
+    cheap, expensive = (leg.amount for leg in plan.legs)
+    assert (cheap, expensive) == (2.0, 8.0)
+
+
+@pytest.mark.parametrize('use_numpy', BACKENDS)
+def test_amounts_clipped_to_min_and_max(use_numpy, make_legs):
+    plan = build_plan(make_legs(prices=['0.01', '0.5', '0.9']), budget=12, weighting='odds',
+                      min_amount=2, max_amount=6, use_numpy=use_numpy)
+
+    amounts = [leg.amount for leg in plan.legs]
+    assert all(2 <= amount <= 6 for amount in amounts)
+    assert amounts[0] == 6
+    assert plan.total == 12
+
+
+@pytest.mark.parametrize('use_numpy', BACKENDS)
+def test_budget_above_max_total_is_not_exceeded(use_numpy, make_legs):
+    plan = build_plan(make_legs(prices=['0.5'] * 3), budget=100, max_amount=10, use_numpy=use_numpy)
+
+    assert [leg.amount for leg in plan.legs] == [10, 10, 10]
+
+
+@pytest.mark.parametrize('use_numpy', BACKENDS)
+def test_small_budget_drops_lowest_weights(use_numpy, make_legs):
+    legs = make_legs(prices=['0.6', '0.1', '0.3', '0.9'])
+    plan = build_plan(legs, budget=2.5, weighting='odds', use_numpy=use_numpy)
+
+    assert [leg.token_id for leg in plan.legs] == ['token-1-1', 'token-1-2']
+    assert [leg.token_id for leg in plan.dropped] == ['token-1-0', 'token-1-3']
+    assert all(leg.amount >= 1 for leg in plan.legs)  # 거래소 최소 주문 금액
+    assert plan.total == 2.5
+
+
+@pytest.mark.parametrize('use_numpy', BACKENDS)
+def test_invalid_prices_are_excluded(use_numpy, make_legs):
+    plan = build_plan(make_legs(prices=['0.5', '', '1.5', 'abc']), budget=4, use_numpy=use_numpy)
+
+    assert [leg.token_id for leg in plan.legs] == ['token-1-0']
+    assert len(plan.invalid) == 3
+    assert plan.legs[0].amount == 4
+
+
+@pytest.mark.parametrize('use_numpy', BACKENDS)
+def test_fixed_amount_without_budget(use_numpy, make_legs):
+    plan = build_plan(make_legs(prices=['0.5', '0.7']), order_amount=5, max_amount=3, use_numpy=use_numpy)
+
+    assert [leg.amount for leg in plan.legs] == [3, 3]
+
+
+@pytest.mark.parametrize('use_numpy', BACKENDS)
+def test_safe_rate_raises_price_within_bounds(use_numpy, make_legs):
+    plan = build_plan(make_legs(prices=['0.5', '0.998']), order_amount=5, safe_rate=0.01, use_numpy=use_numpy)
+
+    assert [leg.price for leg in plan.legs] == ['0.505', '0.999']
+
+
+def test_unknown_weighting_rejected(make_legs):
+    with pytest.raises(ValueError):
+        build_plan(make_legs(prices=['0.5']), budget=5, weighting='kelly')
+
+
+@pytest.mark.skipif(get_numpy() is None, reason="numpy 없음")
+@pytest.mark.parametrize('weighting', ['equal', 'price', 'odds'])
+def test_backends_agree(weighting, make_legs):
+    rng = random.Random(7)
+    prices = [f"{rng.uniform(0.01, 0.99):.3f}" for _ in range(200)]
+
+    plans = [
+        build_plan(make_legs(prices=prices), budget=537.21, weighting=weighting, min_amount=1, max_amount=9,
+                   safe_rate=0.02, use_numpy=use_numpy)
+        for use_numpy in (True, False)
+    ]
+    assert [(leg.token_id, leg.amount, leg.price) for leg in plans[0].legs] == \
+        [(leg.token_id, leg.amount, leg.price) for leg in plans[1].legs]
+    assert plans[0].total == plans[1].total == 537.21
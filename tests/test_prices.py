@@ -0,0 +1,81 @@
+"""주문 가격: 실시간 호가 즉시 조회는 주문당 한 번, 계획 가격에서 너무 벗어나면 건너뛰기"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from opinion_presign import PresignPipeline
+from opinion_prices import PriceCache
+
+
+@pytest.fixture
+def core(monkeypatch):
+    from opinion_core import TradingCore
+
+    for name, value in {
+        'TOPIC_CACHE_FILE': '', 'CLIENT_CACHE_FILE': '', 'TOPIC_SEEN_FILE': '', 'JOURNAL_FILE': '',
+        'PRICE_MAX_DEVIATION': '0.1',
+    }.items():
+        monkeypatch.setenv(name, value)
+    core = TradingCore(log=lambda message, level="INFO": None)
+    yield core
+    core.close()
+
+
+def price_feed(core, prices):
+    """토큰별 가격을 돌려주는 가짜 오더북 (조회한 토큰 기록)"""
+    fetched = []
+
+    def fetch(token_id):
+        fetched.append(token_id)
+        return prices.get(token_id)
+
+    core.price_cache = PriceCache(fetch, max_age=10, interval=0)
+    return fetched
+
+
+def test_missing_price_is_fetched_once_per_leg(core, make_legs):
+    fetched = price_feed(core, {})
+    leg = make_legs()[0]
+
+    assert core.leg_price(leg) == '0.5'
+    assert core.leg_price(leg) == '0.5'
+    assert fetched == ['token-1-0']
+    assert core.price_fallbacks == 1
+
+
+def test_presign_take_does_not_fetch_again(core, make_legs):
+    fetched = price_feed(core, {})
+    leg = make_legs()[0]
+    pipeline = PresignPipeline(
+        lambda leg, price: SimpleNamespace(price=str(price), signed_at=time.monotonic()),
+        depth=1, workers=1, price_of=core.leg_price,
+    )
+    try:
+        pipeline.start([leg])
+        assert pipeline.take(leg).price == '0.5'
+    finally:
+        pipeline.close()
+    assert fetched == ['token-1-0']
+    assert pipeline.hits == 1
+
+
+def test_price_within_deviation_is_used(core, make_legs):
+    price_feed(core, {'token-1-0': '0.55'})
+    assert core.leg_price(make_legs()[0]) == '0.55'
+    assert core.price_skipped == 0
+
+
+def test_price_beyond_deviation_skips_leg(core, make_legs):
+    fetched = price_feed(core, {'token-1-0': '0.8'})
+    leg = make_legs()[0]
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="호가 이탈"):
+            core.leg_price(leg)
+    assert fetched == ['token-1-0']
+    assert core.price_skipped == 1
+
+    core.price_max_deviation = 0
+    assert core.leg_price(leg) == '0.8'
@@ -0,0 +1,196 @@
+"""주문 스케줄러: 우선순위 / 토픽 마감 / 느린 토픽 뒤로 보내기"""
+
+import functools
+import time
+
+import pytest
+
+from opinion_core import OrderEngine
+from opinion_models import INDICATOR
+from opinion_schedule import LegScheduler, format_priority, parse_priority
+
+
+@pytest.fixture
+def topic_legs(make_legs):
+    """한 토픽의 옵션 하나 YES / NO 주문"""
+    return functools.partial(make_legs, count=2, outcomes=('YES', 'NO'))
+
+
+def drain(scheduler):
+    """한 번에 하나씩 poll → done 하며 시작 순서 (topicId, outcome)"""
+    order = []
+    while True:
+        leg = scheduler.poll()
+        if leg is None:
+            return order
+        order.append((leg.topic_id, leg.outcome))
+        scheduler.done(leg, 0.01)
+
+
+def test_parse_priority():
+    assert parse_priority('end, -volume') == [('end', 1), ('volume', -1)]
+    assert parse_priority('') == []
+    assert format_priority(parse_priority('edge,-type')) == 'edge,-type'
+    assert format_priority([]) == '선택 순서'
+    with pytest.raises(ValueError):
+        parse_priority('end,profit')
+
+
+def test_no_keys_keeps_selection_order(topic_legs):
+    legs = topic_legs(1) + topic_legs(2)
+    assert drain(LegScheduler(legs, per_topic_order=False)) == [(1, 'YES'), (1, 'NO'), (2, 'YES'), (2, 'NO')]
+
+
+def test_end_orders_nearest_cutoff_first_and_unknown_last(topic_legs):
+    now = time.time()
+    legs = topic_legs(1) + topic_legs(2, cutoff=now + 7200) + topic_legs(3, cutoff=now + 3600)
+    order = drain(LegScheduler(legs, parse_priority('end')))
+
+    assert [topic for topic, _ in order[::2]] == [3, 2, 1]
+
+
+def test_per_topic_order_keeps_yes_before_no(topic_legs):
+    legs = topic_legs(1) + topic_legs(2)
+    scheduler = LegScheduler(legs)
+
+    first, second = scheduler.poll(), scheduler.poll()
+    assert (first.topic_id, second.topic_id) == (1, 2)
+    assert scheduler.poll() is None  # 두 토픽 모두 제출 중
+    assert not scheduler.exhausted
+
+    scheduler.done(second, 0.01)
+    leg = scheduler.poll()
+    assert (leg.topic_id, leg.outcome) == (2, 'NO')
+
+
+def test_edge_prefers_lower_yes_plus_no(topic_legs):
+    legs = topic_legs(1, prices=('0.6', '0.45')) + topic_legs(2, prices=('0.4', '0.5'))
+    order = drain(LegScheduler(legs, parse_priority('edge')))
+
+    assert order[0] == (2, 'YES')
+
+
+@pytest.mark.parametrize('spec, expected', [('volume', [2, 3, 1]), ('-volume', [1, 3, 2])])
+def test_volume_direction(spec, expected, topic_legs):
+    legs = topic_legs(1, volume=10) + topic_legs(2, volume=1000) + topic_legs(3, volume=500)
+    order = drain(LegScheduler(legs, parse_priority(spec)))
+
+    assert [topic for topic, _ in order[::2]] == expected
+
+
+def test_type_puts_regular_first(topic_legs):
+    legs = topic_legs(1, topic_type=INDICATOR) + topic_legs(2)
+    assert drain(LegScheduler(legs, parse_priority('type')))[0] == (2, 'YES')
+    assert drain(LegScheduler(legs, parse_priority('-type')))[0] == (1, 'YES')
+
+
+def test_topic_past_cutoff_margin_is_dropped(topic_legs):
+    now = time.time()
+    legs = topic_legs(1, cutoff=now + 30) + topic_legs(2, cutoff=now + 3600)
+    scheduler = LegScheduler(legs, parse_priority('end'), cutoff_margin=60)
+
+    assert drain(scheduler) == [(2, 'YES'), (2, 'NO')]
+    assert scheduler.dropped == legs[:2]
+    assert scheduler.dropped_topics() == 1
+    assert scheduler.exhausted
+
+
+def test_topic_timeout_drops_remaining_legs(topic_legs):
+    legs = topic_legs(1) + topic_legs(2)
+    scheduler = LegScheduler(legs, topic_timeout=10)
+
+    leg = scheduler.poll()
+    scheduler.done(leg, 0.01)
+    assert scheduler.poll(now=time.time() + 20) is None
+    assert len(scheduler.dropped) == 3
+    assert scheduler.exhausted
+
+
+def test_expired_then_drop_skips_rest_of_topic(topic_legs):
+    legs = topic_legs(1, cutoff=time.time() + 3600)
+    scheduler = LegScheduler(legs, cutoff_margin=60)
+
+    leg = scheduler.poll()
+    assert scheduler.expired(leg, now=time.time() + 3580)
+    scheduler.drop(leg)
+    assert scheduler.dropped == legs
+    assert scheduler.poll() is None
+    assert scheduler.exhausted
+
+
+@pytest.mark.parametrize('seconds, success', [(0.01, False), (5.0, True)])
+def test_failed_or_slow_topic_is_demoted(seconds, success, topic_legs):
+    legs = topic_legs(1) + topic_legs(2) + topic_legs(3)
+    scheduler = LegScheduler(legs, slow_seconds=2)
+
+    first = scheduler.poll()
+    scheduler.done(first, seconds, success)
+    order = drain(scheduler)
+
+    assert order[:4] == [(2, 'YES'), (2, 'NO'), (3, 'YES'), (3, 'NO')]
+    assert order[4] == (1, 'NO')
+    assert scheduler.demoted == 1
+
+
+def test_close_stops_handing_out_legs(topic_legs):
+    legs = topic_legs(1) + topic_legs(2)
+    scheduler = LegScheduler(legs)
+
+    leg = scheduler.poll()
+    scheduler.close(leg)
+    assert scheduler.poll() is None
+    assert scheduler.exhausted
+
+
+def test_expected_order_interleaves_by_position(topic_legs):
+    now = time.time()
+    legs = topic_legs(1, cutoff=now + 7200) + topic_legs(2, cutoff=now + 3600)
+    expected = LegScheduler(legs, parse_priority('end')).expected_order()
+
+    assert [(leg.topic_id, leg.outcome) for leg in expected] == [(2, 'YES'), (1, 'YES'), (2, 'NO'), (1, 'NO')]
+
+
+def test_order_engine_follows_scheduler(topic_legs):
+    now = time.time()
+    legs = topic_legs(1, cutoff=now + 7200) + topic_legs(2, cutoff=now + 30) + topic_legs(3, cutoff=now + 3600)
+    submitted = []
+
+    def submit(leg):
+        submitted.append((leg.topic_id, leg.outcome))
+        return True, f"order-{len(submitted)}"
+
+    engine = OrderEngine(submit, workers=1, rate=0)
+    scheduler = LegScheduler(legs, parse_priority('end'), cutoff_margin=60)
+
+    assert engine.run(legs, scheduler) == (4, 0)
+    assert submitted == [(3, 'YES'), (3, 'NO'), (1, 'YES'), (1, 'NO')]
+    assert len(scheduler.dropped) == 2
+    assert engine.cancelled == 0
+
+
+def test_deadline_drops_are_journaled_and_not_resumed(tmp_path, monkeypatch, topic_legs):
+    import threading
+
+    from opinion_core import TradingCore
+
+    for name, value in {
+        'ENGINE': 'thread', 'JOURNAL_FILE': str(tmp_path / 'journal.db'), 'TOPIC_CACHE_FILE': '',
+        'CLIENT_CACHE_FILE': '', 'TOPIC_SEEN_FILE': '', 'ORDER_CUTOFF_MARGIN': '60',
+    }.items():
+        monkeypatch.setenv(name, value)
+    core = TradingCore(log=lambda message, level="INFO": None)
+    core.submit_leg = lambda leg: (True, f"order-{leg.token_id}")
+    try:
+        now = time.time()
+        legs = topic_legs(1, cutoff=now + 30) + topic_legs(2, cutoff=now + 3600)
+        run_id = core.journal.start_run(legs)
+
+        success, fail, cancelled, _ = core.submit_planned(legs, 0, 1, threading.Event(), run_id=run_id)
+        assert (success, fail, cancelled) == (2, 2, 0)
+        core.journal.finish_run(run_id, 'cancelled')
+
+        _, plan, done, unknown = core.resume_plan(run_id)
+        assert plan.legs == []
+        assert (done, unknown) == (2, 0)
+    finally:
+        core.close()
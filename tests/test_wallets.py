@@ -0,0 +1,63 @@
+"""다중 지갑: 토픽 단위 분배 / 결과 없이 끝난 지갑 집계"""
+
+from opinion_core import journal_leg
+from opinion_journal import TradeJournal
+from opinion_wallets import WalletPool, shard_legs
+
+
+def test_shards_keep_topics_together_and_balance_load(make_legs):
+    legs = [leg for topic_id, count in enumerate([4, 3, 2, 2, 1], 1) for leg in make_legs(topic_id, count)]
+    shards = shard_legs(legs, 2)
+
+    assert sorted(len(shard) for shard in shards) == [6, 6]
+    owners = {}
+    for idx, shard in enumerate(shards):
+        for leg in shard:
+            assert owners.setdefault(leg.topic_id, idx) == idx
+        assert shard == [leg for leg in legs if leg in shard]  # 원래 순서 유지
+
+
+def test_more_wallets_than_topics_leaves_empty_shards(make_legs):
+    shards = shard_legs(make_legs(count=2), 3)
+    assert [len(shard) for shard in shards] == [2, 0, 0]
+
+
+def test_settle_counts_only_recorded_results(tmp_path, make_legs):
+    legs = make_legs(count=3)
+    journal = TradeJournal(str(tmp_path / 'journal.db'))
+    try:
+        run_id = journal.start_run(legs)
+        journal.result(run_id, legs[0], True, 'order-1')
+        journal.result(run_id, legs[1], False, 'rejected')
+        journal.flush()
+
+        assert WalletPool([]).settle('w1', legs, run_id, journal) == (1, 1, 1)
+        # 결과 없는 주문과 실패한 주문은 이어서 실행 대상
+        pending = journal.pending_legs(run_id, journal_leg)[0]
+        assert [leg.token_id for leg in pending] == [legs[1].token_id, legs[2].token_id]
+    finally:
+        journal.close()
+
+
+def test_settle_without_journal_counts_all_as_unsubmitted(make_legs):
+    legs = make_legs(1, 2) + make_legs(2, 1)
+    assert WalletPool([]).settle('w1', legs, None, None) == (0, 0, 3)
+
+
+def test_wallet_env_disables_background_work():
+    from opinion_wallets import WalletProfile
+
+    env = WalletProfile('w1', '0xkey', '0xmaker').env()
+    for name in ('CLIENT_CACHE_FILE', 'TOPIC_CACHE_FILE', 'TOPIC_SEEN_FILE', 'WALLETS_FILE'):
+        assert env[name] == ''
+    for name in ('APPROVAL_CHECK', 'PRICE_POLL_INTERVAL', 'ORDER_SYNC_INTERVAL', 'METRICS_PORT'):
+        assert env[name] == '0'
+
+
+def test_price_cache_without_interval_does_not_poll():
+    from opinion_prices import PriceCache
+
+    cache = PriceCache(lambda token_id: '0.5', interval=0).start()
+    assert cache.thread is None
+    cache.refresh(['token'])
+    assert cache.get('token') == '0.5'